@@ -0,0 +1,133 @@
+"""
+具体论证模块
+
+具体论证由三个词项为具体标签的直言命题组成(如"所有狗都是哺乳动物")。
+规范化把具体论证映射到它的抽象三段论形式: 结论的主项为小项S、谓项为大项P，
+两个前提共有而结论中没有的词项为中项M，含P的前提为大前提。
+批量验证按形式分组，每种形式只验证一次，结果分发给组内全部论证
+"""
+
+import sys
+from collections import namedtuple
+
+from syllogism import Syllogism, Proposition
+from config import resolve_interpretation
+from validation_rules import is_valid_syllogism
+
+# 批量验证结果: 抽象形式(无法规范化时为None)、是否有效、错误信息
+ArgumentResult = namedtuple("ArgumentResult", "form valid error")
+
+
+def make_proposition(prop_type, subject, predicate):
+    """创建词项标签经过驻留的命题，相同标签共享同一个字符串对象"""
+    return Proposition(prop_type, sys.intern(subject), sys.intern(predicate))
+
+
+class Argument(namedtuple("Argument", "major minor conclusion")):
+    """
+    具体论证: 两个前提和一个结论
+    两个前提的先后顺序不限，规范化时会按是否含大项确定大、小前提
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.major}\n{self.minor}\n-----\n{self.conclusion}"
+
+
+def normalize(argument):
+    """
+    把具体论证规范化为抽象三段论形式
+
+    返回:
+        Syllogism: 对应的形式
+
+    异常:
+        ValueError: 论证不是恰好含三个词项的标准三段论
+    """
+    first, second, conclusion = argument
+    minor_term, major_term = conclusion.subject, conclusion.predicate
+    if minor_term == major_term:
+        raise ValueError(f"结论的主项与谓项相同: {conclusion}")
+
+    first_terms = (first.subject, first.predicate)
+    if major_term in first_terms and minor_term not in first_terms:
+        major, minor = first, second
+    else:
+        major, minor = second, first
+
+    major_terms = (major.subject, major.predicate)
+    minor_terms = (minor.subject, minor.predicate)
+    if major_term not in major_terms or minor_term in major_terms:
+        raise ValueError(f"找不到只含大项{major_term}的前提: {argument}")
+    middle_term = major.predicate if major.subject == major_term else major.subject
+    if middle_term == major_term:
+        raise ValueError(f"大前提的主项与谓项相同: {major}")
+    if set(minor_terms) != {minor_term, middle_term}:
+        raise ValueError(f"小前提应由小项{minor_term}和中项{middle_term}组成: {minor}")
+
+    return Syllogism(major.type, minor.type, conclusion.type,
+                     0 if major.subject == middle_term else 1,
+                     0 if minor.subject == middle_term else 1)
+
+
+def group_by_form(arguments):
+    """
+    按抽象形式分组
+
+    返回:
+        (groups, errors): groups为形式到论证下标列表的映射，errors为下标到ValueError的映射
+    """
+    groups = {}
+    errors = {}
+    for index, argument in enumerate(arguments):
+        try:
+            form = normalize(argument)
+        except ValueError as e:
+            errors[index] = e
+            continue
+        members = groups.get(form)
+        if members is None:
+            groups[form] = [index]
+        else:
+            members.append(index)
+    return groups, errors
+
+
+def validate_arguments(arguments, checker=None, interpretation=None, backend="rules"):
+    """
+    批量验证具体论证，每种形式只验证一次
+
+    参数:
+        arguments: Argument序列
+        checker: 可选的SyllogismChecker实例，带自定义规则时每种形式也只运行一次
+        interpretation: 解释类型，默认为当前解释
+
+    返回:
+        list: 与输入顺序一致的ArgumentResult
+    """
+    interpretation = resolve_interpretation(interpretation)
+    groups, errors = group_by_form(arguments)
+    results = [None] * (sum(len(members) for members in groups.values()) + len(errors))
+    for form, members in groups.items():
+        result = ArgumentResult(form, is_valid_syllogism(form, checker, interpretation, backend), None)
+        for index in members:
+            results[index] = result
+    for index, error in errors.items():
+        results[index] = ArgumentResult(None, None, str(error))
+    return results
+
+
+# 示例用法
+if __name__ == "__main__":
+    from syllogism import PropositionType
+
+    argument = Argument(
+        make_proposition(PropositionType.A, "哺乳动物", "动物"),
+        make_proposition(PropositionType.A, "狗", "哺乳动物"),
+        make_proposition(PropositionType.A, "狗", "动物"),
+    )
+    print(argument)
+    form = normalize(argument)
+    print(f"形式: {form.get_figure_and_mood()}")
+    print(f"验证结果: {validate_arguments([argument])[0]}")
@@ -0,0 +1,128 @@
+"""
+三段论批量验证模块
+用NumPy对编码数组逐元素并行计算全部规则，不经过Python层循环
+需要安装NumPy
+"""
+
+import numpy as np
+
+from syllogism import FORM_COUNT
+from config import InterpretationType, get_interpretation
+from validation_rules import get_all_validation_rules
+
+# 失败位掩码中第i位对应get_all_validation_rules()中的第i条规则
+RULE_NAMES = tuple(name for name, _ in get_all_validation_rules())
+RULE_BITS = {name: 1 << index for index, name in enumerate(RULE_NAMES)}
+
+
+def encode_arrays(major_type, minor_type, conclusion_type, major_position, minor_position):
+    """
+    把各字段数组编码为形式编码数组
+
+    命题类型用2位编码(A=0, E=1, I=2, O=3)，中项位置为0或1
+    """
+    major_type = _as_field(major_type, 4, "大前提类型")
+    minor_type = _as_field(minor_type, 4, "小前提类型")
+    conclusion_type = _as_field(conclusion_type, 4, "结论类型")
+    major_position = _as_field(major_position, 2, "大前提中项位置")
+    minor_position = _as_field(minor_position, 2, "小前提中项位置")
+    return ((major_type << 6) | (minor_type << 4) | (conclusion_type << 2) |
+            (major_position << 1) | minor_position)
+
+
+def validate_codes(codes, interpretation=None):
+    """
+    批量验证形式编码数组
+
+    参数:
+        codes: 形式编码数组(0-255)
+        interpretation: 解释类型，默认为当前解释
+
+    返回:
+        (valid, failures): 布尔有效性数组和uint8规则失败位掩码数组
+    """
+    codes = _as_field(codes, FORM_COUNT, "三段论编码")
+    if interpretation is None:
+        interpretation = get_interpretation()
+    boolean = interpretation == InterpretationType.BOOLEAN
+
+    major_type = (codes >> 6) & 3
+    minor_type = (codes >> 4) & 3
+    conclusion_type = (codes >> 2) & 3
+    major_position = ((codes >> 1) & 1).astype(bool)
+    minor_position = (codes & 1).astype(bool)
+
+    # 全称: A、E；否定: E、O
+    major_universal = major_type < 2
+    minor_universal = minor_type < 2
+    conclusion_universal = conclusion_type < 2
+    major_negative = (major_type & 1).astype(bool)
+    minor_negative = (minor_type & 1).astype(bool)
+    conclusion_negative = (conclusion_type & 1).astype(bool)
+
+    # 规则1: 中项至少周延一次(主项周延于全称，谓项周延于否定)
+    middle_distributed = (
+        np.where(major_position, major_negative, major_universal) |
+        np.where(minor_position, minor_negative, minor_universal)
+    )
+
+    # 规则2: 禁止非法周延
+    p_distributed_in_major = np.where(major_position, major_universal, major_negative)
+    s_distributed_in_minor = np.where(minor_position, minor_universal, minor_negative)
+    no_illicit = ((~conclusion_negative | p_distributed_in_major) &
+                  (~conclusion_universal | s_distributed_in_minor))
+
+    # 规则3: 禁止两个否定前提
+    has_negative_premise = major_negative | minor_negative
+    no_two_negatives = ~(major_negative & minor_negative)
+
+    # 规则4: 否定前提否定结论
+    if boolean:
+        negative_rule = ~has_negative_premise | conclusion_negative
+    else:
+        negative_rule = has_negative_premise == conclusion_negative
+
+    # 规则5: 存在性假设
+    if boolean:
+        existential = ~(major_universal & minor_universal & ~conclusion_universal)
+    else:
+        existential = np.ones(codes.shape, dtype=bool)
+
+    failures = np.zeros(codes.shape, dtype=np.uint8)
+    for bit, passed in enumerate((middle_distributed, no_illicit, no_two_negatives,
+                                  negative_rule, existential)):
+        failures |= (~passed).astype(np.uint8) << bit
+    return failures == 0, failures
+
+
+def validate_arrays(major_type, minor_type, conclusion_type, major_position,
+                    minor_position, interpretation=None):
+    """批量验证按字段给出的三段论数组，返回值同validate_codes"""
+    codes = encode_arrays(major_type, minor_type, conclusion_type,
+                          major_position, minor_position)
+    return validate_codes(codes, interpretation)
+
+
+def _as_field(values, limit, label):
+    """把输入转换为整数数组并检查取值范围"""
+    values = np.asarray(values)
+    if values.dtype == bool or not np.issubdtype(values.dtype, np.integer):
+        raise ValueError(f"{label}必须是整数数组")
+    if values.size and (values.min() < 0 or values.max() >= limit):
+        raise ValueError(f"{label}超出范围: 0-{limit - 1}")
+    return values.astype(np.uint8)
+
+
+# 示例用法
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, FORM_COUNT, size=10_000_000, dtype=np.uint8)
+    for interp in InterpretationType:
+        start = time.perf_counter()
+        valid, failures = validate_codes(codes, interp)
+        elapsed = time.perf_counter() - start
+        print(f"{interp.value}: {len(codes)} 个三段论, {int(valid.sum())} 个有效, 用时 {elapsed:.3f}s")
+        for name, bit in RULE_BITS.items():
+            print(f"  {name} 失败: {int(np.count_nonzero(failures & bit))}")
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+验证热路径的性能基准
+
+测量每个用例的吞吐量(次/秒)和单次调用的内存分配，
+结果可以保存为JSON基线，之后与基线比较以发现性能回退
+
+用法:
+    python3 benchmark.py                          # 运行全部用例
+    python3 benchmark.py --save baseline.json     # 保存基线
+    python3 benchmark.py --compare baseline.json  # 与基线比较，回退时返回码为1
+    python3 benchmark.py --startup                # 命令行冷启动耗时，超过目标时返回码为1
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+
+from syllogism import Syllogism, PropositionType
+from rule_checker import SyllogismChecker
+from config import InterpretationType
+from validation_rules import get_all_validation_rules, is_valid_syllogism
+from explanation import explain
+from immediate_inference import canonical_code, immediate_consequences
+from result_renderer import render_report
+import validate_all
+import demo_interpretations
+from syllogism_cli import STARTUP_TARGET_MS
+
+# 默认允许的吞吐量下降比例
+DEFAULT_THRESHOLD = 0.2
+
+# 冷启动用例: 名称 -> (解释器参数, 是否要求达到STARTUP_TARGET_MS)
+STARTUP_COMMANDS = {
+    "python": (["-c", "pass"], False),
+    "cli_forms": (["-m", "syllogism_cli", "forms"], True),
+    "cli_valid": (["-m", "syllogism_cli", "valid", "-i", "both"], True),
+    "cli_check": (["-m", "syllogism_cli", "check", "AAA-1", "EAO-3", "-i", "both"], True),
+    "validate_all": (["validate_all.py", "aristotelian"], False),
+}
+
+
+def _quiet(func):
+    """丢弃函数的标准输出"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+    return run
+
+
+def get_benchmarks():
+    """
+    获取全部基准用例
+
+    返回:
+        dict: 用例名称到无参数可调用对象的映射
+    """
+    barbara = Syllogism(PropositionType.A, PropositionType.A, PropositionType.A, 0, 1)
+    undistributed = Syllogism.from_name("AAA-2")
+    bramantip = Syllogism.from_name("AAI-4")
+    universal = barbara.propositions()[2]
+    checker = SyllogismChecker()
+    tabulated = SyllogismChecker()
+    for rule_name, rule_func in get_all_validation_rules():
+        checker.add_rule(rule_name, rule_func)
+        tabulated.add_rule(rule_name, rule_func)
+    tabulated.compile_table()
+
+    return {
+        "syllogism_construction": lambda: Syllogism(
+            PropositionType.E, PropositionType.I, PropositionType.O, 1, 0),
+        "get_figure_and_mood": barbara.get_figure_and_mood,
+        "checker_check": lambda: checker.check(barbara),
+        "checker_check_table": lambda: tabulated.check(barbara),
+        "is_valid_syllogism": lambda: is_valid_syllogism(barbara),
+        "explain": lambda: explain(undistributed),
+        "canonical_code": lambda: canonical_code(bramantip, InterpretationType.ARISTOTELIAN),
+        "immediate_consequences": lambda: immediate_consequences(universal, InterpretationType.ARISTOTELIAN),
+        "generate_all_syllogisms": validate_all.generate_all_syllogisms,
+        "validate_all_main": _quiet(lambda: validate_all.main(InterpretationType.ARISTOTELIAN)),
+        "render_report_both": lambda: render_report(tuple(InterpretationType)),
+        "compare_interpretations": _quiet(demo_interpretations.compare_interpretations),
+    }
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """
+    测量单个用例
+
+    返回:
+        dict: ops_per_sec(最好一轮的吞吐量)、peak_bytes(单次调用的峰值分配)、
+              allocated_blocks(单次调用后仍存活的内存块数)
+    """
+    func()  # 预热，建立缓存
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    blocks = sum(stat.count_diff for stat in
+                 after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "filename"))
+
+    return {
+        "ops_per_sec": 1.0 / best if best > 0 else float("inf"),
+        "peak_bytes": peak,
+        "allocated_blocks": blocks,
+    }
+
+
+def run_benchmarks(names=None, repeat=5, min_time=0.2):
+    """运行基准用例，names为None时运行全部"""
+    benchmarks = get_benchmarks()
+    if names:
+        unknown = set(names) - set(benchmarks)
+        if unknown:
+            raise ValueError(f"未知的基准用例: {', '.join(sorted(unknown))}")
+        benchmarks = {name: benchmarks[name] for name in names}
+    return {name: measure(func, repeat, min_time) for name, func in benchmarks.items()}
+
+
+def measure_startup(names=None, repeat=20):
+    """
+    在新的解释器进程中运行命令，测量从启动到退出的耗时
+
+    返回:
+        dict: 用例名称到中位耗时(毫秒)的映射
+    """
+    commands = STARTUP_COMMANDS
+    if names:
+        unknown = set(names) - set(commands)
+        if unknown:
+            raise ValueError(f"未知的冷启动用例: {', '.join(sorted(unknown))}")
+        commands = {name: commands[name] for name in names}
+    directory = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, (args, _) in commands.items():
+        # 先运行一次，生成字节码缓存和有效性表数据文件
+        subprocess.run([sys.executable, *args], cwd=directory, stdout=subprocess.DEVNULL, check=True)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *args], cwd=directory, stdout=subprocess.DEVNULL, check=True)
+            timings.append(time.perf_counter() - start)
+        results[name] = statistics.median(timings) * 1000
+    return results
+
+
+def format_startup(results):
+    """格式化冷启动结果，有目标的用例标出是否达标"""
+    lines = [f"{'用例':<26}{'中位耗时':>12}{'目标':>10}"]
+    for name, elapsed in results.items():
+        target = f"{STARTUP_TARGET_MS}ms {'✓' if elapsed <= STARTUP_TARGET_MS else '✗'}" \
+            if STARTUP_COMMANDS[name][1] else ""
+        lines.append(f"{name:<26}{elapsed:>10.1f}ms{target:>10}")
+    return "\n".join(lines)
+
+
+def save_baseline(results, path):
+    """把结果保存为JSON基线"""
+    data = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_baseline(path):
+    """读取JSON基线"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def find_regressions(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    与基线比较
+
+    返回:
+        list: 吞吐量下降超过threshold的用例 [(名称, 基线次/秒, 当前次/秒), ...]
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - threshold):
+            regressions.append((name, previous["ops_per_sec"], current["ops_per_sec"]))
+    return regressions
+
+
+def format_results(results, baseline=None):
+    """格式化结果表格"""
+    lines = [f"{'用例':<26}{'次/秒':>14}{'峰值分配':>12}{'存活块数':>10}{'对比基线':>10}"]
+    for name, result in results.items():
+        change = ""
+        if baseline and name in baseline:
+            ratio = result["ops_per_sec"] / baseline[name]["ops_per_sec"] - 1
+            change = f"{ratio:+.1%}"
+        lines.append(f"{name:<26}{result['ops_per_sec']:>14,.0f}"
+                     f"{result['peak_bytes']:>11,}B{result['allocated_blocks']:>10}{change:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="验证热路径的性能基准")
+    parser.add_argument("names", nargs="*", help="要运行的用例，默认全部")
+    parser.add_argument("--save", metavar="PATH", help="把结果保存为JSON基线")
+    parser.add_argument("--compare", metavar="PATH", help="与JSON基线比较")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"允许的吞吐量下降比例，默认{DEFAULT_THRESHOLD}")
+    parser.add_argument("--repeat", type=int, default=5, help="每个用例的重复轮数")
+    parser.add_argument("--list", action="store_true", help="列出全部用例")
+    parser.add_argument("--startup", action="store_true",
+                        help=f"测量命令行冷启动耗时，目标为{STARTUP_TARGET_MS}毫秒")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(STARTUP_COMMANDS if args.startup else get_benchmarks()))
+        return 0
+
+    if args.startup:
+        results = measure_startup(args.names, max(args.repeat, 1) * 4)
+        print(format_startup(results))
+        slow = [name for name, elapsed in results.items()
+                if STARTUP_COMMANDS[name][1] and elapsed > STARTUP_TARGET_MS]
+        return 1 if slow else 0
+
+    results = run_benchmarks(args.names, args.repeat)
+    baseline = load_baseline(args.compare) if args.compare else None
+    print(format_results(results, baseline))
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"\n已保存基线: {args.save}")
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n发现 {len(regressions)} 个性能回退(阈值 {args.threshold:.0%}):")
+            for name, before, after in regressions:
+                print(f"  ✗ {name}: {before:,.0f} -> {after:,.0f} 次/秒")
+            return 1
+        print("\n✓ 没有发现性能回退")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
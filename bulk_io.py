@@ -0,0 +1,205 @@
+"""
+批量验证的输入输出模块
+从JSONL、CSV或纯文本流中逐条读取三段论，按块验证并按块写出结果，
+内存占用只与块大小有关，与输入总量无关
+
+每条输入记录可以用以下任一方式给出三段论:
+  - form: 格和式，如"AAA-1"
+  - code: 8位形式编码
+  - major_type、minor_type、conclusion_type、major_position、minor_position五个字段
+记录中的id字段会原样写入结果
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+
+from syllogism import Syllogism, PropositionType
+from config import resolve_interpretation
+from validity_table import lookup_validity
+
+INPUT_FORMATS = ("jsonl", "csv", "text")
+OUTPUT_FORMATS = ("jsonl", "csv", "text")
+
+DEFAULT_CHUNK_SIZE = 10000
+
+_FIELDS = ("major_type", "minor_type", "conclusion_type", "major_position", "minor_position")
+_CSV_COLUMNS = ("id", "form", "code", "valid", "error")
+
+
+def guess_input_format(path):
+    """根据文件扩展名推断输入格式，无法推断时为jsonl"""
+    path = str(path).lower()
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith(".txt"):
+        return "text"
+    return "jsonl"
+
+
+def read_records(stream, input_format="jsonl"):
+    """
+    逐条读取输入记录
+
+    返回:
+        生成器，每项为(行号, 记录字典)；无法解析的行记录字典为None
+    """
+    if input_format == "jsonl":
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield line_number, record if isinstance(record, dict) else None
+    elif input_format == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif input_format == "text":
+        for line_number, line in enumerate(stream, 1):
+            form = line.strip()
+            if form:
+                yield line_number, {"form": form}
+    else:
+        raise ValueError(f"无效的输入格式: {input_format}")
+
+
+def _parse_int(value):
+    """
+    解析记录中的整数字段，只接受int或十进制数字字符串
+
+    浮点数、布尔值和"1.0"之类的字符串不会被截断或转换，而是抛出ValueError
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        if text.isascii() and text.isdigit():
+            return int(text)
+    raise ValueError(f"不是整数: {value!r}")
+
+
+def record_to_syllogism(record):
+    """把输入记录转换为三段论，记录无效时抛出ValueError"""
+    if record is None:
+        raise ValueError("无法解析的记录")
+    form = record.get("form")
+    if form:
+        return Syllogism.from_name(form)
+    code = record.get("code")
+    if code not in (None, ""):
+        try:
+            return Syllogism.from_code(_parse_int(code))
+        except (TypeError, ValueError):
+            raise ValueError(f"无效的三段论编码: {code}") from None
+    try:
+        values = [record[field] for field in _FIELDS]
+        types = [PropositionType(str(value).strip().upper()) for value in values[:3]]
+        positions = [_parse_int(value) for value in values[3:]]
+    except KeyError as e:
+        raise ValueError(f"缺少字段: {e.args[0]}") from None
+    except (TypeError, ValueError):
+        raise ValueError(f"无效的字段值: {values}") from None
+    return Syllogism(*types, *positions)
+
+
+def validate_records(records, interpretation=None, backend="rules"):
+    """
+    逐条验证记录
+
+    返回:
+        生成器，每项为结果字典: id(如有)、form、code、valid，或line、error
+    """
+    interpretation = resolve_interpretation(interpretation)
+    for line_number, record in records:
+        try:
+            syl = record_to_syllogism(record)
+        except ValueError as e:
+            result = {"line": line_number, "error": str(e)}
+        else:
+            result = {"form": syl.get_figure_and_mood(), "code": syl.code,
+                      "valid": lookup_validity(syl.code, interpretation, backend)}
+        if record is not None and record.get("id") not in (None, ""):
+            result = {"id": record["id"], **result}
+        yield result
+
+
+def iter_chunks(iterable, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    把可迭代对象切分为列表块
+
+    异常:
+        ValueError: chunk_size不是正整数
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"块大小必须是正整数: {chunk_size}")
+    return _chunks(iter(iterable), chunk_size)
+
+
+def _chunks(iterator, chunk_size):
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def positive_int(text):
+    """命令行参数类型: 正整数"""
+    value = int(text)
+    if value <= 0:
+        raise ValueError(f"必须是正整数: {text}")
+    return value
+
+
+def format_results(results, output_format="jsonl", header=False):
+    """把一块结果格式化为一段文本"""
+    if output_format == "jsonl":
+        return "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results)
+    if output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=_CSV_COLUMNS, extrasaction="ignore",
+                                lineterminator="\n")
+        if header:
+            writer.writeheader()
+        writer.writerows(results)
+        return buffer.getvalue()
+    if output_format == "text":
+        lines = []
+        for result in results:
+            prefix = f"{result['id']}\t" if "id" in result else ""
+            if "error" in result:
+                lines.append(f"{prefix}第{result['line']}行\t错误: {result['error']}\n")
+            else:
+                lines.append(f"{prefix}{result['form']}\t{'有效' if result['valid'] else '无效'}\n")
+        return "".join(lines)
+    raise ValueError(f"无效的输出格式: {output_format}")
+
+
+def stream_validate(input_stream, output_stream, input_format="jsonl", output_format="jsonl",
+                    interpretation=None, backend="rules", chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    从输入流读取、验证并写出结果，每块只调用一次write
+
+    返回:
+        dict: 统计信息 total、valid、invalid、errors
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"无效的输出格式: {output_format}")
+    stats = {"total": 0, "valid": 0, "invalid": 0, "errors": 0}
+    results = validate_records(read_records(input_stream, input_format), interpretation, backend)
+    for index, chunk in enumerate(iter_chunks(results, chunk_size)):
+        output_stream.write(format_results(chunk, output_format, header=index == 0))
+        for result in chunk:
+            stats["total"] += 1
+            if "error" in result:
+                stats["errors"] += 1
+            elif result["valid"]:
+                stats["valid"] += 1
+            else:
+                stats["invalid"] += 1
+    output_stream.flush()
+    return stats
@@ -1,7 +1,14 @@
 """
 配置模块 - 管理三段论验证的全局设置
+
+解释类型可以在三个层次上指定，优先级从高到低:
+  1. 调用时显式传入的interpretation参数
+  2. interpretation_context()设置的上下文解释(按线程/asyncio任务隔离)
+  3. set_interpretation()设置的全局解释
 """
 
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
 
 class InterpretationType(Enum):
@@ -12,29 +19,94 @@ class InterpretationType(Enum):
 # 全局配置变量
 INTERPRETATION = InterpretationType.BOOLEAN
 
+# 上下文解释，未设置时为None，回退到全局配置
+_context_interpretation = ContextVar("interpretation", default=None)
+
+# 读取解释的计数器，只在track_interpretation_reads()内设置
+_interpretation_reads = ContextVar("interpretation_reads", default=None)
+
+def _check_interpretation(interpretation_type):
+    """检查解释类型是否有效"""
+    if not isinstance(interpretation_type, InterpretationType):
+        raise ValueError(f"无效的解释类型: {interpretation_type}")
+
 def set_interpretation(interpretation_type):
-    """设置解释类型"""
+    """设置全局解释类型"""
     global INTERPRETATION
-    if isinstance(interpretation_type, InterpretationType):
-        INTERPRETATION = interpretation_type
-    else:
-        raise ValueError(f"无效的解释类型: {interpretation_type}")
+    _check_interpretation(interpretation_type)
+    INTERPRETATION = interpretation_type
 
 def get_interpretation():
-    """获取当前解释类型"""
-    return INTERPRETATION
+    """获取当前解释类型，上下文解释优先于全局解释"""
+    reads = _interpretation_reads.get()
+    if reads is not None:
+        reads.count += 1
+    interpretation = _context_interpretation.get()
+    return INTERPRETATION if interpretation is None else interpretation
+
+@contextmanager
+def interpretation_context(interpretation_type):
+    """
+    在当前线程或asyncio任务内临时使用指定解释，不影响全局设置
 
-def is_aristotelian():
+    用法:
+        with interpretation_context(InterpretationType.ARISTOTELIAN):
+            is_valid_syllogism(syl)
+    """
+    _check_interpretation(interpretation_type)
+    token = _context_interpretation.set(interpretation_type)
+    try:
+        yield interpretation_type
+    finally:
+        _context_interpretation.reset(token)
+
+class InterpretationReads:
+    """track_interpretation_reads()产生的计数器"""
+
+    def __init__(self):
+        self.count = 0
+
+@contextmanager
+def track_interpretation_reads():
+    """
+    统计当前线程或asyncio任务内读取解释类型的次数
+
+    经get_interpretation()或resolve_interpretation()读取都会计数；
+    直接访问INTERPRETATION的代码不会被统计
+
+    用法:
+        with track_interpretation_reads() as reads:
+            rule(syl)
+        depends_on_interpretation = reads.count > 0
+    """
+    reads = InterpretationReads()
+    token = _interpretation_reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _interpretation_reads.reset(token)
+
+def resolve_interpretation(interpretation=None):
+    """显式传入的解释优先，否则返回当前解释"""
+    if interpretation is None:
+        return get_interpretation()
+    _check_interpretation(interpretation)
+    reads = _interpretation_reads.get()
+    if reads is not None:
+        reads.count += 1
+    return interpretation
+
+def is_aristotelian(interpretation=None):
     """检查是否使用亚里士多德解释"""
-    return INTERPRETATION == InterpretationType.ARISTOTELIAN
+    return resolve_interpretation(interpretation) == InterpretationType.ARISTOTELIAN
 
-def is_boolean():
+def is_boolean(interpretation=None):
     """检查是否使用布尔解释"""
-    return INTERPRETATION == InterpretationType.BOOLEAN
+    return resolve_interpretation(interpretation) == InterpretationType.BOOLEAN
 
-def get_interpretation_name():
+def get_interpretation_name(interpretation=None):
     """获取解释类型的中文名称"""
-    if INTERPRETATION == InterpretationType.ARISTOTELIAN:
+    if resolve_interpretation(interpretation) == InterpretationType.ARISTOTELIAN:
         return "亚里士多德解释"
     else:
         return "布尔解释"
@@ -50,3 +122,8 @@ if __name__ == "__main__":
     # 切换到布尔解释
     set_interpretation(InterpretationType.BOOLEAN)
     print(f"切换后解释: {get_interpretation_name()}")
+
+    # 临时使用亚里士多德解释
+    with interpretation_context(InterpretationType.ARISTOTELIAN):
+        print(f"上下文内解释: {get_interpretation_name()}")
+    print(f"上下文外解释: {get_interpretation_name()}")
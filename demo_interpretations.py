@@ -3,28 +3,112 @@
 演示亚里士多德解释和布尔解释的差异
 """
 
-from syllogism import Syllogism, PropositionType
-from config import set_interpretation, InterpretationType, get_interpretation_name
-from validate_all import generate_all_syllogisms
-from validation_rules import is_valid_syllogism
+from collections import namedtuple
+
+from syllogism import Syllogism, PropositionType, FORM_COUNT
+from config import InterpretationType, get_interpretation_name, resolve_interpretation
+from validity_table import INTERPRETATIONS, get_validity_table, is_valid_form
+
+class Profile(namedtuple("Profile", "name interpretation checker backend")):
+    """
+    比较的一种配置: 名称、解释类型、可选的自定义规则检查器、查表后端
+    没有检查器时查询有效性表，否则只用检查器自己的规则逐个检查，不向检查器注册任何规则
+    """
+
+    def __new__(cls, name, interpretation=None, checker=None, backend="rules"):
+        return super().__new__(cls, name, interpretation, checker, backend)
+
+
+def valid_bitset(profile):
+    """计算某一配置下的有效形式位集: 第code位为1表示该形式有效"""
+    interpretation = resolve_interpretation(profile.interpretation)
+    if profile.checker is None:
+        table = get_validity_table(profile.backend)
+        offset = INTERPRETATIONS.index(interpretation) * FORM_COUNT
+        return sum(1 << code for code in range(FORM_COUNT) if table[offset + code])
+
+    from rule_checker import rule_passed
+    checker = profile.checker
+    return sum(1 << syl.code for syl in Syllogism.all_forms()
+               if all(rule_passed(result) for result in checker.check(syl, interpretation).values()))
+
+
+def forms_of(bitset):
+    """按编码顺序列出位集中的三段论形式"""
+    forms = []
+    while bitset:
+        low = bitset & -bitset
+        forms.append(Syllogism.from_code(low.bit_length() - 1))
+        bitset ^= low
+    return forms
+
+
+def diff_profiles(profiles):
+    """
+    比较任意多个配置下的有效形式
+
+    参数:
+        profiles: Profile或InterpretationType的序列
+
+    返回:
+        dict: valid(各配置的位集)、intersection(全部有效)、union(任一有效)、
+              exclusive(仅该配置有效)、symmetric_difference(两两之间的差异)
+
+    异常:
+        ValueError: 配置名称重复(结果按名称索引，重名的配置会互相覆盖)
+    """
+    profiles = [Profile(p.value, p) if isinstance(p, InterpretationType) else p for p in profiles]
+    seen = set()
+    for profile in profiles:
+        if profile.name in seen:
+            raise ValueError(f"配置名称重复: {profile.name}")
+        seen.add(profile.name)
+    valid = {profile.name: valid_bitset(profile) for profile in profiles}
+    names = list(valid)
+
+    all_forms_bits = (1 << FORM_COUNT) - 1
+    intersection, union = all_forms_bits, 0
+    for bits in valid.values():
+        intersection &= bits
+        union |= bits
+
+    # 前缀/后缀并集，使每个配置的独有集合只需常数次位运算
+    prefix = [0]
+    for name in names:
+        prefix.append(prefix[-1] | valid[name])
+    suffix = [0]
+    for name in reversed(names):
+        suffix.append(suffix[-1] | valid[name])
+    suffix.reverse()
+    exclusive = {name: valid[name] & ~(prefix[i] | suffix[i + 1]) for i, name in enumerate(names)}
+
+    symmetric_difference = {
+        (a, b): valid[a] ^ valid[b]
+        for i, a in enumerate(names) for b in names[i + 1:]
+    }
+    return {
+        "valid": valid,
+        "intersection": intersection,
+        "union": union,
+        "exclusive": exclusive,
+        "symmetric_difference": symmetric_difference,
+    }
+
 
 def compare_interpretations():
     """比较两种解释的差异"""
     print("=== 亚里士多德解释 vs 布尔解释 ===\n")
 
-    # 生成所有三段论
-    all_syllogisms = generate_all_syllogisms()
-
-    # 分别用两种解释验证
-    aristotelian_valid = get_valid_syllogisms(InterpretationType.ARISTOTELIAN, all_syllogisms)
-    boolean_valid = get_valid_syllogisms(InterpretationType.BOOLEAN, all_syllogisms)
+    report = diff_profiles([InterpretationType.ARISTOTELIAN, InterpretationType.BOOLEAN])
+    aristotelian = InterpretationType.ARISTOTELIAN.value
+    boolean = InterpretationType.BOOLEAN.value
 
-    print(f"亚里士多德解释有效三段论数量: {len(aristotelian_valid)}")
-    print(f"布尔解释有效三段论数量: {len(boolean_valid)}")
+    print(f"亚里士多德解释有效三段论数量: {bin(report['valid'][aristotelian]).count('1')}")
+    print(f"布尔解释有效三段论数量: {bin(report['valid'][boolean]).count('1')}")
 
     # 找出差异
-    only_aristotelian = [syl for syl in aristotelian_valid if syl.get_figure_and_mood() not in [s.get_figure_and_mood() for s in boolean_valid]]
-    only_boolean = [syl for syl in boolean_valid if syl.get_figure_and_mood() not in [s.get_figure_and_mood() for s in aristotelian_valid]]
+    only_aristotelian = forms_of(report["exclusive"][aristotelian])
+    only_boolean = forms_of(report["exclusive"][boolean])
 
     print(f"\n仅在亚里士多德解释中有效的三段论: {len(only_aristotelian)}")
     for syl in only_aristotelian:
@@ -44,15 +128,8 @@ def compare_interpretations():
             print("原因: 亚里士多德解释假设存在性，允许从全称前提推出特称结论")
 
 def get_valid_syllogisms(interpretation_type, all_syllogisms):
-    """获取在指定解释下有效的三段论"""
-    set_interpretation(interpretation_type)
-
-    valid_syllogisms = []
-    for syl in all_syllogisms:
-        if is_valid_syllogism(syl):
-            valid_syllogisms.append(syl)
-
-    return valid_syllogisms
+    """获取在指定解释下有效的三段论，不修改全局设置"""
+    return [syl for syl in all_syllogisms if is_valid_form(syl, interpretation_type)]
 
 def show_specific_examples():
     """展示具体的三段论示例"""
@@ -67,9 +144,8 @@ def show_specific_examples():
 
     # 在两种解释下检查
     for interp_type in [InterpretationType.ARISTOTELIAN, InterpretationType.BOOLEAN]:
-        set_interpretation(interp_type)
-        is_valid = is_valid_syllogism(example)
-        print(f"\n在{get_interpretation_name()}下: {'有效' if is_valid else '无效'}")
+        is_valid = is_valid_form(example, interp_type)
+        print(f"\n在{get_interpretation_name(interp_type)}下: {'有效' if is_valid else '无效'}")
         if not is_valid and interp_type == InterpretationType.BOOLEAN:
             print("  原因: 布尔解释不允许从两个全称前提推出特称结论")
 
@@ -0,0 +1,163 @@
+"""
+省略三段论补全模块
+
+给出三个命题中的任意两个(词项用S、M、P表示)，找出使三段论有效的全部缺失命题。
+补全结果按解释预先计算成查找表，补全一次只需一次字典查找
+
+排序规则:
+  1. 不依赖存在性假设的(在布尔解释下也有效的)补全优先
+  2. 缺结论时，全称结论优先于特称结论(从同样的前提得出更强的结论)
+     缺前提时，特称前提优先于全称前提(补出的假设越弱越稳妥)
+  3. 其余按形式编码排序
+"""
+
+from collections import namedtuple
+
+from syllogism import Syllogism, Proposition
+from config import InterpretationType, resolve_interpretation
+from validity_table import lookup_validity
+
+MAJOR = "major"
+MINOR = "minor"
+CONCLUSION = "conclusion"
+
+# 补全结果: 缺失的命题、补全后的三段论形式
+Completion = namedtuple("Completion", "proposition syllogism")
+
+_ROLES = (MAJOR, MINOR, CONCLUSION)
+_UNIVERSAL = ("A", "E")
+
+# 两个已知位置(按大前提、小前提、结论顺序)对应的缺失位置
+_MISSING = {(MAJOR, MINOR): CONCLUSION, (MAJOR, CONCLUSION): MINOR, (MINOR, CONCLUSION): MAJOR}
+
+_tables = {}
+
+
+# (主项, 谓项)到命题位置的映射
+_ROLE_OF_TERMS = {
+    ("M", "P"): MAJOR, ("P", "M"): MAJOR,
+    ("S", "M"): MINOR, ("M", "S"): MINOR,
+    ("S", "P"): CONCLUSION,
+}
+
+
+def proposition_role(proposition):
+    """
+    判断命题在三段论中的位置
+
+    返回:
+        MAJOR(含M和P)、MINOR(含S和M)或CONCLUSION(S为主项、P为谓项)
+    """
+    role = _ROLE_OF_TERMS.get((proposition.subject, proposition.predicate))
+    if role is None:
+        raise ValueError(f"无法确定命题在三段论中的位置: {proposition}")
+    return role
+
+
+def _rank(syl, missing):
+    """补全结果的排序键"""
+    unconditional = lookup_validity(syl.code, InterpretationType.BOOLEAN)
+    missing_proposition = syl.propositions()[_ROLES.index(missing)]
+    universal = missing_proposition.type.value in _UNIVERSAL
+    strength = not universal if missing == CONCLUSION else universal
+    return (not unconditional, strength, syl.code)
+
+
+def build_completion_table(interpretation=None, backend="rules"):
+    """
+    构建补全查找表
+
+    返回:
+        dict: 键为(缺失位置, 已知命题1, 已知命题2)，已知命题按大前提、小前提、结论顺序；
+              值为排好序的Completion元组
+    """
+    interpretation = resolve_interpretation(interpretation)
+    table = {}
+    for syl in Syllogism.all_forms():
+        if not lookup_validity(syl.code, interpretation, backend):
+            continue
+        propositions = syl.propositions()
+        for index, missing in enumerate(_ROLES):
+            known = propositions[:index] + propositions[index + 1:]
+            table.setdefault((missing,) + known, []).append(syl)
+
+    return {
+        key: tuple(
+            Completion(syl.propositions()[_ROLES.index(key[0])], syl)
+            for syl in sorted(forms, key=lambda syl: _rank(syl, key[0]))
+        )
+        for key, forms in table.items()
+    }
+
+
+def get_completion_table(interpretation=None, backend="rules"):
+    """获取补全查找表，每种解释和后端只构建一次"""
+    interpretation = resolve_interpretation(interpretation)
+    table = _tables.get((interpretation, backend))
+    if table is None:
+        table = _tables[(interpretation, backend)] = build_completion_table(interpretation, backend)
+    return table
+
+
+def _lookup(table, first, second):
+    """在补全查找表中查询两个已知命题"""
+    first_role = proposition_role(first)
+    second_role = proposition_role(second)
+    if first_role == second_role:
+        raise ValueError(f"两个命题处于同一位置: {first}, {second}")
+    if _ROLES.index(first_role) > _ROLES.index(second_role):
+        first, second = second, first
+        first_role, second_role = second_role, first_role
+    missing = _MISSING[first_role, second_role]
+    return table.get((missing, first, second), ())
+
+
+def complete(first, second, interpretation=None, backend="rules"):
+    """
+    补全省略三段论
+
+    参数:
+        first, second: 已知的两个命题(Proposition)，顺序任意
+        interpretation: 解释类型，默认为当前解释
+
+    返回:
+        tuple: 按排序规则排列的Completion；没有有效补全时为空元组
+    """
+    return _lookup(get_completion_table(interpretation, backend), first, second)
+
+
+def complete_many(pairs, interpretation=None, backend="rules"):
+    """
+    批量补全，查找表只取一次
+
+    参数:
+        pairs: (命题1, 命题2)的可迭代对象
+
+    返回:
+        生成器，依次给出每对命题的补全结果；无法确定位置的输入给出ValueError实例
+    """
+    table = get_completion_table(interpretation, backend)
+    for first, second in pairs:
+        try:
+            yield _lookup(table, first, second)
+        except ValueError as e:
+            yield e
+
+
+# 示例用法
+if __name__ == "__main__":
+    from syllogism import PropositionType
+
+    # 所有M是P，所有S是M，结论是什么?
+    first = Proposition(PropositionType.A, "M", "P")
+    second = Proposition(PropositionType.A, "S", "M")
+    for interp in InterpretationType:
+        answers = complete(first, second, interp)
+        print(f"{interp.value}: {first}; {second} => {[str(c.proposition) for c in answers]}")
+
+    # 所有M是P，因此有些S是P，缺少的小前提是什么?
+    first = Proposition(PropositionType.A, "M", "P")
+    second = Proposition(PropositionType.I, "S", "P")
+    for interp in InterpretationType:
+        answers = complete(first, second, interp)
+        print(f"{interp.value}: {first}; ? => {second}: {[str(c.proposition) for c in answers]}")
@@ -0,0 +1,186 @@
+"""
+三段论失效原因解释模块
+
+把每种形式在每种解释下违反的规则预先计算成失败位掩码，解释一次只需两次索引:
+先按形式编码取位掩码，再按位掩码取共享的原因元组。
+与五条验证规则相比，"禁止非法周延"拆成大项不当周延和小项不当周延，
+"否定前提否定结论"拆成两种方向，每个原因都指出涉及的词项
+
+位掩码中第i位对应REASON_CODES中的第i个原因
+"""
+
+from collections import namedtuple
+
+from syllogism import Syllogism, PropositionType, FORM_COUNT
+from config import InterpretationType, resolve_interpretation
+from validation_rules import (
+    middle_term_distributed_once, no_illicit_major, no_illicit_minor, no_two_negative_premises,
+    negative_premise_negative_conclusion, existential_import_rule,
+)
+
+# 失效原因: 原因代码、所属规则(get_all_validation_rules中的名称)、涉及的词项、说明
+Reason = namedtuple("Reason", "code rule terms message")
+
+UNDISTRIBUTED_MIDDLE = "undistributed_middle"
+ILLICIT_MAJOR = "illicit_major"
+ILLICIT_MINOR = "illicit_minor"
+EXCLUSIVE_PREMISES = "exclusive_premises"
+AFFIRMATIVE_FROM_NEGATIVE = "affirmative_from_negative"
+NEGATIVE_FROM_AFFIRMATIVE = "negative_from_affirmative"
+EXISTENTIAL_FALLACY = "existential_fallacy"
+
+# (原因代码, 所属规则, 涉及的词项角色, 说明模板)，顺序即位掩码中的位序
+_REASON_SPECS = (
+    (UNDISTRIBUTED_MIDDLE, "中项至少周延一次", ("M",), "中项{M}在两个前提中都不周延(中项不周延)"),
+    (ILLICIT_MAJOR, "禁止非法周延", ("P",), "大项{P}在结论中周延，但在大前提中不周延(大项不当周延)"),
+    (ILLICIT_MINOR, "禁止非法周延", ("S",), "小项{S}在结论中周延，但在小前提中不周延(小项不当周延)"),
+    (EXCLUSIVE_PREMISES, "禁止两个否定前提", ("M",), "两个前提都是否定命题，无法通过中项{M}联系大项和小项"),
+    (AFFIRMATIVE_FROM_NEGATIVE, "否定前提否定结论", (), "有一个前提是否定命题，结论却是肯定命题"),
+    (NEGATIVE_FROM_AFFIRMATIVE, "否定前提否定结论", (), "两个前提都是肯定命题，结论却是否定命题"),
+    (EXISTENTIAL_FALLACY, "存在性假设规则", ("S",), "从两个全称前提推出特称结论，需要假设{S}存在(存在谬误)"),
+)
+
+REASON_CODES = tuple(spec[0] for spec in _REASON_SPECS)
+REASON_BITS = {code: 1 << index for index, code in enumerate(REASON_CODES)}
+
+_INTERPRETATIONS = tuple(InterpretationType)
+_INTERPRETATION_INDEX = {interp: index for index, interp in enumerate(_INTERPRETATIONS)}
+_ROLE_LABELS = {"S": "S", "M": "M", "P": "P"}
+_NEGATIVE = (PropositionType.E, PropositionType.O)
+
+_masks = None
+_reasons_by_mask = None
+
+
+def _format_reasons(mask, labels):
+    """按词项标签生成位掩码对应的原因"""
+    reasons = []
+    for index, (code, rule, roles, template) in enumerate(_REASON_SPECS):
+        if mask >> index & 1:
+            reasons.append(Reason(code, rule, tuple(labels[role] for role in roles),
+                                  template.format(**labels)))
+    return tuple(reasons)
+
+
+def compute_failure_mask(syl, interpretation):
+    """用规则函数计算一种形式的失败位掩码"""
+    mask = 0
+    if not middle_term_distributed_once(syl):
+        mask |= REASON_BITS[UNDISTRIBUTED_MIDDLE]
+    if not no_illicit_major(syl):
+        mask |= REASON_BITS[ILLICIT_MAJOR]
+    if not no_illicit_minor(syl):
+        mask |= REASON_BITS[ILLICIT_MINOR]
+    if not no_two_negative_premises(syl):
+        mask |= REASON_BITS[EXCLUSIVE_PREMISES]
+    if not negative_premise_negative_conclusion(syl, interpretation):
+        negative_premise = syl.major_type in _NEGATIVE or syl.minor_type in _NEGATIVE
+        if negative_premise and syl.conclusion_type not in _NEGATIVE:
+            mask |= REASON_BITS[AFFIRMATIVE_FROM_NEGATIVE]
+        else:
+            mask |= REASON_BITS[NEGATIVE_FROM_AFFIRMATIVE]
+    if not existential_import_rule(syl, interpretation):
+        mask |= REASON_BITS[EXISTENTIAL_FALLACY]
+    return mask
+
+
+def build_failure_masks():
+    """
+    计算全部形式在每种解释下的失败位掩码
+
+    返回:
+        bytes: 长度为 解释数量 × 256，下标为 解释序号 × 256 + 形式编码
+    """
+    return bytes(
+        compute_failure_mask(syl, interp)
+        for interp in _INTERPRETATIONS
+        for syl in Syllogism.all_forms()
+    )
+
+
+def _tables():
+    """获取失败位掩码表和按位掩码排列的原因表，只计算一次"""
+    global _masks, _reasons_by_mask
+    if _masks is None:
+        _reasons_by_mask = tuple(_format_reasons(mask, _ROLE_LABELS)
+                                 for mask in range(1 << len(REASON_CODES)))
+        _masks = build_failure_masks()
+    return _masks, _reasons_by_mask
+
+
+def failure_mask(syllogism, interpretation=None):
+    """
+    查询失败位掩码，为0表示有效
+
+    参数:
+        syllogism: Syllogism或形式编码
+        interpretation: 解释类型，默认为当前解释
+    """
+    code = syllogism if isinstance(syllogism, int) else syllogism.code
+    masks, _ = _tables()
+    return masks[_INTERPRETATION_INDEX[resolve_interpretation(interpretation)] * FORM_COUNT + code]
+
+
+def reasons_for_mask(mask):
+    """位掩码对应的原因元组(词项用S、M、P表示)"""
+    return _tables()[1][mask]
+
+
+def explain(syllogism, interpretation=None):
+    """
+    解释三段论为何无效
+
+    返回:
+        tuple: Reason元组，有效时为空元组
+    """
+    return reasons_for_mask(failure_mask(syllogism, interpretation))
+
+
+def explain_many(syllogisms, interpretation=None):
+    """
+    批量解释，解释类型只确定一次
+
+    参数:
+        syllogisms: Syllogism或形式编码的可迭代对象
+
+    返回:
+        list: 与输入一一对应的Reason元组
+    """
+    masks, reasons_by_mask = _tables()
+    base = _INTERPRETATION_INDEX[resolve_interpretation(interpretation)] * FORM_COUNT
+    return [reasons_by_mask[masks[base + (syl if isinstance(syl, int) else syl.code)]]
+            for syl in syllogisms]
+
+
+def explain_argument(argument, interpretation=None):
+    """
+    解释具体论证为何无效，原因中的词项换成论证中的标签
+
+    返回:
+        (form, reasons): 抽象形式和Reason元组
+
+    异常:
+        ValueError: 论证不是恰好含三个词项的标准三段论
+    """
+    from argument import normalize
+
+    form = normalize(argument)
+    mask = failure_mask(form, interpretation)
+    if not mask:
+        return form, ()
+    first, second, conclusion = argument
+    # 规范化已保证前提中恰好有一个不在结论中的词项
+    (middle_term,) = {first.subject, first.predicate, second.subject, second.predicate} - set(conclusion[1:])
+    labels = {"S": conclusion.subject, "M": middle_term, "P": conclusion.predicate}
+    return form, _format_reasons(mask, labels)
+
+
+# 示例用法
+if __name__ == "__main__":
+    for name in ("AAA-2", "AEE-1", "AAI-1", "EOO-1"):
+        syl = Syllogism.from_name(name)
+        for interp in InterpretationType:
+            reasons = explain(syl, interp)
+            print(f"{name} ({interp.value}): 位掩码 {failure_mask(syl, interp):07b}")
+            for reason in reasons:
+                print(f"  - {reason.message}")
@@ -0,0 +1,493 @@
+"""
+扩展三段论模块
+
+在AEIO和三个词项之外，允许:
+  补项: 词项前加non-，如non-S、non-M、non-P
+  广义量词: MOST(多数X是Y)和AT_LEAST_n(至少n个X是Y)
+
+S、M、P把论域分成8个区域(区域编号的第0/1/2位表示是否属于S/M/P，与venn_engine相同)，
+每个命题都是区域计数上的线性约束，统一写成 sum(pos) - sum(neg) >= k:
+  A: X且非Y的区域计数和为0       E: X且Y的区域计数和为0
+  I: X且Y的区域计数和至少为1     O: X且非Y的区域计数和至少为1
+  MOST: X且Y的计数和大于X且非Y的计数和
+  AT_LEAST_n: X且Y的区域计数和至少为n
+形式有效当且仅当"前提成立、结论不成立"的约束组在非负整数计数上无解。
+亚里士多德解释另要求论证中出现的每个词项(含补项)都非空
+
+判定过程:
+  约束传播: 反复把计数必为0的区域去掉，遇到矛盾的约束立即判为无解
+  合并: 在全部约束中系数相同的区域合并为一个变量
+  剪枝: 只帮助满足约束的变量直接取上界，只妨碍的变量取0，其余变量在[0, bound]内搜索，
+        剩余变量全取最有利的值也满足不了某条约束时回溯
+结果按规范形式缓存: 约束组在8种补项翻转(S、M、P各自换成补项)下取最小者，
+因此换质、E/I的换位和补项翻转得到的形式共享同一个缓存条目
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+from itertools import product
+
+from config import InterpretationType, resolve_interpretation
+from immediate_inference import COMPLEMENT_PREFIX
+
+A, E, I, O = "A", "E", "I", "O"
+MOST = "MOST"
+AT_LEAST = "AT_LEAST"
+
+# 枚举时AT_LEAST_n的默认最大n
+DEFAULT_MAX_COUNT = 3
+# AT_LEAST_n支持的最大n，search_bound只在这个范围内验证过
+MAX_COUNT = 8
+
+
+class Quantifier(namedtuple("Quantifier", "kind count")):
+    """量词: kind为A、E、I、O、MOST或AT_LEAST，count只用于AT_LEAST"""
+
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{AT_LEAST}_{self.count}" if self.kind == AT_LEAST else self.kind
+
+
+def at_least(count):
+    """
+    AT_LEAST_n量词，n为1时就是I
+
+    异常:
+        ValueError: n不是1到MAX_COUNT之间的整数
+    """
+    if not isinstance(count, int) or not 1 <= count <= MAX_COUNT:
+        raise ValueError(f"无效的数量: {count}，AT_LEAST_n的n应为1到{MAX_COUNT}")
+    return Quantifier(I, 0) if count == 1 else Quantifier(AT_LEAST, count)
+
+
+def parse_quantifier(text):
+    """
+    解析量词，如A、MOST、AT_LEAST_2
+
+    异常:
+        ValueError: 无法识别的量词，或AT_LEAST_n的n超出支持范围
+    """
+    text = text.strip().upper()
+    if text in (A, E, I, O, MOST):
+        return Quantifier(text, 0)
+    prefix = AT_LEAST + "_"
+    if text.startswith(prefix) and text[len(prefix):].isdigit():
+        return at_least(int(text[len(prefix):]))
+    raise ValueError(f"无法识别的量词: {text}")
+
+
+def quantifiers(max_count=DEFAULT_MAX_COUNT):
+    """
+    枚举使用的全部量词: A、E、I、O、MOST、AT_LEAST_2..max_count
+
+    异常:
+        ValueError: max_count超过MAX_COUNT
+    """
+    if max_count > MAX_COUNT:
+        raise ValueError(f"AT_LEAST_n的n最大为{MAX_COUNT}，实际为{max_count}")
+    return (tuple(Quantifier(kind, 0) for kind in (A, E, I, O, MOST)) +
+            tuple(Quantifier(AT_LEAST, count) for count in range(2, max_count + 1)))
+
+
+class ExtendedProposition(namedtuple("ExtendedProposition", "quantifier subject predicate")):
+    """扩展命题: 量词、主项、谓项，词项为S、M、P或其补项"""
+
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.subject} {self.quantifier} {self.predicate}"
+
+    @classmethod
+    def parse(cls, text):
+        """
+        解析"主项 量词 谓项"，如"S MOST non-M"
+
+        异常:
+            ValueError: 格式错误
+        """
+        parts = text.split()
+        if len(parts) != 3:
+            raise ValueError(f"扩展命题应为'主项 量词 谓项': {text}")
+        return cls(parse_quantifier(parts[1]), parts[0], parts[2])
+
+
+class ExtendedSyllogism(namedtuple("ExtendedSyllogism", "major minor conclusion")):
+    """
+    扩展三段论形式
+
+    大前提含M和P、小前提含S和M(顺序不限，都可以是补项)，结论的主项是S或non-S、谓项是P或non-P
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return "; ".join(str(proposition) for proposition in self)
+
+    @classmethod
+    def from_text(cls, text):
+        """解析以分号分隔的三个命题，如"M A P; S MOST M; S I non-P\""""
+        parts = [part for part in text.split(";") if part.strip()]
+        if len(parts) != 3:
+            raise ValueError(f"扩展三段论应包含三个命题: {text}")
+        return cls(*(ExtendedProposition.parse(part) for part in parts))
+
+    @classmethod
+    def from_argument(cls, first, second, conclusion):
+        """
+        把词项为具体标签的扩展命题规范化为扩展形式
+
+        结论主项所属的词项为S、谓项所属的词项为P，另一个词项为M，含P的前提为大前提；
+        带non-前缀的标签是补项
+
+        异常:
+            ValueError: 不是恰好含三个词项的三段论
+        """
+        def base(term):
+            return term[len(COMPLEMENT_PREFIX):] if term.startswith(COMPLEMENT_PREFIX) else term
+
+        roles = {base(conclusion.subject): "S", base(conclusion.predicate): "P"}
+        if len(roles) != 2:
+            raise ValueError(f"结论的主项与谓项属于同一词项: {conclusion}")
+        premise_terms = {base(term) for premise in (first, second) for term in premise[1:]}
+        middle = premise_terms - set(roles)
+        if len(middle) != 1 or len(premise_terms) != 3:
+            raise ValueError("两个前提应共有一个结论中没有的中项")
+        roles[middle.pop()] = "M"
+
+        def abstract(proposition):
+            terms = []
+            for term in proposition[1:]:
+                role = roles[base(term)]
+                terms.append(COMPLEMENT_PREFIX + role if term.startswith(COMPLEMENT_PREFIX) else role)
+            return ExtendedProposition(proposition.quantifier, *terms)
+
+        first, second, conclusion = abstract(first), abstract(second), abstract(conclusion)
+        if "P" not in {term.replace(COMPLEMENT_PREFIX, "", 1) for term in first[1:]}:
+            first, second = second, first
+        return cls(first, second, conclusion)
+
+    @classmethod
+    def from_syllogism(cls, syl):
+        """标准三段论形式对应的扩展形式"""
+        return cls(*(ExtendedProposition(Quantifier(prop.type.value, 0), prop.subject, prop.predicate)
+                     for prop in syl.propositions()))
+
+
+def all_extended_forms(max_count=DEFAULT_MAX_COUNT):
+    """
+    按固定顺序枚举全部扩展形式
+
+    大前提、小前提各有 量词数 × 2种词项顺序 × 4种补项组合 种，结论有 量词数 × 4种补项组合 种
+    """
+    quantifier_list = quantifiers(max_count)
+
+    def variants(first, second, ordered):
+        pairs = []
+        for x, y in product((first, COMPLEMENT_PREFIX + first), (second, COMPLEMENT_PREFIX + second)):
+            pairs.append((x, y))
+            if not ordered:
+                pairs.append((y, x))
+        return [ExtendedProposition(quantifier, subject, predicate)
+                for quantifier in quantifier_list for subject, predicate in pairs]
+
+    majors = variants("M", "P", False)
+    minors = variants("S", "M", False)
+    conclusions = variants("S", "P", True)
+    for major in majors:
+        for minor in minors:
+            for conclusion in conclusions:
+                yield ExtendedSyllogism(major, minor, conclusion)
+
+
+def extended_form_count(max_count=DEFAULT_MAX_COUNT):
+    """扩展形式的总数"""
+    count = len(quantifiers(max_count))
+    return (count * 8) ** 2 * count * 4
+
+
+# 区域约束
+
+_ROLE_BITS = {"S": 0, "M": 1, "P": 2}
+_ROLES_OF = {"major": {"M", "P"}, "minor": {"S", "M"}}
+
+
+def _term_regions(term):
+    """
+    词项所占区域的8位掩码
+
+    异常:
+        ValueError: 不是S、M、P或其补项
+    """
+    try:
+        return _TERM_REGIONS[term]
+    except KeyError:
+        raise ValueError(f"扩展形式的词项必须是S、M、P或其补项: {term}") from None
+
+
+_TERM_REGIONS = {}
+for _role, _bit in _ROLE_BITS.items():
+    _TERM_REGIONS[_role] = sum(1 << region for region in range(8) if region >> _bit & 1)
+    _TERM_REGIONS[COMPLEMENT_PREFIX + _role] = 0xFF & ~_TERM_REGIONS[_role]
+
+# _FLIPS[f][mask]: 把区域编号与f异或(翻转f中的词项)后的掩码
+_FLIPS = tuple(
+    tuple(sum(1 << (region ^ flip) for region in range(8) if mask >> region & 1) for mask in range(256))
+    for flip in range(8)
+)
+
+
+@lru_cache(maxsize=None)
+def _constraint_variants(proposition, negated=False):
+    """
+    命题(或其否定)对应的约束在8种补项翻转下的结果，下标0为不翻转
+
+    约束(pos, neg, k)表示 sum(pos) - sum(neg) >= k
+
+    异常:
+        ValueError: 词项或量词不正确
+    """
+    kind, count = proposition.quantifier
+    subject = _term_regions(proposition.subject)
+    predicate = _term_regions(proposition.predicate)
+    both = subject & predicate
+    subject_only = subject & ~predicate
+    if kind == A:
+        constraint = (subject_only, 0, 1) if negated else (0, subject_only, 0)
+    elif kind == E:
+        constraint = (both, 0, 1) if negated else (0, both, 0)
+    elif kind == I:
+        constraint = (0, both, 0) if negated else (both, 0, 1)
+    elif kind == O:
+        constraint = (0, subject_only, 0) if negated else (subject_only, 0, 1)
+    elif kind == MOST:
+        constraint = (subject_only, both, 0) if negated else (both, subject_only, 1)
+    elif kind == AT_LEAST:
+        if not 2 <= count <= MAX_COUNT:
+            raise ValueError(f"无效的量词: {proposition.quantifier}，AT_LEAST_n的n应为2到{MAX_COUNT}")
+        constraint = (0, both, 1 - count) if negated else (both, 0, count)
+    else:
+        raise ValueError(f"未知量词: {proposition.quantifier}")
+    pos, neg, k = constraint
+    return tuple((flip[pos], flip[neg], k) for flip in _FLIPS)
+
+
+@lru_cache(maxsize=None)
+def _existence_variants(proposition):
+    """亚里士多德解释下命题两个词项非空的约束在8种补项翻转下的结果"""
+    return tuple(tuple((flip[_term_regions(term)], 0, 1) for term in proposition[1:]) for flip in _FLIPS)
+
+
+def _check_roles(syl):
+    """检查大前提含M和P、小前提含S和M、结论为S和P"""
+    for name, proposition in (("major", syl.major), ("minor", syl.minor)):
+        roles = {term.replace(COMPLEMENT_PREFIX, "", 1) for term in proposition[1:]}
+        if roles != _ROLES_OF[name]:
+            raise ValueError(f"{'大' if name == 'major' else '小'}前提的词项不正确: {proposition}")
+    conclusion = syl.conclusion
+    if (conclusion.subject.replace(COMPLEMENT_PREFIX, "", 1) != "S" or
+            conclusion.predicate.replace(COMPLEMENT_PREFIX, "", 1) != "P"):
+        raise ValueError(f"结论的主项应为S、谓项应为P: {conclusion}")
+
+
+@lru_cache(maxsize=1 << 14)
+def _part_variants(propositions, negated, interpretation):
+    """若干命题(结论取否定)及亚里士多德解释下其词项非空的约束，在8种补项翻转下的集合"""
+    variants = [_constraint_variants(proposition, negated) for proposition in propositions]
+    if interpretation == InterpretationType.ARISTOTELIAN:
+        for proposition in propositions:
+            variants.extend(zip(*_existence_variants(proposition)))
+    return tuple(frozenset(system) for system in zip(*variants))
+
+
+def _systems(syl, interpretation):
+    """约束组在8种补项翻转下的结果，两个前提的部分按前提对缓存"""
+    premises = _part_variants(syl[:2], False, interpretation)
+    conclusion = _part_variants(syl[2:], True, interpretation)
+    return [tuple(sorted(first | second)) for first, second in zip(premises, conclusion)]
+
+
+def constraints(syl, interpretation=None):
+    """
+    "前提成立、结论不成立"的约束组
+
+    返回:
+        tuple: 排好序的(pos, neg, k)约束，表示 sum(pos) - sum(neg) >= k
+
+    异常:
+        ValueError: 形式的词项或量词不正确
+    """
+    _check_roles(syl)
+    return _systems(syl, resolve_interpretation(interpretation))[0]
+
+
+def canonical_key(syl, interpretation=None):
+    """规范形式: 约束组在8种补项翻转下的最小者，等价的形式得到相同的结果"""
+    _check_roles(syl)
+    return min(_systems(syl, resolve_interpretation(interpretation)))
+
+
+def search_bound(system):
+    """
+    约束组的搜索上界: 2 × 最大常数 + 2，最大常数即AT_LEAST_n中最大的n(没有时为1)
+
+    这个上界没有对任意n的证明，是经验值: 在n不超过MAX_COUNT的全部形式上，
+    两种解释下的每个规范形式取此上界与取5 × MAX_COUNT的结果都完全一致。
+    因此at_least、parse_quantifier和约束的构造都拒绝n超过MAX_COUNT的量词；
+    提高MAX_COUNT之前需要重新做这项比较
+    """
+    return 2 * max([k for _, _, k in system] + [1]) + 2
+
+
+def satisfiable(system, bound=None):
+    """
+    约束组在每个合并变量取[0, bound]的非负整数时是否有解
+
+    参数:
+        system: (pos, neg, k)约束的可迭代对象
+        bound: 搜索上界，默认为search_bound(system)
+    """
+    system = list(system)
+    if bound is None:
+        bound = search_bound(system)
+
+    # 约束传播: 正项为空且k为0的约束迫使负项区域全为0
+    zero = 0
+    changed = True
+    while changed:
+        changed = False
+        for pos, neg, k in system:
+            if pos & ~zero:
+                continue
+            if k > 0:
+                return False
+            if k == 0 and neg & ~zero:
+                zero |= neg
+                changed = True
+
+    live = 0xFF & ~zero
+    system = [(pos & live, neg & live, k) for pos, neg, k in system]
+    system = [constraint for constraint in system if constraint[0] or constraint[1] or constraint[2] > 0]
+    if not system:
+        return True
+
+    # 合并系数相同的区域
+    signatures = set()
+    for region in range(8):
+        if live >> region & 1:
+            signature = tuple(1 if pos >> region & 1 else -1 if neg >> region & 1 else 0
+                              for pos, neg, _ in system)
+            if any(signature):
+                signatures.add(signature)
+
+    # 只有正系数的变量取上界，只有负系数的变量取0，不参与搜索
+    sums = [-k for _, _, k in system]
+    variables = []
+    for signature in signatures:
+        if min(signature) >= 0:
+            sums = [total + coefficient * bound for total, coefficient in zip(sums, signature)]
+        elif max(signature) > 0:
+            variables.append(signature)
+
+    # 每条约束在第i个变量及之后还能增加的最大值
+    headroom = [[0] * len(system) for _ in range(len(variables) + 1)]
+    for index in reversed(range(len(variables))):
+        headroom[index] = [room + bound * (coefficient > 0)
+                           for room, coefficient in zip(headroom[index + 1], variables[index])]
+
+    def search(index, sums):
+        if any(total + room < 0 for total, room in zip(sums, headroom[index])):
+            return False
+        if index == len(variables):
+            return True
+        signature = variables[index]
+        for value in range(bound + 1):
+            if search(index + 1, [total + coefficient * value for total, coefficient in zip(sums, signature)]):
+                return True
+        return False
+
+    return search(0, sums)
+
+
+_cache = {}
+
+
+def is_valid_extended(syl, interpretation=None, bound=None):
+    """
+    判断扩展三段论形式是否有效，结果按规范形式缓存
+
+    参数:
+        syl: ExtendedSyllogism，或以分号分隔的文本
+        interpretation: 解释类型，默认为当前解释
+        bound: 区域计数的搜索上界，默认按约束中的最大常数确定
+
+    异常:
+        ValueError: 形式的词项或量词不正确
+    """
+    if isinstance(syl, str):
+        syl = ExtendedSyllogism.from_text(syl)
+    key = (canonical_key(syl, interpretation), bound)
+    result = _cache.get(key)
+    if result is None:
+        result = _cache[key] = not satisfiable(key[0], bound)
+    return result
+
+
+def validate_extended_many(forms, interpretation=None, bound=None):
+    """批量判断，解释类型只确定一次；返回与输入一一对应的布尔值列表"""
+    interpretation = resolve_interpretation(interpretation)
+    return [is_valid_extended(syl, interpretation, bound) for syl in forms]
+
+
+def validate_extended_space(max_count=DEFAULT_MAX_COUNT, interpretation=None, bound=None):
+    """
+    枚举并验证全部扩展形式
+
+    返回:
+        dict: total(形式数)、valid(有效形式数)、canonical(不同规范形式数)、valid_forms(有效形式列表)
+    """
+    interpretation = resolve_interpretation(interpretation)
+    valid_forms = []
+    keys = set()
+    total = 0
+    for syl in all_extended_forms(max_count):
+        total += 1
+        key = (canonical_key(syl, interpretation), bound)
+        keys.add(key)
+        result = _cache.get(key)
+        if result is None:
+            result = _cache[key] = not satisfiable(key[0], bound)
+        if result:
+            valid_forms.append(syl)
+    return {"total": total, "valid": len(valid_forms), "canonical": len(keys), "valid_forms": valid_forms}
+
+
+def clear_cache():
+    """清空规范形式缓存"""
+    _cache.clear()
+
+
+# 示例用法
+if __name__ == "__main__":
+    import time
+
+    examples = [
+        "M A P; S A M; S A P",
+        "M MOST P; M MOST S; S I P",
+        "M MOST P; M A S; S MOST P",
+        "M A non-P; S A M; S E P",
+        "non-M A P; non-S A M; S I P",
+        "M AT_LEAST_2 P; M A S; S AT_LEAST_2 P",
+    ]
+    for text in examples:
+        syl = ExtendedSyllogism.from_text(text)
+        results = ", ".join(f"{interp.value}: {'有效' if is_valid_extended(syl, interp) else '无效'}"
+                            for interp in InterpretationType)
+        print(f"{syl}  ->  {results}")
+
+    print(f"\n扩展形式共 {extended_form_count():,} 种")
+    for interp in InterpretationType:
+        start = time.perf_counter()
+        summary = validate_extended_space(interpretation=interp)
+        print(f"{interp.value}: 有效 {summary['valid']:,} 种, 规范形式 {summary['canonical']:,} 种, "
+              f"用时 {time.perf_counter() - start:.2f}s")
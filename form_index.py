@@ -0,0 +1,97 @@
+"""
+有效形式的倒排索引
+对每种解释，把任意部分指定(大前提类型、小前提类型、结论类型、格中的任意子集)
+映射到满足条件的全部有效形式，查询只需一次字典查找
+"""
+
+from itertools import product
+
+from syllogism import Syllogism, PropositionType
+from config import resolve_interpretation
+from validity_table import lookup_validity
+
+# 索引键的字段顺序
+QUERY_FIELDS = ("major", "minor", "conclusion", "figure")
+
+_indexes = {}
+
+
+def _form_key(syl):
+    """形式的完整索引键"""
+    return (syl.major_type, syl.minor_type, syl.conclusion_type, syl.figure)
+
+
+def build_index(interpretation=None, backend="rules"):
+    """
+    构建倒排索引
+
+    返回:
+        dict: 键为4元组，未指定的字段为None；值为按编码排序的有效形式元组
+    """
+    interpretation = resolve_interpretation(interpretation)
+    index = {}
+    for syl in Syllogism.all_forms():
+        if not lookup_validity(syl.code, interpretation, backend):
+            continue
+        key = _form_key(syl)
+        # 每个有效形式登记到其全部16种部分键下
+        for mask in product((False, True), repeat=len(QUERY_FIELDS)):
+            partial = tuple(value if keep else None for value, keep in zip(key, mask))
+            index.setdefault(partial, []).append(syl)
+    return {key: tuple(forms) for key, forms in index.items()}
+
+
+def get_index(interpretation=None, backend="rules"):
+    """获取倒排索引，每种解释和后端只构建一次"""
+    interpretation = resolve_interpretation(interpretation)
+    index = _indexes.get((interpretation, backend))
+    if index is None:
+        index = _indexes[(interpretation, backend)] = build_index(interpretation, backend)
+    return index
+
+
+def _normalize_type(value, field):
+    """把"A"或PropositionType统一为PropositionType"""
+    if value is None or isinstance(value, PropositionType):
+        return value
+    try:
+        return PropositionType(str(value).strip().upper())
+    except ValueError:
+        raise ValueError(f"无效的{field}: {value}") from None
+
+
+def query(major=None, minor=None, conclusion=None, figure=None, interpretation=None, backend="rules"):
+    """
+    查询满足部分指定的有效形式
+
+    参数:
+        major、minor、conclusion: 命题类型(PropositionType或"A"/"E"/"I"/"O")，None表示任意
+        figure: 格(1-4)，None表示任意
+        interpretation: 解释类型，默认为当前解释
+
+    返回:
+        tuple: 有效形式，按编码排序
+
+    示例:
+        query(major="A", minor="E", figure=2)  # 大前提A、小前提E的第二格能推出哪些结论
+        query(conclusion="O")                  # 哪些前提组合能推出O结论
+    """
+    if figure is not None:
+        figure = int(figure)
+        if figure not in (1, 2, 3, 4):
+            raise ValueError(f"无效的格: {figure}")
+    key = (_normalize_type(major, "大前提类型"), _normalize_type(minor, "小前提类型"),
+           _normalize_type(conclusion, "结论类型"), figure)
+    return get_index(interpretation, backend).get(key, ())
+
+
+# 示例用法
+if __name__ == "__main__":
+    from config import InterpretationType
+
+    for interp in InterpretationType:
+        print(f"{interp.value}:")
+        forms = query(major="A", minor="E", figure=2, interpretation=interp)
+        print(f"  AE-2 可推出: {[syl.conclusion_type.value for syl in forms]}")
+        forms = query(conclusion="O", interpretation=interp)
+        print(f"  结论为O: {[syl.get_figure_and_mood() for syl in forms]}")
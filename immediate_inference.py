@@ -0,0 +1,432 @@
+"""
+直接推理与化归模块
+
+直接推理(由一个命题推出另一个命题):
+  换位: E、I简单换位；亚里士多德解释下A、E可限量换位(A推换位的I、E推换位的O)
+  换质: 改变质并把谓项换成补项，如S A P推S E non-P，两种解释下都成立
+  换质位: A、O直接换质位，如S A P推non-P A non-S；亚里士多德解释下E可限量换质位
+  对当关系: 亚里士多德解释下有差等推理(A推I、E推O)；矛盾命题必定一真一假
+
+两个词项及其补项上的命题只有32种模式，每种解释下预先计算每个模式经上述推理的闭包，
+以及由闭包中命题的矛盾命题得到的必假命题(反对、下反对关系由此得出)。查询时只需按模式查表
+
+化归: 按传统记忆名称(Cesare、Baroco等)把第二至四格的有效式化为第一格有效式，
+每种解释下预先计算256种形式的化归结果，得到可作为缓存键的第一格规范形式
+"""
+
+from collections import namedtuple, deque
+from functools import lru_cache
+
+from syllogism import Syllogism, Proposition, PropositionType, PROPOSITION_TYPES, _TYPE_INDEX, FORM_COUNT
+from config import InterpretationType, resolve_interpretation
+
+A, E, I, O = PropositionType.A, PropositionType.E, PropositionType.I, PropositionType.O
+
+COMPLEMENT_PREFIX = "non-"
+
+CONVERSION = "换位"
+CONVERSION_BY_LIMITATION = "限量换位"
+OBVERSION = "换质"
+CONTRAPOSITION = "换质位"
+CONTRAPOSITION_BY_LIMITATION = "限量换质位"
+SUBALTERNATION = "差等推理"
+
+# 一个命题的直接推理结论: 全部必真命题(含自身)、全部必假命题
+Consequences = namedtuple("Consequences", "true false")
+
+# 化归结果: 原形式、传统名称、第一格规范形式、化归步骤
+Reduction = namedtuple("Reduction", "form name canonical steps")
+
+_INTERPRETATIONS = tuple(InterpretationType)
+_INTERPRETATION_INDEX = {interp: index for index, interp in enumerate(_INTERPRETATIONS)}
+_CONTRADICTORY = {A: O, E: I, I: E, O: A}
+_OBVERSE = {A: E, E: A, I: O, O: I}
+_PATTERN_COUNT = 32
+
+
+def complement(term):
+    """词项的补项: P与non-P互为补项"""
+    if term.startswith(COMPLEMENT_PREFIX):
+        return term[len(COMPLEMENT_PREFIX):]
+    return COMPLEMENT_PREFIX + term
+
+
+def _base(term):
+    """去掉补项前缀后的词项及是否为补项"""
+    if term.startswith(COMPLEMENT_PREFIX):
+        return term[len(COMPLEMENT_PREFIX):], 1
+    return term, 0
+
+
+def contradictory(proposition):
+    """矛盾命题: A与O、E与I"""
+    return Proposition(_CONTRADICTORY[proposition.type], proposition.subject, proposition.predicate)
+
+
+# 命题模式: 词项X、Y及其补项上的命题，5位编码
+#   命题类型(2位) | 主项是否为Y(1位) | 主项是否为补项(1位) | 谓项是否为补项(1位)
+# 具体命题的主项所属词项记为X，因此具体命题本身的模式编码小于16
+
+def _pattern(prop_type, subject_is_y, subject_negated, predicate_negated):
+    return _TYPE_INDEX[prop_type] << 3 | subject_is_y << 2 | subject_negated << 1 | predicate_negated
+
+
+def _unpack(pattern):
+    return PROPOSITION_TYPES[pattern >> 3], pattern >> 2 & 1, pattern >> 1 & 1, pattern & 1
+
+
+def _operations(pattern, interpretation):
+    """一个模式经一步直接推理得到的(推理名称, 模式)"""
+    prop_type, subject_is_y, subject_negated, predicate_negated = _unpack(pattern)
+    aristotelian = interpretation == InterpretationType.ARISTOTELIAN
+    swapped = 1 - subject_is_y
+    results = []
+    if prop_type in (E, I):
+        results.append((CONVERSION, _pattern(prop_type, swapped, predicate_negated, subject_negated)))
+    elif aristotelian and prop_type == A:
+        results.append((CONVERSION_BY_LIMITATION, _pattern(I, swapped, predicate_negated, subject_negated)))
+    if aristotelian and prop_type == E:
+        results.append((CONVERSION_BY_LIMITATION, _pattern(O, swapped, predicate_negated, subject_negated)))
+    results.append((OBVERSION, _pattern(_OBVERSE[prop_type], subject_is_y, subject_negated, 1 - predicate_negated)))
+    if prop_type in (A, O):
+        results.append((CONTRAPOSITION, _pattern(prop_type, swapped, 1 - predicate_negated, 1 - subject_negated)))
+    elif aristotelian and prop_type == E:
+        results.append((CONTRAPOSITION_BY_LIMITATION,
+                        _pattern(O, swapped, 1 - predicate_negated, 1 - subject_negated)))
+    if aristotelian and prop_type in (A, E):
+        results.append((SUBALTERNATION, _pattern(I if prop_type == A else O,
+                                                 subject_is_y, subject_negated, predicate_negated)))
+    return results
+
+
+def _contradictory_pattern(pattern):
+    return _TYPE_INDEX[_CONTRADICTORY[PROPOSITION_TYPES[pattern >> 3]]] << 3 | pattern & 7
+
+
+def build_closure_table(interpretation=None):
+    """
+    计算一种解释下每个命题模式的直接推理闭包
+
+    返回:
+        tuple: 下标为源模式编码，元素为(必真模式元组, 必假模式元组, 推导路径字典)，
+               推导路径字典把每个必真模式映射到从源模式出发的((推理名称, 模式), ...)最短路径
+    """
+    interpretation = resolve_interpretation(interpretation)
+    table = []
+    for source in range(_PATTERN_COUNT):
+        paths = {source: ()}
+        queue = deque([source])
+        while queue:
+            pattern = queue.popleft()
+            for operation, result in _operations(pattern, interpretation):
+                if result not in paths:
+                    paths[result] = paths[pattern] + ((operation, result),)
+                    queue.append(result)
+        true = tuple(paths)
+        false = tuple(_contradictory_pattern(pattern) for pattern in true)
+        table.append((true, false, paths))
+    return tuple(table)
+
+
+_closure_tables = {}
+
+
+def get_closure_table(interpretation=None):
+    """获取直接推理闭包表，每种解释只计算一次"""
+    interpretation = resolve_interpretation(interpretation)
+    table = _closure_tables.get(interpretation)
+    if table is None:
+        table = _closure_tables[interpretation] = build_closure_table(interpretation)
+    return table
+
+
+def _split(proposition):
+    """
+    具体命题的词项表和模式编码
+
+    返回:
+        (terms, pattern): terms[主项是否为Y][是否为补项]为对应的具体词项
+
+    异常:
+        ValueError: 主项和谓项是同一词项或互为补项
+    """
+    x, subject_negated = _base(proposition.subject)
+    y, predicate_negated = _base(proposition.predicate)
+    if x == y:
+        raise ValueError(f"主项和谓项必须是不同的词项: {proposition}")
+    terms = ((x, COMPLEMENT_PREFIX + x), (y, COMPLEMENT_PREFIX + y))
+    return terms, _pattern(proposition.type, 0, subject_negated, predicate_negated)
+
+
+def _concrete(pattern, terms):
+    prop_type, subject_is_y, subject_negated, predicate_negated = _unpack(pattern)
+    return Proposition(prop_type, terms[subject_is_y][subject_negated], terms[1 - subject_is_y][predicate_negated])
+
+
+@lru_cache(maxsize=1 << 16)
+def _consequences(proposition, interpretation):
+    terms, pattern = _split(proposition)
+    true, false, _ = get_closure_table(interpretation)[pattern]
+    return Consequences(tuple(_concrete(p, terms) for p in true), tuple(_concrete(p, terms) for p in false))
+
+
+def immediate_consequences(proposition, interpretation=None):
+    """
+    一个命题为真时直接推出的结论
+
+    参数:
+        proposition: 直言命题，词项可以是non-前缀的补项
+        interpretation: 解释类型，默认为当前解释
+
+    返回:
+        Consequences: true为必真命题(第一个是命题本身)，false为必假命题
+
+    异常:
+        ValueError: 主项和谓项是同一词项或互为补项
+    """
+    return _consequences(proposition, resolve_interpretation(interpretation))
+
+
+def consequences_many(propositions, interpretation=None):
+    """批量查询直接推理结论，解释类型只确定一次"""
+    interpretation = resolve_interpretation(interpretation)
+    return [_consequences(proposition, interpretation) for proposition in propositions]
+
+
+def derivation(source, target, interpretation=None):
+    """
+    由source直接推出target的最短推理步骤
+
+    返回:
+        tuple: ((推理名称, 得到的命题), ...)，target就是source时为空元组；推不出时为None
+    """
+    terms, pattern = _split(source)
+    paths = get_closure_table(interpretation)[pattern][2]
+    for candidate, path in paths.items():
+        if _concrete(candidate, terms) == target:
+            return tuple((operation, _concrete(step, terms)) for operation, step in path)
+    return None
+
+
+def convert(proposition, interpretation=None):
+    """换位，E、I简单换位，亚里士多德解释下A限量换位；不能换位时返回None"""
+    prop_type, subject, predicate = proposition
+    if prop_type in (E, I):
+        return Proposition(prop_type, predicate, subject)
+    if resolve_interpretation(interpretation) == InterpretationType.ARISTOTELIAN and prop_type == A:
+        return Proposition(I, predicate, subject)
+    return None
+
+
+def obvert(proposition):
+    """换质"""
+    prop_type, subject, predicate = proposition
+    return Proposition(_OBVERSE[prop_type], subject, complement(predicate))
+
+
+def contrapose(proposition, interpretation=None):
+    """换质位，A、O直接换质位，亚里士多德解释下E限量换质位；不能换质位时返回None"""
+    prop_type, subject, predicate = proposition
+    if prop_type in (A, O):
+        return Proposition(prop_type, complement(predicate), complement(subject))
+    if resolve_interpretation(interpretation) == InterpretationType.ARISTOTELIAN and prop_type == E:
+        return Proposition(O, complement(predicate), complement(subject))
+    return None
+
+
+# 传统记忆名称: 元音依次为大前提、小前提、结论的类型，首字母为化归到的第一格式(B、C、D、F)，
+# 元音后的s表示简单换位、p表示限量换位、m表示交换前提、c表示归谬
+MNEMONICS = {
+    1: ("Barbara", "Celarent", "Darii", "Ferio", "Barbari", "Celaront"),
+    2: ("Cesare", "Camestres", "Festino", "Baroco", "Cesaro", "Camestros"),
+    3: ("Darapti", "Disamis", "Datisi", "Felapton", "Bocardo", "Ferison"),
+    4: ("Bramantip", "Camenes", "Dimaris", "Fesapo", "Fresison", "Calemos"),
+}
+
+_VOWELS = {"a": A, "e": E, "i": I, "o": O}
+
+
+def _parse_mnemonic(name):
+    """记忆名称的式和每个命题后的操作字母"""
+    types = []
+    operations = []
+    for letter in name.lower():
+        if letter in _VOWELS:
+            types.append(_VOWELS[letter])
+            operations.append("")
+        elif operations:
+            operations[-1] += letter
+    return types, operations
+
+
+def _mnemonic_names():
+    """三段论形式到传统名称的映射"""
+    names = {}
+    for figure, mnemonics in MNEMONICS.items():
+        for name in mnemonics:
+            mood = "".join(prop_type.value for prop_type in _parse_mnemonic(name)[0])
+            names[Syllogism.from_name(f"{mood}-{figure}")] = name
+    return names
+
+
+def _first_figure_conclusion(major, minor, target, interpretation, valid):
+    """
+    以major、minor为第一格前提，找出能推出target的结论
+
+    返回:
+        (canonical, steps): 第一格形式和由其结论得到target的步骤；找不到时为None
+    """
+    best = None
+    for prop_type in PROPOSITION_TYPES:
+        canonical = Syllogism(major.type, minor.type, prop_type, 0, 1)
+        if not valid(canonical):
+            continue
+        conclusion = Proposition(prop_type, minor.subject, major.predicate)
+        path = derivation(conclusion, target, interpretation)
+        if path is not None and (best is None or len(path) < len(best[1])):
+            steps = tuple(f"结论 {result} 由 {conclusion} {operation}得到" for operation, result in path)
+            best = (canonical, path, steps)
+    return None if best is None else (best[0], best[2])
+
+
+def _reduce(syl, name, interpretation, valid):
+    """按记忆名称化归一种有效形式"""
+    _, operations = _parse_mnemonic(name)
+    major, minor, conclusion = syl.propositions()
+    if syl.figure == 1:
+        return Reduction(syl, name, syl, ())
+
+    premises = [major, minor]
+    labels = ["大前提", "小前提"]
+    steps = []
+    swap = "m" in "".join(operations)
+    for index in range(2):
+        if "c" in operations[index]:
+            # 归谬: 假设结论的矛盾命题，与另一个前提推出与本前提矛盾的命题
+            assumption = contradictory(conclusion)
+            other = premises[1 - index]
+            for first, second in ((other, assumption), (assumption, other)):
+                if first.subject != second.predicate:
+                    continue
+                target = contradictory(premises[index])
+                found = _first_figure_conclusion(first, second, target, interpretation, valid)
+                if found is not None:
+                    canonical, _ = found
+                    conclusion_proposition = Proposition(canonical.conclusion_type, second.subject, first.predicate)
+                    steps = [f"假设结论的矛盾命题 {assumption} 成立",
+                             f"以 {first} 和 {second} 为前提按 {canonical.get_figure_and_mood()} "
+                             f"推出 {conclusion_proposition}",
+                             f"与{labels[index]} {premises[index]} 矛盾，故结论 {conclusion} 成立"]
+                    return Reduction(syl, name, canonical, tuple(steps))
+            return None
+        before = premises[index]
+        if "s" in operations[index]:
+            premises[index] = Proposition(before.type, before.predicate, before.subject)
+            steps.append(f"{labels[index]} {before} 简单换位为 {premises[index]}")
+        elif "p" in operations[index]:
+            premises[index] = convert(before, InterpretationType.ARISTOTELIAN)
+            steps.append(f"{labels[index]} {before} 限量换位为 {premises[index]}")
+
+    first, second = premises
+    if swap:
+        first, second = second, first
+        steps.append("交换前提")
+    if first.subject != second.predicate:
+        return None
+    found = _first_figure_conclusion(first, second, conclusion, interpretation, valid)
+    if found is None:
+        return None
+    canonical, conclusion_steps = found
+    return Reduction(syl, name, canonical, tuple(steps) + conclusion_steps)
+
+
+def build_reduction_table(interpretation=None):
+    """
+    计算一种解释下全部形式的化归结果
+
+    返回:
+        tuple: 下标为形式编码，有效形式为Reduction，无效形式为None
+    """
+    from validity_table import is_valid_form
+
+    interpretation = resolve_interpretation(interpretation)
+
+    def valid(syl):
+        return is_valid_form(syl, interpretation)
+
+    names = _mnemonic_names()
+    table = []
+    for syl in Syllogism.all_forms():
+        name = names.get(syl)
+        table.append(_reduce(syl, name, interpretation, valid) if name and valid(syl) else None)
+    return tuple(table)
+
+
+_reductions = None
+_canonical_codes = None
+
+
+def _reduction_tables():
+    """全部解释下的化归表和规范形式编码表，只计算一次"""
+    global _reductions, _canonical_codes
+    if _reductions is None:
+        reductions = tuple(reduction for interp in _INTERPRETATIONS
+                           for reduction in build_reduction_table(interp))
+        _canonical_codes = tuple(None if reduction is None else reduction.canonical.code
+                                 for reduction in reductions)
+        _reductions = reductions
+    return _reductions, _canonical_codes
+
+
+def reduce_form(syllogism, interpretation=None):
+    """
+    把有效形式化归为第一格
+
+    参数:
+        syllogism: Syllogism或形式编码
+        interpretation: 解释类型，默认为当前解释
+
+    返回:
+        Reduction: 第一格形式化归为自身；无效形式返回None
+    """
+    code = syllogism if isinstance(syllogism, int) else syllogism.code
+    reductions, _ = _reduction_tables()
+    return reductions[_INTERPRETATION_INDEX[resolve_interpretation(interpretation)] * FORM_COUNT + code]
+
+
+def canonical_code(syllogism, interpretation=None):
+    """第一格规范形式的编码，无效形式返回None"""
+    code = syllogism if isinstance(syllogism, int) else syllogism.code
+    _, codes = _reduction_tables()
+    return codes[_INTERPRETATION_INDEX[resolve_interpretation(interpretation)] * FORM_COUNT + code]
+
+
+def reduce_many(syllogisms, interpretation=None):
+    """批量化归，返回与输入一一对应的Reduction或None"""
+    reductions, _ = _reduction_tables()
+    base = _INTERPRETATION_INDEX[resolve_interpretation(interpretation)] * FORM_COUNT
+    return [reductions[base + (syl if isinstance(syl, int) else syl.code)] for syl in syllogisms]
+
+
+def canonical_codes_many(syllogisms, interpretation=None):
+    """批量查询第一格规范形式编码，无效形式为None"""
+    _, codes = _reduction_tables()
+    base = _INTERPRETATION_INDEX[resolve_interpretation(interpretation)] * FORM_COUNT
+    return [codes[base + (syl if isinstance(syl, int) else syl.code)] for syl in syllogisms]
+
+
+# 示例用法
+if __name__ == "__main__":
+    for interp in InterpretationType:
+        print(f"=== {interp.value} ===")
+        result = immediate_consequences(Proposition(A, "S", "P"), interp)
+        print(f"S A P 为真时必真: {', '.join(map(str, result.true))}")
+        print(f"S A P 为真时必假: {', '.join(map(str, result.false))}")
+        for name in ("EAE-2", "AOO-2", "AAI-4", "IAI-3"):
+            reduction = reduce_form(Syllogism.from_name(name), interp)
+            if reduction is None:
+                print(f"{name}: 在该解释下无效")
+                continue
+            print(f"{name} ({reduction.name}) 化归为 {reduction.canonical.get_figure_and_mood()}")
+            for step in reduction.steps:
+                print(f"  - {step}")
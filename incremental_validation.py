@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+增量验证模块
+
+按(解释, 形式, 规则)缓存每条规则的结果，并记录每个单元在运行时是否读取了解释类型。
+检查器的规则增加、替换或删除后，sync()只重新运行受影响的规则列；
+不读取解释的单元在两种解释下共用一次运行结果，
+因此切换解释时只有读取过解释的形式可能改变结论。
+结论有变化的形式可以经ResultStore.update_forms按形式编码写回已存储的语料
+
+用法:
+    validator = IncrementalValidator(checker)
+    checker.add_rule("第一格", lambda syl: syl.figure == 1)
+    changed = validator.sync()      # 只运行新规则，返回结论有变化的(解释, 形式编码)
+    validator.push(store)           # 只改写含这些形式的块
+"""
+
+from syllogism import Syllogism, FORM_COUNT
+from config import InterpretationType, interpretation_context, track_interpretation_reads, resolve_interpretation
+from rule_checker import ERROR_PREFIX, rule_passed
+
+# 缓存中解释类型的顺序，与validity_table和result_store一致
+INTERPRETATIONS = tuple(InterpretationType)
+_INTERPRETATION_INDEX = {interp: index for index, interp in enumerate(INTERPRETATIONS)}
+
+
+class _RuleColumn:
+    """一条规则在全部(解释, 形式)上的结果"""
+
+    def __init__(self, func, results, reads):
+        self.func = func
+        self.results = results  # 下标为 解释序号 × 256 + 形式编码
+        self.reads = reads      # 下标为形式编码，该形式上运行规则时是否读取了解释
+
+
+class IncrementalValidator:
+    """
+    检查器规则结果的增量缓存
+
+    与SyllogismChecker.check一致，同名规则以最后注册的为准，
+    规则异常记录为错误信息，并在结论和失败位掩码中算作失败；规则必须是确定性的
+    """
+
+    def __init__(self, checker=None):
+        """
+        参数:
+            checker: 可选的SyllogismChecker实例，默认为注册了全部验证规则的检查器
+        """
+        if checker is None:
+            from rule_checker import SyllogismChecker
+            from validation_rules import get_all_validation_rules
+            checker = SyllogismChecker()
+            for rule_name, rule_func in get_all_validation_rules():
+                checker.add_rule(rule_name, rule_func)
+        self.checker = checker
+        self.evaluations = 0  # 累计运行规则函数的次数
+        self._columns = {}
+        self._valid = bytes(len(INTERPRETATIONS) * FORM_COUNT)
+        self.sync()
+
+    @property
+    def rule_names(self):
+        """当前缓存的规则名称，顺序同check的返回值"""
+        return tuple(self._columns)
+
+    def _evaluate(self, func):
+        """运行一条规则；读取解释的形式才在其余解释下重新运行"""
+        results = [None] * (len(INTERPRETATIONS) * FORM_COUNT)
+        reads = [False] * FORM_COUNT
+        first, rest = INTERPRETATIONS[0], INTERPRETATIONS[1:]
+        for syl in Syllogism.all_forms():
+            code = syl.code
+            with interpretation_context(first), track_interpretation_reads() as tracked:
+                result = _run_rule(func, syl)
+            self.evaluations += 1
+            results[code] = result
+            reads[code] = tracked.count > 0
+            for interp in rest:
+                index = _INTERPRETATION_INDEX[interp] * FORM_COUNT + code
+                if reads[code]:
+                    with interpretation_context(interp):
+                        results[index] = _run_rule(func, syl)
+                    self.evaluations += 1
+                else:
+                    results[index] = result
+        return _RuleColumn(func, results, reads)
+
+    def sync(self):
+        """
+        按检查器当前的规则更新缓存
+
+        新增的规则和函数被替换的规则重新运行，删除的规则丢弃，其余规则不运行
+
+        返回:
+            list: 结论有变化的(解释, 形式编码)，按解释和编码排序
+        """
+        rules = dict(self.checker.rules)
+        columns = {}
+        for rule_name, rule_func in rules.items():
+            column = self._columns.get(rule_name)
+            if column is None or column.func is not rule_func:
+                column = self._evaluate(rule_func)
+            columns[rule_name] = column
+        self._columns = columns
+
+        valid = bytearray(len(INTERPRETATIONS) * FORM_COUNT)
+        for index in range(len(valid)):
+            valid[index] = all(rule_passed(column.results[index]) for column in columns.values())
+        changed = [(INTERPRETATIONS[index // FORM_COUNT], index % FORM_COUNT)
+                   for index in range(len(valid)) if valid[index] != self._valid[index]]
+        self._valid = bytes(valid)
+        return changed
+
+    def check(self, syllogism, interpretation=None):
+        """缓存中全部规则的结果，与SyllogismChecker.check相同；interpretation默认为当前解释"""
+        index = _INTERPRETATION_INDEX[resolve_interpretation(interpretation)] * FORM_COUNT + syllogism.code
+        return {rule_name: column.results[index] for rule_name, column in self._columns.items()}
+
+    def is_valid(self, syllogism, interpretation=None):
+        """形式是否通过全部规则，interpretation默认为当前解释"""
+        index = _INTERPRETATION_INDEX[resolve_interpretation(interpretation)] * FORM_COUNT + syllogism.code
+        return self._valid[index] == 1
+
+    def verdicts(self, interpretation=None):
+        """
+        全部形式的有效性
+
+        返回:
+            bytes: 长度256，下标为形式编码
+        """
+        offset = _INTERPRETATION_INDEX[resolve_interpretation(interpretation)] * FORM_COUNT
+        return self._valid[offset:offset + FORM_COUNT]
+
+    def dependencies(self, syllogism):
+        """
+        形式的结果依赖的规则
+
+        返回:
+            dict: 规则名称到该规则在此形式上是否读取了解释的映射
+        """
+        return {rule_name: column.reads[syllogism.code] for rule_name, column in self._columns.items()}
+
+    def interpretation_dependent(self):
+        """至少有一条规则读取了解释的形式编码"""
+        return [code for code in range(FORM_COUNT)
+                if any(column.reads[code] for column in self._columns.values())]
+
+    def interpretation_changes(self, old, new):
+        """
+        从old解释切换到new解释时结论改变的形式编码
+
+        只检查读取了解释的形式，其余形式在两种解释下的结果是同一次运行得到的
+        """
+        old_offset = _INTERPRETATION_INDEX[resolve_interpretation(old)] * FORM_COUNT
+        new_offset = _INTERPRETATION_INDEX[resolve_interpretation(new)] * FORM_COUNT
+        return [code for code in self.interpretation_dependent()
+                if self._valid[old_offset + code] != self._valid[new_offset + code]]
+
+    def form_table(self):
+        """
+        result_store格式的形式表，失败位掩码第i位对应rule_names[i]
+        需要安装NumPy
+
+        异常:
+            ValueError: 规则超过8条，失败位掩码放不下
+        """
+        import numpy as np
+        from result_store import RECORD_DTYPE
+
+        if len(self._columns) > 8:
+            raise ValueError(f"失败位掩码最多记录8条规则，实际为{len(self._columns)}条")
+        table = np.zeros(FORM_COUNT, dtype=RECORD_DTYPE)
+        table["code"] = np.arange(FORM_COUNT)
+        for interp_index in range(len(INTERPRETATIONS)):
+            offset = interp_index * FORM_COUNT
+            valid = np.frombuffer(self._valid, dtype=np.uint8)[offset:offset + FORM_COUNT]
+            table["valid"] |= valid << interp_index
+            for bit, column in enumerate(self._columns.values()):
+                results = column.results[offset:offset + FORM_COUNT]
+                failed = np.array([not rule_passed(result) for result in results], dtype=np.uint8)
+                table["failures"][:, interp_index] |= failed << bit
+        return table
+
+    def push(self, store):
+        """
+        把当前结论写回ResultStore，只改写结论有变化的形式所在的块
+
+        返回:
+            dict: ResultStore.update_forms的统计
+        """
+        return store.update_forms(self.form_table(), self.rule_names)
+
+
+def _run_rule(func, syllogism):
+    """执行一条规则，异常记录为错误信息(与SyllogismChecker.check一致)"""
+    try:
+        return func(syllogism)
+    except Exception as e:
+        return f"{ERROR_PREFIX}{e}"
+
+
+# 示例用法
+if __name__ == "__main__":
+    validator = IncrementalValidator()
+    print(f"初始: 运行规则{validator.evaluations}次")
+    print(f"依赖解释的形式: {len(validator.interpretation_dependent())}种")
+    changes = validator.interpretation_changes(InterpretationType.BOOLEAN, InterpretationType.ARISTOTELIAN)
+    print("切换到亚里士多德解释后变为有效:",
+          ", ".join(Syllogism.from_code(code).get_figure_and_mood() for code in changes))
+
+    before = validator.evaluations
+    validator.checker.add_rule("结论为全称", lambda syl: syl.conclusion_type.value in "AE")
+    changed = validator.sync()
+    print(f"新增规则: 运行规则{validator.evaluations - before}次, {len(changed)}个单元结论改变")
@@ -0,0 +1,114 @@
+"""
+规则检查的统计模块
+记录每条规则的调用次数、累计耗时、通过/失败/异常次数和耗时直方图，
+支持快照、清零以及导出为JSON和Prometheus文本格式
+"""
+
+import json
+import threading
+from bisect import bisect_left
+
+# 耗时直方图的上界(秒)，最后一个桶为+Inf
+DEFAULT_LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 1e-3, 1e-2)
+
+PASSED = "passed"
+FAILED = "failed"
+ERROR = "errors"
+
+
+class RuleInstrumentation:
+    """线程安全的规则统计"""
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, rule_name, elapsed, outcome):
+        """
+        记录一次规则调用
+
+        参数:
+            rule_name: 规则名称
+            elapsed: 耗时(秒)
+            outcome: PASSED、FAILED或ERROR
+        """
+        with self._lock:
+            stats = self._stats.get(rule_name)
+            if stats is None:
+                stats = self._stats[rule_name] = {
+                    "calls": 0, PASSED: 0, FAILED: 0, ERROR: 0, "total_seconds": 0.0,
+                    "buckets": [0] * (len(self.buckets) + 1),
+                }
+            stats["calls"] += 1
+            stats[outcome] += 1
+            stats["total_seconds"] += elapsed
+            stats["buckets"][bisect_left(self.buckets, elapsed)] += 1
+
+    def snapshot(self):
+        """
+        获取当前统计的副本
+
+        返回:
+            dict: 规则名称到统计的映射，histogram为各上界的累计次数
+        """
+        with self._lock:
+            items = [(name, dict(stats, buckets=list(stats["buckets"])))
+                     for name, stats in self._stats.items()]
+        snapshot = {}
+        for name, stats in items:
+            cumulative = 0
+            histogram = {}
+            for bound, count in zip(self.buckets + (float("inf"),), stats.pop("buckets")):
+                cumulative += count
+                histogram[_format_bound(bound)] = cumulative
+            stats["histogram"] = histogram
+            snapshot[name] = stats
+        return snapshot
+
+    def reset(self):
+        """清零全部统计"""
+        with self._lock:
+            self._stats.clear()
+
+    def to_json(self, **kwargs):
+        """导出为JSON字符串"""
+        return json.dumps(self.snapshot(), ensure_ascii=False, **kwargs)
+
+    def to_prometheus(self, prefix="syllogism_rule"):
+        """导出为Prometheus文本格式"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def header(name, kind, description):
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        header("calls_total", "counter", "Rule invocations.")
+        for rule, stats in snapshot.items():
+            lines.append(f'{prefix}_calls_total{{rule="{_escape(rule)}"}} {stats["calls"]}')
+
+        header("results_total", "counter", "Rule outcomes by result.")
+        for rule, stats in snapshot.items():
+            for outcome, label in ((PASSED, "pass"), (FAILED, "fail"), (ERROR, "error")):
+                lines.append(f'{prefix}_results_total{{rule="{_escape(rule)}",result="{label}"}} '
+                             f'{stats[outcome]}')
+
+        header("latency_seconds", "histogram", "Rule latency in seconds.")
+        for rule, stats in snapshot.items():
+            label = _escape(rule)
+            for bound, count in stats["histogram"].items():
+                lines.append(f'{prefix}_latency_seconds_bucket{{rule="{label}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_latency_seconds_sum{{rule="{label}"}} {stats["total_seconds"]!r}')
+            lines.append(f'{prefix}_latency_seconds_count{{rule="{label}"}} {stats["calls"]}')
+        return "\n".join(lines) + "\n"
+
+
+def _format_bound(bound):
+    """直方图上界的文本形式"""
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _escape(value):
+    """转义Prometheus标签值"""
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+验证服务的本地压测脚本
+
+用多个长连接并发发送/validate请求，统计吞吐量和p50/p99延迟。
+不指定--port时在同一进程内启动一个验证服务作为压测目标
+
+用法:
+    python3 load_generator.py                                 # 压测进程内的服务
+    python3 load_generator.py --port 8080 --connections 64    # 压测已启动的服务
+    python3 load_generator.py --batch 100 --reasons           # 每个请求100个形式并返回原因
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from syllogism import Syllogism
+from config import InterpretationType
+
+
+def percentile(sorted_values, fraction):
+    """已排序数据的分位数(最近秩)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def _read_response(reader):
+    """读取一个HTTP响应，返回(状态码, 响应体)"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _client(host, port, requests, bodies, latencies, statuses):
+    """一个长连接上依次发送请求"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for index in range(requests):
+            body = bodies[index % len(bodies)]
+            request = (f"POST /validate HTTP/1.1\r\nHost: {host}\r\n"
+                       f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                       ).encode("latin-1") + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, _ = await _read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+def make_bodies(batch=1, interpretation=None, reasons=False, count=64, seed=0):
+    """生成若干个随机请求体"""
+    rng = random.Random(seed)
+    names = [syl.get_figure_and_mood() for syl in Syllogism.all_forms()]
+    interpretations = [interpretation.value] if interpretation else [interp.value for interp in InterpretationType]
+    bodies = []
+    for _ in range(count):
+        request = {"interpretation": rng.choice(interpretations)}
+        if reasons:
+            request["reasons"] = True
+        if batch == 1:
+            request["form"] = rng.choice(names)
+        else:
+            request["forms"] = [rng.choice(names) for _ in range(batch)]
+        bodies.append(json.dumps(request).encode("utf-8"))
+    return bodies
+
+
+async def run_load(host, port, connections=32, requests=200, batch=1, interpretation=None, reasons=False):
+    """
+    并发压测
+
+    返回:
+        dict: requests、seconds、qps、p50_ms、p99_ms、max_ms、statuses
+    """
+    bodies = make_bodies(batch, interpretation, reasons)
+    latencies = []
+    statuses = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, requests, bodies, latencies, statuses)
+                           for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "qps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+async def _run_local(args):
+    """在进程内启动服务并压测"""
+    from validation_service import ValidationService
+
+    service = ValidationService()
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await run_load("127.0.0.1", port, args.connections, args.requests, args.batch,
+                              args.interpretation, args.reasons)
+    finally:
+        server.close()
+        await server.wait_closed()
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="验证服务压测")
+    parser.add_argument("--host", default="127.0.0.1", help="服务地址")
+    parser.add_argument("--port", type=int, help="服务端口，不指定时在进程内启动服务")
+    parser.add_argument("--connections", type=int, default=32, help="并发连接数")
+    parser.add_argument("--requests", type=int, default=200, help="每个连接发送的请求数")
+    parser.add_argument("--batch", type=int, default=1, help="每个请求包含的形式数")
+    parser.add_argument("--interpretation", choices=[interp.value for interp in InterpretationType],
+                        help="请求使用的解释类型，默认两种随机混合")
+    parser.add_argument("--reasons", action="store_true", help="请求返回未通过的规则")
+    args = parser.parse_args(argv)
+    args.interpretation = InterpretationType(args.interpretation) if args.interpretation else None
+
+    if args.port is None:
+        stats = asyncio.run(_run_local(args))
+    else:
+        stats = asyncio.run(run_load(args.host, args.port, args.connections, args.requests,
+                                     args.batch, args.interpretation, args.reasons))
+
+    print(f"请求数: {stats['requests']}  用时: {stats['seconds']:.2f}s  吞吐量: {stats['qps']:,.0f} 次/秒")
+    print(f"延迟: p50 {stats['p50_ms']:.2f}ms  p99 {stats['p99_ms']:.2f}ms  最大 {stats['max_ms']:.2f}ms")
+    print(f"状态码: {stats['statuses']}")
+    return 0 if set(stats["statuses"]) == {200} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+自然语言直言命题解析模块
+
+支持的句式(英文不区分大小写):
+  A: All/Every/Each S are/is P        所有/一切/凡S都是P
+  E: No S are/is P                     所有/一切/凡S都不是P，没有S是P
+  I: Some S are/is P                   有些/有的/某些S是P
+  O: Some S are/is not P               有些/有的/某些S不是P
+结论前的Therefore/Thus/Hence/So/所以/因此可以省略
+
+词项会去掉首尾空白和标点、合并连续空白、英文转为小写，并驻留为共享字符串。
+解析结果用LRU缓存，重复出现的句子只解析一次
+"""
+
+import re
+from functools import lru_cache
+
+from syllogism import PropositionType
+from argument import Argument, make_proposition
+
+CACHE_SIZE = 1 << 16
+
+_ENGLISH = re.compile(
+    r"(?:(?P<all>all|every|each)|(?P<no>no)|(?P<some>some))\s+"
+    r"(?P<subject>.+?)\s+(?:are|is)\s+(?P<not>not\s+)?(?P<predicate>.+)",
+    re.IGNORECASE,
+)
+_CHINESE_UNIVERSAL = re.compile(r"(?:所有|一切|凡是|凡)(?P<subject>.+?)都(?P<not>不)?是(?P<predicate>.+)")
+_CHINESE_NONE = re.compile(r"没有(?P<subject>.+?)是(?P<predicate>.+)")
+_CHINESE_PARTICULAR = re.compile(r"(?:有些|有的|某些)(?P<subject>.+?)(?P<not>不)?是(?P<predicate>.+)")
+
+_CONCLUSION_MARKER = re.compile(r"(?:(?:therefore|thus|hence|so)\b|所以|因此)[\s,，:：]*", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = " \t\r\n.,;:!?。，；：！？、\"'“”‘’"
+_SENTENCE_END = re.compile(r"[.;。；!！?？]+|\n")
+
+
+def normalize_term(term):
+    """规范化词项: 去掉首尾空白和标点，合并连续空白，英文转为小写"""
+    return _WHITESPACE.sub(" ", term.strip(_PUNCTUATION)).casefold()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_sentence(sentence):
+    """
+    把一句话解析为直言命题
+
+    返回:
+        Proposition: 词项为规范化后的标签
+
+    异常:
+        ValueError: 句子不是支持的AEIO句式
+    """
+    text = sentence.strip(_PUNCTUATION)
+    marker = _CONCLUSION_MARKER.match(text)
+    if marker and marker.end() < len(text):
+        text = text[marker.end():]
+
+    match = _ENGLISH.fullmatch(text)
+    if match:
+        negative = match.group("not") is not None
+        if match.group("all"):
+            prop_type = None if negative else PropositionType.A
+        elif match.group("no"):
+            prop_type = None if negative else PropositionType.E
+        else:
+            prop_type = PropositionType.O if negative else PropositionType.I
+    elif (match := _CHINESE_UNIVERSAL.fullmatch(text)):
+        prop_type = PropositionType.E if match.group("not") else PropositionType.A
+    elif (match := _CHINESE_NONE.fullmatch(text)):
+        prop_type = PropositionType.E
+    elif (match := _CHINESE_PARTICULAR.fullmatch(text)):
+        prop_type = PropositionType.O if match.group("not") else PropositionType.I
+    else:
+        prop_type = None
+
+    if prop_type is None:
+        raise ValueError(f"无法解析的句子: {sentence}")
+    subject = normalize_term(match.group("subject"))
+    predicate = normalize_term(match.group("predicate"))
+    if not subject or not predicate:
+        raise ValueError(f"无法解析的句子: {sentence}")
+    return make_proposition(prop_type, subject, predicate)
+
+
+def split_sentences(text):
+    """按换行和句末标点切分句子，去掉空句"""
+    return [sentence for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+
+
+def parse_argument(text):
+    """
+    把一段恰好含三句话的文本解析为具体论证，最后一句为结论
+
+    异常:
+        ValueError: 句子数量不是3或有无法解析的句子
+    """
+    sentences = split_sentences(text)
+    if len(sentences) != 3:
+        raise ValueError(f"论证应包含3句话，实际为{len(sentences)}句: {text.strip()}")
+    return Argument(*(parse_sentence(sentence) for sentence in sentences))
+
+
+def parse_arguments(lines):
+    """
+    流式解析论证，空行分隔不同的论证
+
+    参数:
+        lines: 文本行的可迭代对象，如打开的文件
+
+    返回:
+        生成器，依次给出Argument；无法解析的论证给出ValueError实例
+    """
+    block = []
+    for line in lines:
+        if line.strip():
+            block.append(line)
+            continue
+        if block:
+            yield _parse_block(block)
+            block = []
+    if block:
+        yield _parse_block(block)
+
+
+def _parse_block(block):
+    """解析一个论证块"""
+    try:
+        return parse_argument("\n".join(block))
+    except ValueError as e:
+        return e
+
+
+# 示例用法
+if __name__ == "__main__":
+    from argument import validate_arguments
+
+    source = """All mammals are animals.
+All dogs are mammals.
+Therefore, all dogs are animals.
+
+所有哺乳动物都是动物。有些猫不是哺乳动物。所以有些猫不是动物。
+"""
+    arguments = list(parse_arguments(source.splitlines()))
+    for argument, result in zip(arguments, validate_arguments(arguments)):
+        print(argument)
+        print(f"=> {result.form.get_figure_and_mood()}: {'有效' if result.valid else '无效'}\n")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+有效形式报告的渲染模块
+
+每种形式在各输出格式下的文本只生成一次，之后渲染报告只需按形式编码取出并拼接，
+整份报告用一次write写出。输出到管道或文件时open_output()返回带大缓冲区的写入器
+
+输出格式:
+  text   与validate_all一直以来的输出相同，每种形式为格式化的多行文本
+  json   一个JSON文档，按解释列出有效形式及其命题
+  csv    每行一个(解释, 形式)，带表头
+  codes  每行一个形式编码；多种解释时为 编码<TAB>解释
+  quiet  只输出每种解释下的有效形式数量
+"""
+
+import sys
+from functools import lru_cache
+
+from syllogism import Syllogism, FORM_COUNT
+from config import get_interpretation_name
+from validity_table import validity_row
+
+RENDER_FORMATS = ("text", "json", "csv", "codes", "quiet")
+
+# 输出到管道或文件时的缓冲区大小
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+_CSV_HEADER = "interpretation,form,code,major,minor,conclusion\n"
+
+
+@lru_cache(maxsize=None)
+def form_fragments(output_format):
+    """
+    全部形式在指定格式下的文本片段
+
+    返回:
+        tuple: 第code项为该形式的片段；quiet格式没有逐形式的输出，返回None
+    """
+    if output_format == "text":
+        return tuple(str(syl) for syl in Syllogism.all_forms())
+    if output_format == "json":
+        return tuple(_json_fragment(syl) for syl in Syllogism.all_forms())
+    if output_format == "csv":
+        return tuple(f"{syl.get_figure_and_mood()},{syl.code}," + ",".join(map(str, syl.propositions())) + "\n"
+                     for syl in Syllogism.all_forms())
+    if output_format == "codes":
+        return tuple(str(code) for code in range(FORM_COUNT))
+    if output_format == "quiet":
+        return None
+    raise ValueError(f"无效的输出格式: {output_format}，可选: {', '.join(RENDER_FORMATS)}")
+
+
+def _json_fragment(syl):
+    import json
+
+    major, minor, conclusion = syl.propositions()
+    return json.dumps({"form": syl.get_figure_and_mood(), "code": syl.code,
+                       "premises": [str(major), str(minor)], "conclusion": str(conclusion)}, ensure_ascii=False)
+
+
+def valid_codes(interpretation, backend="rules"):
+    """一种解释下的有效形式编码，按编码排序"""
+    return [code for code, valid in enumerate(validity_row(interpretation, backend)) if valid]
+
+
+def _render_text_section(interpretation, codes, backend, fragments):
+    parts = [f"使用 {get_interpretation_name(interpretation)}\n"]
+    if backend != "rules":
+        parts.append(f"验证后端: {backend}\n")
+    parts.append(f"生成了 {FORM_COUNT} 种三段论组合\n")
+    parts.append(f"\n找到 {len(codes)} 个有效的三段论:\n")
+    for i, code in enumerate(codes, 1):
+        parts.append(f"\n=== 有效三段论 {i} ===\n{fragments[code]}\n")
+    return "".join(parts)
+
+
+def render_report(interpretations, backend="rules", output_format="text"):
+    """
+    渲染各解释下全部有效形式的报告
+
+    参数:
+        interpretations: 解释类型序列
+        backend: 验证后端
+        output_format: RENDER_FORMATS之一
+
+    返回:
+        str: 完整的报告文本
+    """
+    fragments = form_fragments(output_format)
+    sections = [(interp, valid_codes(interp, backend)) for interp in interpretations]
+
+    if output_format == "text":
+        if len(sections) == 1:
+            return _render_text_section(*sections[0], backend, fragments)
+        parts = ["=== 比较两种解释的结果 ===\n\n"]
+        for index, (interp, codes) in enumerate(sections, 1):
+            if index > 1:
+                parts.append("\n" + "=" * 50 + "\n\n")
+            parts.append(f"{index}. {get_interpretation_name(interp)}:\n")
+            parts.append(_render_text_section(interp, codes, backend, fragments))
+        return "".join(parts)
+    if output_format == "json":
+        body = ", ".join(f'"{interp.value}": {{"count": {len(codes)}, "forms": ['
+                         + ", ".join(fragments[code] for code in codes) + "]}"
+                         for interp, codes in sections)
+        return f'{{"backend": "{backend}", "interpretations": {{{body}}}}}\n'
+    if output_format == "csv":
+        return _CSV_HEADER + "".join(f"{interp.value},{fragments[code]}"
+                                     for interp, codes in sections for code in codes)
+    if output_format == "codes":
+        if len(sections) == 1:
+            return "".join(fragments[code] + "\n" for code in sections[0][1])
+        return "".join(f"{fragments[code]}\t{interp.value}\n" for interp, codes in sections for code in codes)
+    return "".join(f"{get_interpretation_name(interp)}: {len(codes)} 个有效的三段论\n"
+                   for interp, codes in sections)
+
+
+def open_output(stream=None):
+    """
+    报告的输出流
+
+    未指定stream时，终端直接使用sys.stdout；管道或文件使用带OUTPUT_BUFFER_SIZE缓冲区的写入器，
+    调用方负责关闭(不会关闭标准输出的文件描述符)
+    """
+    if stream is not None:
+        return stream
+    if sys.stdout.isatty():
+        return sys.stdout
+    try:
+        fileno = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        # 被替换为StringIO等没有文件描述符的对象
+        return sys.stdout
+    sys.stdout.flush()
+    return open(fileno, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE, closefd=False)
+
+
+def write_report(interpretations, backend="rules", output_format="text", stream=None):
+    """
+    渲染报告并一次写出
+
+    返回:
+        int: 写出的字符数
+    """
+    text = render_report(interpretations, backend, output_format)
+    output = open_output(stream)
+    try:
+        output.write(text)
+        output.flush()
+    finally:
+        if output is not stream and output is not sys.stdout:
+            output.close()
+    return len(text)
+
+
+# 示例用法
+if __name__ == "__main__":
+    from config import InterpretationType
+
+    for output_format in RENDER_FORMATS:
+        print(f"--- {output_format} ---")
+        print(render_report([InterpretationType.BOOLEAN], output_format=output_format)[:200])
@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+"""
+验证结果存储模块
+需要安装NumPy
+
+把每条论证的验证结果存为定长二进制记录(小端序，每条12字节):
+  id        uint64    论证的来源ID
+  code      uint8     形式编码
+  valid     uint8     有效性位图，第i位表示在INTERPRETATIONS[i]下有效
+  failures  uint8[2]  每种解释下的规则失败位掩码(位序见清单中的rules，默认同batch_validation.RULE_BITS)
+
+存储是一个目录: 数据按块追加写入chunk-NNNNNN.bin，已写入的块不再追加；
+manifest.json记录每个块的记录数、ID范围和出现过的形式，以及写入时使用的形式表。
+每个块写入前按ID排序(同一块内重复的ID保留最后一条)，
+读取时用mmap把块映射为NumPy结构化数组，不复制数据。
+按ID查找时从最新的块往前，跳过ID范围不符的块后经稀疏索引二分查找，因此后写入的块覆盖先前的结果
+
+用法:
+    python3 result_store.py build corpus.jsonl results/     # 验证语料并写入存储
+    python3 result_store.py stats results/ --interpretation boolean
+    python3 result_store.py lookup results/ 42 1007
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from syllogism import Syllogism, FORM_COUNT
+from config import InterpretationType, resolve_interpretation
+from batch_validation import validate_codes, RULE_NAMES
+
+RECORD_DTYPE = np.dtype([("id", "<u8"), ("code", "u1"), ("valid", "u1"), ("failures", "u1", (2,))])
+# 清单中记录的格式描述(经过JSON往返，便于比较)
+_DTYPE_DESCR = json.loads(json.dumps(RECORD_DTYPE.descr))
+
+INTERPRETATIONS = tuple(InterpretationType)
+_INTERPRETATION_INDEX = {interp: index for index, interp in enumerate(INTERPRETATIONS)}
+
+MANIFEST_NAME = "manifest.json"
+
+# 每个块的默认最大记录数
+DEFAULT_CHUNK_RECORDS = 1 << 20
+
+# 稀疏ID索引的间隔(记录数)
+INDEX_STRIDE = 1024
+
+# ID的取值范围
+MAX_ID = (1 << 64) - 1
+
+_FORM_NAMES = tuple(syl.get_figure_and_mood() for syl in Syllogism.all_forms())
+_form_records = None
+
+
+def form_records():
+    """
+    全部256种形式对应的记录字段(id为0)，写入时按形式编码取用
+
+    返回:
+        ndarray: RECORD_DTYPE数组，下标为形式编码
+    """
+    global _form_records
+    if _form_records is None:
+        codes = np.arange(FORM_COUNT, dtype=np.uint8)
+        records = np.zeros(FORM_COUNT, dtype=RECORD_DTYPE)
+        records["code"] = codes
+        for index, interp in enumerate(INTERPRETATIONS):
+            valid, failures = validate_codes(codes, interp)
+            records["valid"] |= valid.astype(np.uint8) << index
+            records["failures"][:, index] = failures
+        _form_records = records
+    return _form_records
+
+
+def _encode_form_table(table):
+    """形式表的有效性位图和失败位掩码编码为十六进制字符串"""
+    return (table["valid"].tobytes() + table["failures"].tobytes()).hex()
+
+
+def _decode_form_table(text):
+    """_encode_form_table的逆操作"""
+    data = np.frombuffer(bytes.fromhex(text), dtype=np.uint8)
+    table = np.zeros(FORM_COUNT, dtype=RECORD_DTYPE)
+    table["code"] = np.arange(FORM_COUNT)
+    table["valid"] = data[:FORM_COUNT]
+    table["failures"] = data[FORM_COUNT:].reshape(FORM_COUNT, 2)
+    return table
+
+
+def _write_json(path, data):
+    """原子地写入JSON文件"""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temporary, path)
+
+
+class ResultStore:
+    """
+    追加写入、内存映射读取的验证结果存储
+
+    参数:
+        path: 存储目录，不存在时创建
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        manifest_path = os.path.join(path, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                self._manifest = json.load(f)
+            if self._manifest.get("dtype") != _DTYPE_DESCR:
+                raise ValueError(f"{path}的记录格式与当前版本不同")
+        else:
+            self._manifest = {"dtype": _DTYPE_DESCR,
+                              "interpretations": [interp.value for interp in INTERPRETATIONS],
+                              "rules": list(RULE_NAMES), "form_table": _encode_form_table(form_records()),
+                              "chunks": []}
+            _write_json(manifest_path, self._manifest)
+        self._views = {}
+        self._sparse = {}
+        self._superseded = {}
+        # 早期的清单没有形式表，记录是按form_records()写入的
+        form_table = self._manifest.get("form_table")
+        self._form_table = form_records().copy() if form_table is None else _decode_form_table(form_table)
+
+    def __len__(self):
+        """全部块的记录数之和(被后写入的块覆盖的记录也计算在内)"""
+        return sum(chunk["count"] for chunk in self._manifest["chunks"])
+
+    @property
+    def rules(self):
+        """失败位掩码第i位对应的规则名称"""
+        return tuple(self._manifest["rules"])
+
+    @property
+    def form_table(self):
+        """写入记录时使用的形式表(RECORD_DTYPE数组，下标为形式编码)"""
+        return self._form_table
+
+    @property
+    def chunk_count(self):
+        """块数"""
+        return len(self._manifest["chunks"])
+
+    def append(self, ids, codes, chunk_records=DEFAULT_CHUNK_RECORDS):
+        """
+        追加一批结果，每最多chunk_records条写一个新块
+
+        有效性位图和规则失败位掩码按形式编码从预先计算的表中取得
+
+        参数:
+            ids: 非负整数ID数组
+            codes: 与ids等长的形式编码数组
+
+        返回:
+            int: 新写入的块数
+
+        异常:
+            ValueError: 数组长度不同、ID为负、形式编码超出范围或chunk_records不是正整数
+        """
+        if chunk_records <= 0:
+            raise ValueError(f"每块记录数必须是正整数: {chunk_records}")
+        ids = np.asarray(ids)
+        codes = np.asarray(codes)
+        if ids.shape != codes.shape or ids.ndim != 1:
+            raise ValueError("ids和codes必须是等长的一维数组")
+        if ids.size and (ids.min() < 0 or codes.min() < 0 or codes.max() >= FORM_COUNT):
+            raise ValueError("ID必须非负，形式编码必须在0-255之间")
+
+        written = 0
+        for start in range(0, len(ids), chunk_records):
+            self._write_chunk(ids[start:start + chunk_records], codes[start:start + chunk_records])
+            written += 1
+        return written
+
+    def _write_chunk(self, ids, codes):
+        """按ID排序去重后写入一个新块并更新清单"""
+        order = np.argsort(ids, kind="stable")
+        ids = ids[order]
+        keep = np.ones(len(ids), dtype=bool)
+        keep[:-1] = ids[1:] != ids[:-1]
+        codes = codes[order][keep].astype(np.intp)
+        records = self._form_table[codes]
+        records["id"] = ids[keep]
+        present = np.zeros(FORM_COUNT, dtype=bool)
+        present[codes] = True
+
+        index = len(self._manifest["chunks"])
+        name = f"chunk-{index:06d}.bin"
+        temporary = os.path.join(self.path, f"{name}.tmp")
+        records.tofile(temporary)
+        os.replace(temporary, os.path.join(self.path, name))
+        self._manifest["chunks"].append({"file": name, "count": int(len(records)),
+                                         "min_id": int(records["id"][0]), "max_id": int(records["id"][-1]),
+                                         "forms": np.packbits(present).tobytes().hex()})
+        _write_json(os.path.join(self.path, MANIFEST_NAME), self._manifest)
+
+    def chunk(self, index, writable=False):
+        """
+        第index个块的内存映射视图
+
+        参数:
+            writable: 为True时以读写方式映射，修改直接写回文件(用于按形式更新结论)
+        """
+        key = (index, writable)
+        view = self._views.get(key)
+        if view is None:
+            path = os.path.join(self.path, self._manifest["chunks"][index]["file"])
+            view = self._views[key] = np.memmap(path, dtype=RECORD_DTYPE, mode="r+" if writable else "r")
+        return view
+
+    def chunks(self):
+        """按写入顺序返回全部块的只读视图"""
+        return [self.chunk(index) for index in range(self.chunk_count)]
+
+    def _sparse_ids(self, index):
+        """第index个块每隔INDEX_STRIDE条记录取一个ID组成的稀疏索引(连续数组)"""
+        sparse = self._sparse.get(index)
+        if sparse is None:
+            sparse = self._sparse[index] = np.ascontiguousarray(self.chunk(index)["id"][::INDEX_STRIDE])
+        return sparse
+
+    def _find(self, index, record_id):
+        """在第index个块中查找ID，返回记录下标或-1"""
+        block = int(np.searchsorted(self._sparse_ids(index), record_id, side="right")) - 1
+        if block < 0:
+            return -1
+        start = block * INDEX_STRIDE
+        ids = self.chunk(index)["id"][start:start + INDEX_STRIDE]
+        position = int(np.searchsorted(ids, record_id))
+        if position < len(ids) and ids[position] == record_id:
+            return start + position
+        return -1
+
+    def lookup(self, record_id):
+        """
+        按ID查找记录
+
+        先在稀疏索引中二分查找所在的段，再在段内二分查找，只读取一小段ID
+
+        返回:
+            numpy.void: 记录(字段同RECORD_DTYPE)，不存在或ID超出uint64范围时返回None
+        """
+        if not 0 <= record_id <= MAX_ID:
+            return None
+        record_id = np.uint64(record_id)
+        for index in reversed(range(self.chunk_count)):
+            info = self._manifest["chunks"][index]
+            if not info["min_id"] <= record_id <= info["max_id"]:
+                continue
+            position = self._find(index, record_id)
+            if position >= 0:
+                return self.chunk(index)[position]
+        return None
+
+    def lookup_many(self, ids):
+        """
+        批量按ID查找
+
+        ID数量较多时整块读取ID列做向量化二分查找，否则逐个查找
+
+        返回:
+            (records, found): RECORD_DTYPE数组和布尔数组，未找到的记录各字段为0
+        """
+        ids, in_range = _id_array(ids)
+        records = np.zeros(len(ids), dtype=RECORD_DTYPE)
+        found = np.zeros(len(ids), dtype=bool)
+        for index in reversed(range(self.chunk_count)):
+            pending = np.flatnonzero(~found & in_range)
+            if not len(pending):
+                break
+            chunk = self.chunk(index)
+            if len(pending) * INDEX_STRIDE < len(chunk):
+                for target in pending:
+                    position = self._find(index, ids[target])
+                    if position >= 0:
+                        records[target] = chunk[position]
+                        found[target] = True
+                continue
+            column = np.ascontiguousarray(chunk["id"])
+            wanted = ids[pending]
+            positions = np.minimum(np.searchsorted(column, wanted), len(column) - 1)
+            hit = column[positions] == wanted
+            records[pending[hit]] = chunk[positions[hit]]
+            found[pending[hit]] = True
+        return records, found
+
+    def form_counts(self, interpretation=None):
+        """
+        按形式编码统计记录数和有效记录数
+
+        与lookup一致，每个ID只计算最后写入的记录，被之后的块覆盖的记录不计入
+
+        返回:
+            (total, valid): 长度为256的int64数组
+        """
+        bit = 1 << _INTERPRETATION_INDEX[resolve_interpretation(interpretation)]
+        total = np.zeros(FORM_COUNT, dtype=np.int64)
+        valid = np.zeros(FORM_COUNT, dtype=np.int64)
+        for index, chunk in enumerate(self.chunks()):
+            codes = chunk["code"]
+            flags = chunk["valid"]
+            superseded = self._superseded_records(index)
+            if superseded is not None:
+                codes = codes[~superseded]
+                flags = flags[~superseded]
+            total += np.bincount(codes, minlength=FORM_COUNT)
+            valid += np.bincount(codes[(flags & bit) != 0], minlength=FORM_COUNT)
+        return total, valid
+
+    def _superseded_records(self, index):
+        """
+        第index个块中ID又出现在之后的块里的记录(布尔数组)
+
+        只和ID范围重叠的块比较；ID递增写入时没有重叠，直接返回None
+        """
+        chunks = self._manifest["chunks"]
+        cached = self._superseded.get(index)
+        if cached is not None and cached[0] == len(chunks):
+            return cached[1]
+        info = chunks[index]
+        later = [other for other in range(index + 1, len(chunks))
+                 if chunks[other]["min_id"] <= info["max_id"] and info["min_id"] <= chunks[other]["max_id"]]
+        superseded = None
+        if later:
+            ids = np.ascontiguousarray(self.chunk(index)["id"])
+            superseded = np.zeros(len(ids), dtype=bool)
+            for other in later:
+                column = np.ascontiguousarray(self.chunk(other)["id"])
+                positions = np.minimum(np.searchsorted(column, ids), len(column) - 1)
+                superseded |= column[positions] == ids
+            if not superseded.any():
+                superseded = None
+        self._superseded[index] = (len(chunks), superseded)
+        return superseded
+
+    def aggregate_by_form(self, interpretation=None):
+        """
+        按格和式汇总
+
+        返回:
+            dict: 形式名称(如AAA-1)到{"total": 记录数, "valid": 有效记录数}的映射，只包含出现过的形式
+        """
+        total, valid = self.form_counts(interpretation)
+        return {_FORM_NAMES[code]: {"total": int(total[code]), "valid": int(valid[code])}
+                for code in np.flatnonzero(total)}
+
+    def update_forms(self, table, rules):
+        """
+        按形式编码就地更新已写入的记录
+
+        只比较形式表，结论有变化的形式才会写回；清单中记录了每个块出现过的形式，
+        不含这些形式的块不会被读取
+
+        参数:
+            table: 新的形式表(RECORD_DTYPE数组，下标为形式编码)
+            rules: 新的失败位掩码对应的规则名称，最多8条
+
+        返回:
+            dict: forms(有变化的形式数)、chunks(改写的块数)、records(改写的记录数)
+
+        异常:
+            ValueError: 规则超过8条
+        """
+        if len(rules) > 8:
+            raise ValueError(f"失败位掩码最多记录8条规则，实际为{len(rules)}条")
+        old = self._form_table
+        changed = (table["valid"] != old["valid"]) | (table["failures"] != old["failures"]).any(axis=1)
+        summary = {"forms": int(changed.sum()), "chunks": 0, "records": 0}
+        if summary["forms"]:
+            changed_bits = np.packbits(changed)
+            for index, info in enumerate(self._manifest["chunks"]):
+                present = info.get("forms")
+                if present is not None and not (np.frombuffer(bytes.fromhex(present), dtype=np.uint8)
+                                                & changed_bits).any():
+                    continue
+                view = self.chunk(index, writable=True)
+                codes = view["code"]
+                mask = changed[codes]
+                rows = table[codes[mask]]
+                view["valid"][mask] = rows["valid"]
+                view["failures"][mask] = rows["failures"]
+                view.flush()
+                summary["chunks"] += 1
+                summary["records"] += int(mask.sum())
+
+        self._form_table = table.copy()
+        self._form_table["code"] = np.arange(FORM_COUNT)
+        self._form_table["id"] = 0
+        self._manifest["form_table"] = _encode_form_table(self._form_table)
+        self._manifest["rules"] = list(rules)
+        _write_json(os.path.join(self.path, MANIFEST_NAME), self._manifest)
+        return summary
+
+    def close(self):
+        """把读写视图的修改写回文件并释放全部内存映射"""
+        for (_, writable), view in self._views.items():
+            if writable:
+                view.flush()
+        self._views.clear()
+        self._sparse.clear()
+        self._superseded.clear()
+
+
+def build_store(input_path, store_path, input_format=None, chunk_records=DEFAULT_CHUNK_RECORDS):
+    """
+    验证语料文件并写入存储
+
+    记录的id字段必须是0到MAX_ID之间的整数(或整数字符串)，没有id时使用行号；
+    其他id(负数、过大、小数、布尔值等)计入errors
+
+    返回:
+        dict: written(写入的记录数)、errors(无法解析的记录数)、chunks(新写入的块数)
+    """
+    from bulk_io import read_records, record_to_syllogism, guess_input_format, iter_chunks
+
+    input_format = input_format or guess_input_format(input_path)
+    store = ResultStore(store_path)
+    summary = {"written": 0, "errors": 0, "chunks": 0}
+    with open(input_path, encoding="utf-8", newline="") as f:
+        for batch in iter_chunks(read_records(f, input_format), chunk_records):
+            ids = []
+            codes = []
+            for line_number, record in batch:
+                try:
+                    syl = record_to_syllogism(record)
+                    record_id = record.get("id")
+                    record_id = line_number if record_id in (None, "") else _parse_id(record_id)
+                except (TypeError, ValueError):
+                    summary["errors"] += 1
+                    continue
+                ids.append(record_id)
+                codes.append(syl.code)
+            if ids:
+                summary["chunks"] += store.append(np.array(ids, dtype=np.uint64),
+                                                  np.array(codes, dtype=np.uint8), chunk_records)
+                summary["written"] += len(ids)
+    store.close()
+    return summary
+
+
+def _parse_id(value):
+    """
+    解析记录的ID
+
+    异常:
+        ValueError: 不是整数或整数字符串，或超出0到MAX_ID的范围
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"ID必须是整数: {value!r}")
+    record_id = int(value)
+    if not 0 <= record_id <= MAX_ID:
+        raise ValueError(f"ID超出范围: {record_id}")
+    return record_id
+
+
+def _id_array(ids):
+    """
+    把ID序列转换为uint64数组
+
+    返回:
+        (ids, in_range): uint64数组和布尔数组，超出0到MAX_ID范围的ID在ids中记为0
+    """
+    ids = np.asarray(ids)
+    if ids.dtype.kind == "u":
+        return ids.astype(np.uint64, copy=False), np.ones(len(ids), dtype=bool)
+    if ids.dtype.kind == "i":
+        in_range = ids >= 0
+        return np.where(in_range, ids, 0).astype(np.uint64), in_range
+    # Python大整数等组成的对象数组
+    values = [int(value) for value in ids.tolist()]
+    in_range = np.array([0 <= value <= MAX_ID for value in values], dtype=bool)
+    return np.array([value if ok else 0 for value, ok in zip(values, in_range)], dtype=np.uint64), in_range
+
+
+def _describe(record, rules):
+    """记录的JSON表示"""
+    return {"id": int(record["id"]), "form": _FORM_NAMES[record["code"]], "code": int(record["code"]),
+            "valid": {interp.value: bool(record["valid"] >> index & 1)
+                      for index, interp in enumerate(INTERPRETATIONS)},
+            "failures": {interp.value: [name for bit, name in enumerate(rules)
+                                        if record["failures"][index] >> bit & 1]
+                         for index, interp in enumerate(INTERPRETATIONS)}}
+
+
+def main(argv=None):
+    from bulk_io import positive_int
+
+    parser = argparse.ArgumentParser(description="验证结果存储")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="验证语料并写入存储")
+    build.add_argument("input", help="输入文件(JSONL、CSV或纯文本)")
+    build.add_argument("store", help="存储目录")
+    build.add_argument("--input-format", choices=("jsonl", "csv", "text"), help="默认按扩展名判断")
+    build.add_argument("--chunk-records", type=positive_int, default=DEFAULT_CHUNK_RECORDS, help="每个块的最大记录数")
+
+    stats = subparsers.add_parser("stats", help="按格和式汇总")
+    stats.add_argument("store", help="存储目录")
+    stats.add_argument("--interpretation", choices=[interp.value for interp in InterpretationType],
+                       help="解释类型，默认为当前解释")
+
+    lookup = subparsers.add_parser("lookup", help="按ID查找")
+    lookup.add_argument("store", help="存储目录")
+    lookup.add_argument("ids", nargs="+", type=int, help="论证ID")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        summary = build_store(args.input, args.store, args.input_format, args.chunk_records)
+        print(f"写入 {summary['written']} 条, 无法解析 {summary['errors']} 条, 新增 {summary['chunks']} 个块")
+    elif args.command == "stats":
+        interpretation = InterpretationType(args.interpretation) if args.interpretation else None
+        store = ResultStore(args.store)
+        for name, counts in sorted(store.aggregate_by_form(interpretation).items()):
+            print(f"{name}: {counts['total']} 条, 有效 {counts['valid']} 条")
+    else:
+        store = ResultStore(args.store)
+        for record_id in args.ids:
+            record = store.lookup(record_id)
+            print(json.dumps(_describe(record, store.rules) if record is not None else {"id": record_id, "error": "未找到"},
+                             ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,333 @@
-from syllogism import Syllogism, PropositionType
-from config import get_interpretation, is_aristotelian, is_boolean, InterpretationType
+from time import perf_counter
+
+from syllogism import Syllogism, PropositionType, FORM_COUNT
+from config import get_interpretation, is_aristotelian, is_boolean, InterpretationType, interpretation_context
+from instrumentation import RuleInstrumentation, PASSED, FAILED, ERROR
+
+# 真值表中解释类型的顺序
+_INTERPRETATIONS = tuple(InterpretationType)
+_INTERPRETATION_INDEX = {interp: index for index, interp in enumerate(_INTERPRETATIONS)}
+
+# check的结果中规则异常记录为以此开头的错误信息
+ERROR_PREFIX = "错误: "
+
+def rule_passed(result):
+    """规则结果是否算作通过；规则异常记录的错误信息算作失败"""
+    return bool(result) and not (isinstance(result, str) and result.startswith(ERROR_PREFIX))
 
 class SyllogismChecker:
     def __init__(self):
         self.rules = []
+        self.instrumentation = None  # 未启用统计时为None
+        self._table = None  # compile_table()的结果，规则变化后失效
+        self._table_rules = None
+
+    def enable_instrumentation(self, instrumentation=None):
+        """
+        启用规则统计
+
+        参数:
+            instrumentation: 可选的RuleInstrumentation实例，可在多个检查器间共享
+
+        返回:
+            RuleInstrumentation: 正在使用的统计对象
+        """
+        self.instrumentation = instrumentation or RuleInstrumentation()
+        return self.instrumentation
+
+    def disable_instrumentation(self):
+        """停用规则统计"""
+        self.instrumentation = None
 
     def add_rule(self, name, check_function):
         """添加检查规则"""
         self.rules.append((name, check_function))
+        self._table = None
+
+    def remove_rule(self, name):
+        """
+        删除指定名称的全部规则
+
+        异常:
+            ValueError: 没有该名称的规则
+        """
+        remaining = [rule for rule in self.rules if rule[0] != name]
+        if len(remaining) == len(self.rules):
+            raise ValueError(f"没有名为{name}的规则")
+        self.rules[:] = remaining
+        self._table = None
+
+    def compile_table(self):
+        """
+        在全部形式和解释上穷举运行当前规则，生成真值表
+
+        之后check只需一次查表(启用统计时仍逐条运行规则)；
+        add_rule、remove_rule或直接修改rules后真值表自动失效
+
+        返回:
+            RuleTable: 生成的真值表
+
+        异常:
+            ValueError: 有规则不是确定性的
+        """
+        self._table = RuleTable(self.rules)
+        self._table_rules = list(self.rules)
+        return self._table
+
+    @property
+    def table(self):
+        """当前有效的真值表，未编译或已失效时为None"""
+        if self._table is not None and self._table_rules == self.rules:
+            return self._table
+        return None
+
+    def check(self, syllogism, interpretation=None):
+        """
+        对三段论应用所有规则
+        指定interpretation时，规则在该解释的上下文中执行，不影响其他线程；
+        已生成真值表且未启用统计时直接查表
+        """
+        if self.instrumentation is None and self._table is not None and self._table_rules == self.rules:
+            return self._table.check(syllogism, interpretation)
+
+        if interpretation is not None:
+            with interpretation_context(interpretation):
+                return self.check(syllogism)
+        if self.instrumentation is None:
+            return _run_rules(self.rules, syllogism)
+        return _run_rules_instrumented(self.rules, syllogism, self.instrumentation)
+
+    def compile(self, sample=None):
+        """
+        编译当前规则列表
+
+        在样本上统计每条规则的拒绝率，返回按拒绝率从高到低排序的CompiledChecker。
+        之后再向本检查器添加规则不会影响已编译的结果
+
+        参数:
+            sample: 可选的三段论序列，默认为全部256种形式
+
+        返回:
+            CompiledChecker: 编译后的检查器
+        """
+        if sample is None:
+            sample = Syllogism.all_forms()
+        rejections = [0] * len(self.rules)
+        for interp in InterpretationType:
+            with interpretation_context(interp):
+                for syl in sample:
+                    for index, (_, rule_func) in enumerate(self.rules):
+                        try:
+                            passed = rule_func(syl)
+                        except Exception:
+                            continue
+                        if not passed:
+                            rejections[index] += 1
+        return CompiledChecker(self.rules, rejections, self.instrumentation)
+
+
+class CompiledChecker:
+    """
+    编译后的检查器
+
+    规则列表固定不变。is_valid按拒绝率从高到低执行规则，遇到第一条失败规则即返回，
+    不构造结果字典，也不捕获规则异常；完整报告使用check
+    """
+
+    def __init__(self, rules, rejections=None, instrumentation=None):
+        self._rules = tuple(rules)
+        self._rejections = list(rejections) if rejections is not None else [0] * len(self._rules)
+        self.instrumentation = instrumentation  # 未启用统计时为None
+        self.reorder()
+
+    @property
+    def rules(self):
+        """按添加顺序排列的规则"""
+        return self._rules
+
+    @property
+    def rule_order(self):
+        """is_valid执行规则的顺序(规则名称)"""
+        return tuple(self._rules[index][0] for index, _ in self._order)
 
-    def check(self, syllogism):
-        """对三段论应用所有规则"""
-        results = {}
-        for rule_name, rule_func in self.rules:
+    def rejection_counts(self):
+        """各规则累计拒绝次数"""
+        return {name: count for (name, _), count in zip(self._rules, self._rejections)}
+
+    def reorder(self):
+        """按目前观察到的拒绝次数重新排序规则"""
+        indices = sorted(range(len(self._rules)), key=lambda index: -self._rejections[index])
+        self._order = tuple((index, self._rules[index][1]) for index in indices)
+
+    def is_valid(self, syllogism, interpretation=None):
+        """判断三段论是否通过全部规则，遇到第一条失败规则即停止"""
+        if interpretation is not None:
+            with interpretation_context(interpretation):
+                return self.is_valid(syllogism)
+
+        if self.instrumentation is not None:
+            return self._is_valid_instrumented(syllogism)
+
+        for index, rule_func in self._order:
+            if not rule_func(syllogism):
+                self._rejections[index] += 1
+                return False
+        return True
+
+    def _is_valid_instrumented(self, syllogism):
+        """带统计的is_valid"""
+        record = self.instrumentation.record
+        for index, rule_func in self._order:
+            rule_name = self._rules[index][0]
+            start = perf_counter()
             try:
-                results[rule_name] = rule_func(syllogism)
-            except Exception as e:
-                results[rule_name] = f"错误: {e}"
-        return results
+                passed = rule_func(syllogism)
+            except Exception:
+                record(rule_name, perf_counter() - start, ERROR)
+                raise
+            record(rule_name, perf_counter() - start, PASSED if passed else FAILED)
+            if not passed:
+                self._rejections[index] += 1
+                return False
+        return True
+
+    def check(self, syllogism, interpretation=None):
+        """对三段论应用所有规则，返回完整报告，与SyllogismChecker.check相同"""
+        if interpretation is not None:
+            with interpretation_context(interpretation):
+                return self.check(syllogism)
+        if self.instrumentation is None:
+            return _run_rules(self._rules, syllogism)
+        return _run_rules_instrumented(self._rules, syllogism, self.instrumentation)
+
+
+class RuleTable:
+    """
+    规则集的真值表
+
+    输入只有256种形式 × 解释类型，因此纯函数规则集可以预先穷举。
+    每个条目是一种(解释, 形式)下全部规则的结果，与SyllogismChecker.check的返回值相同
+    """
+
+    def __init__(self, rules):
+        self._rules = tuple(rules)
+        first = []
+        for interp in _INTERPRETATIONS:
+            with interpretation_context(interp):
+                for syl in Syllogism.all_forms():
+                    first.append(_run_rules(self._rules, syl))
+
+        # 按相反的顺序再运行一遍，结果不同的规则不是确定性的
+        for index in reversed(range(len(first))):
+            interp = _INTERPRETATIONS[index // FORM_COUNT]
+            syl = Syllogism.from_code(index % FORM_COUNT)
+            with interpretation_context(interp):
+                second = _run_rules(self._rules, syl)
+            for name, result in second.items():
+                if first[index][name] != result:
+                    raise ValueError(f"规则{name}不是确定性的: {syl.get_figure_and_mood()}"
+                                     f"在{interp.value}解释下两次结果不同")
+
+        self._results = tuple(first)
+        # 规则异常算作失败，与CompiledChecker.is_valid不会得出有效的结论一致
+        self._valid = bytes(all(rule_passed(result) for result in results.values()) for results in first)
+
+    @property
+    def rules(self):
+        """生成真值表时的规则"""
+        return self._rules
+
+    def check(self, syllogism, interpretation=None):
+        """查表得到全部规则的结果，interpretation默认为当前解释"""
+        if interpretation is None:
+            interpretation = get_interpretation()
+        return dict(self._results[_INTERPRETATION_INDEX[interpretation] * FORM_COUNT + syllogism.code])
+
+    def is_valid(self, syllogism, interpretation=None):
+        """查表判断三段论是否通过全部规则"""
+        if interpretation is None:
+            interpretation = get_interpretation()
+        return self._valid[_INTERPRETATION_INDEX[interpretation] * FORM_COUNT + syllogism.code] == 1
+
+    def to_source(self):
+        """
+        生成等价的Python模块源码，模块不依赖本项目，提供check(code, interpretation)和
+        is_valid(code, interpretation)，interpretation为"aristotelian"等解释类型的值
+
+        异常:
+            ValueError: 规则结果不能写成Python字面量
+        """
+        names = tuple(dict.fromkeys(name for name, _ in self._rules))
+        rows = {}
+        row_index = []
+        for results in self._results:
+            row = tuple(results[name] for name in names)
+            for value in row:
+                if not isinstance(value, (bool, int, float, str, type(None))):
+                    raise ValueError(f"规则结果不能写成字面量: {value!r}")
+            row_index.append(rows.setdefault(row, len(rows)))
+
+        lines = [
+            '"""由rule_checker.RuleTable生成的规则真值表，请勿手动修改"""',
+            "",
+            f"RULE_NAMES = {names!r}",
+            f"INTERPRETATIONS = {tuple(interp.value for interp in _INTERPRETATIONS)!r}",
+            "",
+            "# 不同的结果行",
+            "_ROWS = (",
+            *(f"    {row!r}," for row in rows),
+            ")",
+            "",
+            "# 下标为 解释序号 × 256 + 形式编码",
+            f"_ROW_INDEX = {tuple(row_index)!r}",
+            f"_VALID = bytes.fromhex({self._valid.hex()!r})",
+            "",
+            "",
+            "def check(code, interpretation):",
+            '    """全部规则的结果"""',
+            "    row = _ROWS[_ROW_INDEX[INTERPRETATIONS.index(interpretation) * 256 + code]]",
+            "    return dict(zip(RULE_NAMES, row))",
+            "",
+            "",
+            "def is_valid(code, interpretation):",
+            '    """是否通过全部规则"""',
+            "    return _VALID[INTERPRETATIONS.index(interpretation) * 256 + code] == 1",
+            "",
+        ]
+        return "\n".join(lines)
+
+    def write_module(self, path):
+        """把to_source()的结果写入文件"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_source())
+
+
+def _run_rules(rules, syllogism):
+    """执行全部规则，规则异常记录为错误信息"""
+    results = {}
+    for rule_name, rule_func in rules:
+        try:
+            results[rule_name] = rule_func(syllogism)
+        except Exception as e:
+            results[rule_name] = f"{ERROR_PREFIX}{e}"
+    return results
+
+
+def _run_rules_instrumented(rules, syllogism, instrumentation):
+    """执行全部规则并记录每条规则的耗时和结果"""
+    record = instrumentation.record
+    results = {}
+    for rule_name, rule_func in rules:
+        start = perf_counter()
+        try:
+            result = rule_func(syllogism)
+        except Exception as e:
+            record(rule_name, perf_counter() - start, ERROR)
+            results[rule_name] = f"{ERROR_PREFIX}{e}"
+            continue
+        record(rule_name, perf_counter() - start, PASSED if result else FAILED)
+        results[rule_name] = result
+    return results
 
 # 示例用法
 if __name__ == "__main__":
@@ -44,4 +354,22 @@ if __name__ == "__main__":
     print(f"三段论:\n{syl}")
     print("检查结果:")
     for rule, result in results.items():
-        print(f"  {rule}: {result}")
\ No newline at end of file
+        print(f"  {rule}: {result}")
+
+    # 编译后快速判断
+    compiled = checker.compile()
+    print(f"编译后规则顺序: {compiled.rule_order}")
+    print(f"是否通过全部规则: {compiled.is_valid(syl)}")
+
+    # 生成真值表后check只需一次查表
+    table = checker.compile_table()
+    print(f"查表结果: {checker.check(syl)}, 有效: {table.is_valid(syl)}")
+
+    # 规则统计
+    stats = checker.enable_instrumentation()
+    for candidate in Syllogism.all_forms():
+        checker.check(candidate)
+    print("规则统计:")
+    for rule, rule_stats in stats.snapshot().items():
+        print(f"  {rule}: 调用 {rule_stats['calls']} 次, 通过 {rule_stats['passed']} 次, "
+              f"累计 {rule_stats['total_seconds'] * 1e6:.0f}µs")
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+分片并行验证模块
+把大的论证语料按行切分为分片，用进程池在全部CPU核上验证，再合并各分片的统计信息
+
+每个工作进程启动时构建一次有效性表和规则失败表，之后每条记录只做查表；
+解释类型随每个分片任务显式传给工作进程，不依赖config.INTERPRETATION。
+每完成一个分片就写一个检查点文件，中断后用同样的参数重新运行会跳过已完成的分片
+
+输入格式与bulk_io相同(JSONL、CSV、纯文本)，CSV字段中不能含换行
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from syllogism import Syllogism
+from config import InterpretationType, resolve_interpretation
+from validation_rules import get_all_validation_rules
+from validity_table import validity_row, get_failure_table
+from bulk_io import read_records, record_to_syllogism, guess_input_format
+
+DEFAULT_SHARD_SIZE = 100000
+
+MANIFEST_NAME = "manifest.json"
+
+RULE_NAMES = tuple(name for name, _ in get_all_validation_rules())
+
+# 工作进程内的预构建表，由_init_worker填充
+_worker_state = {}
+
+
+def empty_stats():
+    """空的统计信息"""
+    return {"total": 0, "valid": 0, "invalid": 0, "errors": 0,
+            "valid_by_form": {}, "rule_failures": dict.fromkeys(RULE_NAMES, 0)}
+
+
+def merge_stats(stats_list):
+    """合并多个分片的统计信息"""
+    merged = empty_stats()
+    for stats in stats_list:
+        for key in ("total", "valid", "invalid", "errors"):
+            merged[key] += stats[key]
+        for form, count in stats["valid_by_form"].items():
+            merged["valid_by_form"][form] = merged["valid_by_form"].get(form, 0) + count
+        for name, count in stats["rule_failures"].items():
+            merged["rule_failures"][name] = merged["rule_failures"].get(name, 0) + count
+    merged["valid_by_form"] = dict(sorted(merged["valid_by_form"].items()))
+    return merged
+
+
+def plan_shards(path, shard_size=DEFAULT_SHARD_SIZE, input_format="jsonl"):
+    """
+    按行切分输入文件
+
+    返回:
+        (header, shards): header为CSV的表头行(其他格式为b"")，
+        shards为每个分片的(起始字节, 结束字节)列表
+    """
+    if shard_size <= 0:
+        raise ValueError(f"分片大小必须为正数: {shard_size}")
+    shards = []
+    header = b""
+    with open(path, "rb") as f:
+        if input_format == "csv":
+            header = f.readline()
+        start = offset = len(header)
+        count = 0
+        for line in f:
+            offset += len(line)
+            count += 1
+            if count == shard_size:
+                shards.append((start, offset))
+                start, count = offset, 0
+        if count:
+            shards.append((start, offset))
+    return header, shards
+
+
+def _init_worker(backend):
+    """工作进程初始化: 构建一次两种解释下的有效性表和规则失败表"""
+    _worker_state["valid"] = {interp: validity_row(interp, backend) for interp in InterpretationType}
+    _worker_state["failures"] = {interp: get_failure_table(interp) for interp in InterpretationType}
+
+
+def validate_shard(path, input_format, header, start, end, interpretation):
+    """
+    验证一个分片(在工作进程中运行)
+
+    参数:
+        interpretation: 解释类型的值(如"boolean")，必须显式给出
+
+    返回:
+        dict: 该分片的统计信息
+    """
+    interpretation = InterpretationType(interpretation)
+    valid = _worker_state["valid"][interpretation]
+    failures = _worker_state["failures"][interpretation]
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = (header + f.read(end - start)).decode("utf-8")
+
+    stats = empty_stats()
+    valid_by_form = stats["valid_by_form"]
+    rule_failures = stats["rule_failures"]
+    for _, record in read_records(text.splitlines(keepends=True), input_format):
+        stats["total"] += 1
+        try:
+            syl = record_to_syllogism(record)
+        except ValueError:
+            stats["errors"] += 1
+            continue
+        if valid[syl.code]:
+            stats["valid"] += 1
+            form = syl.get_figure_and_mood()
+            valid_by_form[form] = valid_by_form.get(form, 0) + 1
+        else:
+            stats["invalid"] += 1
+        for name in failures[syl.code]:
+            rule_failures[name] += 1
+    return stats
+
+
+def _write_json(path, data):
+    """原子地写入JSON文件"""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(temporary, path)
+
+
+def _shard_path(checkpoint_dir, index):
+    """分片检查点文件路径"""
+    return os.path.join(checkpoint_dir, f"shard-{index:06d}.json")
+
+
+def _prepare_checkpoints(checkpoint_dir, manifest):
+    """创建检查点目录；已有的检查点必须来自同样参数的任务"""
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    manifest_path = os.path.join(checkpoint_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous != manifest:
+            raise ValueError(f"检查点目录{checkpoint_dir}属于另一次任务(输入或参数不同)")
+    else:
+        _write_json(manifest_path, manifest)
+
+
+def run_sharded(path, interpretation=None, backend="rules", input_format=None,
+                shard_size=DEFAULT_SHARD_SIZE, workers=None, checkpoint_dir=None):
+    """
+    分片并行验证输入文件
+
+    参数:
+        path: 输入文件路径
+        interpretation: 解释类型，默认为当前解释(在主进程中确定后传给每个分片)
+        workers: 进程数，默认为CPU核数
+        checkpoint_dir: 检查点目录，为None时不写检查点
+
+    返回:
+        dict: 合并后的统计信息，另有shards(分片数)和resumed(从检查点恢复的分片数)
+    """
+    interpretation = resolve_interpretation(interpretation)
+    input_format = input_format or guess_input_format(path)
+    header, shards = plan_shards(path, shard_size, input_format)
+
+    completed = {}
+    if checkpoint_dir is not None:
+        info = os.stat(path)
+        _prepare_checkpoints(checkpoint_dir, {
+            "input": os.path.abspath(path), "size": info.st_size, "mtime_ns": info.st_mtime_ns,
+            "input_format": input_format, "shard_size": shard_size,
+            "interpretation": interpretation.value, "backend": backend,
+        })
+        for index in range(len(shards)):
+            shard_path = _shard_path(checkpoint_dir, index)
+            if os.path.exists(shard_path):
+                with open(shard_path, encoding="utf-8") as f:
+                    completed[index] = json.load(f)
+
+    pending = [index for index in range(len(shards)) if index not in completed]
+    resumed = len(completed)
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(backend,)) as executor:
+            futures = {
+                executor.submit(validate_shard, path, input_format, header,
+                                *shards[index], interpretation.value): index
+                for index in pending
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                completed[index] = future.result()
+                if checkpoint_dir is not None:
+                    _write_json(_shard_path(checkpoint_dir, index), completed[index])
+
+    merged = merge_stats(completed[index] for index in range(len(shards)))
+    merged["shards"] = len(shards)
+    merged["resumed"] = resumed
+    return merged
+
+
+# 示例用法
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.txt")
+        forms = [syl.get_figure_and_mood() for syl in Syllogism.all_forms()]
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(forms * 2000) + "\n")
+
+        start = time.perf_counter()
+        stats = run_sharded(path, InterpretationType.BOOLEAN, shard_size=50000,
+                            checkpoint_dir=os.path.join(directory, "checkpoints"))
+        elapsed = time.perf_counter() - start
+        print(f"{stats['total']} 条, {stats['shards']} 个分片, 用时 {elapsed:.2f}s")
+        print(f"有效 {stats['valid']}, 无效 {stats['invalid']}, 错误 {stats['errors']}")
+        print(f"规则失败次数: {stats['rule_failures']}")
@@ -0,0 +1,352 @@
+"""
+连锁三段论(多前提)验证模块
+
+把多个直言命题两两组合成有效三段论，推出中间结论，再继续与后面的命题组合，
+判断能否推出目标结论。两个命题能推出哪些结论直接查省略三段论补全表，组合结果用LRU缓存
+
+两种模式:
+  按顺序: 相邻前提共有一个词项，沿链逐步推导，工作量与前提数成正比
+  不考虑顺序: 先在词项图上用可达集合找出前提链，再沿链逐步推导，不做逐对组合
+
+除三段论外还使用直接推理:
+  两种解释: E、I命题可以简单换位
+  亚里士多德解释: 另有差等推理(A推I、E推O)和限量换位(A推换位的I、E推换位的O)
+"""
+
+from collections import deque
+from functools import lru_cache
+
+from syllogism import Proposition, PropositionType
+from config import InterpretationType, resolve_interpretation
+from enthymeme import get_completion_table, CONCLUSION
+
+A, E, I, O = PropositionType.A, PropositionType.E, PropositionType.I, PropositionType.O
+
+
+def _step_consequences(proposition, interpretation):
+    """
+    命题本身及其直接推出的命题(只含换位、差等推理和限量换位)
+
+    不用immediate_inference的闭包表: 换质和换质位引入的补项会给词项图增加新的词项
+    """
+    prop_type, subject, predicate = proposition
+    results = [proposition]
+    if prop_type in (E, I):
+        results.append(Proposition(prop_type, predicate, subject))
+    if interpretation == InterpretationType.ARISTOTELIAN:
+        if prop_type == A:
+            results.append(Proposition(I, subject, predicate))
+            results.append(Proposition(I, predicate, subject))
+        elif prop_type == E:
+            results.append(Proposition(O, subject, predicate))
+            results.append(Proposition(O, predicate, subject))
+    return results
+
+
+@lru_cache(maxsize=1 << 16)
+def combine(first, second, interpretation):
+    """
+    两个命题作为前提能推出的全部结论
+
+    两个命题必须恰好共有一个词项(中项)，结论关于另外两个词项，两种方向都会尝试
+
+    返回:
+        tuple: 推出的命题
+    """
+    first_terms = {first.subject, first.predicate}
+    second_terms = {second.subject, second.predicate}
+    shared = first_terms & second_terms
+    if len(shared) != 1 or len(first_terms) != 2 or len(second_terms) != 2:
+        return ()
+    middle = shared.pop()
+    (x,) = first_terms - shared - {middle}
+    (y,) = second_terms - {middle}
+
+    table = get_completion_table(interpretation)
+    results = []
+    # 结论为"x ? y"时second是大前提，为"y ? x"时first是大前提
+    for major, minor, minor_term, major_term in ((second, first, x, y), (first, second, y, x)):
+        roles = {minor_term: "S", middle: "M", major_term: "P"}
+        key = (CONCLUSION,
+               Proposition(major.type, roles[major.subject], roles[major.predicate]),
+               Proposition(minor.type, roles[minor.subject], roles[minor.predicate]))
+        for completion in table.get(key, ()):
+            results.append(Proposition(completion.proposition.type, minor_term, major_term))
+    return tuple(results)
+
+
+def derive(premises, interpretation=None, goal=None):
+    """
+    逐对组合推出前提的全部结论(闭包)
+    工作量随前提数多项式增长，只适合少量前提；长链请用follows
+
+    参数:
+        premises: 直言命题的可迭代对象，顺序不限
+        interpretation: 解释类型，默认为当前解释
+        goal: 可选的目标命题，推出后立即停止
+
+    返回:
+        dict: 已推出的命题到来源的映射，来源为None(前提)、("直接推理", 命题)
+              或("三段论", 前提1, 前提2)
+    """
+    interpretation = resolve_interpretation(interpretation)
+    derived = {}
+    by_term = {}
+    queue = deque()
+
+    def add(proposition, source):
+        for consequence in _step_consequences(proposition, interpretation):
+            if consequence not in derived:
+                derived[consequence] = source if consequence == proposition else ("直接推理", proposition)
+                queue.append(consequence)
+
+    for premise in premises:
+        add(premise, None)
+
+    while queue:
+        if goal is not None and goal in derived:
+            break
+        proposition = queue.popleft()
+        partners = []
+        for term in {proposition.subject, proposition.predicate}:
+            partners.extend(by_term.get(term, ()))
+        for partner in partners:
+            for conclusion in combine(proposition, partner, interpretation):
+                if conclusion not in derived:
+                    add(conclusion, ("三段论", proposition, partner))
+        for term in {proposition.subject, proposition.predicate}:
+            by_term.setdefault(term, []).append(proposition)
+    return derived
+
+
+def follows_in_order(premises, conclusion, interpretation=None):
+    """
+    按链的顺序验证: 相邻前提共有一个词项，每一步只保留首个词项与当前词项之间的结论
+    工作量与前提数成正比
+
+    异常:
+        ValueError: 前提不能连成一条链
+    """
+    interpretation = resolve_interpretation(interpretation)
+    premises = list(premises)
+    if not premises:
+        raise ValueError("前提不能为空")
+    current = set(_step_consequences(premises[0], interpretation))
+    for index, premise in enumerate(premises[1:], 1):
+        following = set()
+        for proposition in current:
+            for derived in combine(proposition, premise, interpretation):
+                following.update(_step_consequences(derived, interpretation))
+        if not following:
+            if not ({premises[index - 1].subject, premises[index - 1].predicate} &
+                    {premise.subject, premise.predicate}):
+                raise ValueError(f"第{index}个和第{index + 1}个前提没有共同词项")
+            return False
+        current = following
+    return conclusion in current
+
+
+def _index_premises(premises):
+    """按命题类型建立词项邻接表，每条边记下对应的前提"""
+    edges = {A: {}, "A逆": {}, E: {}, I: {}, O: {}}
+    for premise in premises:
+        prop_type, subject, predicate = premise
+        edges[prop_type].setdefault(subject, []).append((predicate, premise))
+        if prop_type == A:
+            edges["A逆"].setdefault(predicate, []).append((subject, premise))
+        elif prop_type in (E, I):
+            edges[prop_type].setdefault(predicate, []).append((subject, premise))
+    return edges
+
+
+def _reach(starts, adjacency):
+    """多源广度优先搜索，返回可达词项到(上一个词项, 经过的前提)的映射，起点映射到None"""
+    parents = dict.fromkeys(starts)
+    queue = deque(parents)
+    while queue:
+        term = queue.popleft()
+        for following, premise in adjacency.get(term, ()):
+            if following not in parents:
+                parents[following] = (term, premise)
+                queue.append(following)
+    return parents
+
+
+def _trace(parents, term):
+    """从term沿搜索树回到起点经过的前提，以及到达的起点"""
+    steps = []
+    while parents[term] is not None:
+        term, premise = parents[term]
+        steps.append(premise)
+    return steps, term
+
+
+def _back(parents, term):
+    """从起点沿搜索树到term经过的前提"""
+    steps, _ = _trace(parents, term)
+    steps.reverse()
+    return steps
+
+
+def _candidate_chains(premises, conclusion, interpretation):
+    """
+    不考虑前提顺序，依次给出可能推出结论的前提链
+
+    中间结论"所有X是Y"等价于A命题图中X到Y的路径，每个词项的可达集合只计算一次，
+    其余三种结论由可达集合与E、I、O前提拼接而成:
+      E(X, Y): X可达U，Y可达V，且有E(U, V)
+      I(X, Y): U可达X，V可达Y，且有I(U, V)；亚里士多德解释下也可以是某个词项同时可达X和Y
+      O(X, Y): U可达X，Y可达V，且有O(U, V)；或U可达X，有I(U, W)且W与Y可推出全称否定；
+               亚里士多德解释下也可以是某个可达X的词项与Y可推出全称否定
+    可达集合用广度优先搜索求出，每个候选链只需一次线性扫描。
+    前提相互矛盾时，逐对组合偶尔能推出这里找不到的结论
+
+    返回:
+        生成器，依次给出按链的顺序排列的前提列表
+    """
+    aristotelian = interpretation == InterpretationType.ARISTOTELIAN
+    edges = _index_premises(premises)
+    prop_type, x, y = conclusion
+    if x == y:
+        return
+
+    if prop_type == A:
+        up_x = _reach([x], edges[A])
+        if y in up_x:
+            yield _back(up_x, y)
+        return
+
+    if prop_type == E:
+        up_x = _reach([x], edges[A])
+        up_y = _reach([y], edges[A])
+        for u in up_x:
+            for v, premise in edges[E].get(u, ()):
+                if v in up_y:
+                    yield _back(up_x, u) + [premise] + _trace(up_y, v)[0]
+        return
+
+    down_x = _reach([x], edges["A逆"])
+    if prop_type == I:
+        down_y = _reach([y], edges["A逆"])
+        for u in down_x:
+            for v, premise in edges[I].get(u, ()):
+                if v in down_y:
+                    yield _back(down_x, u) + [premise] + _trace(down_y, v)[0]
+        if aristotelian:
+            for z in down_x:
+                if z in down_y:
+                    yield _back(down_x, z) + _trace(down_y, z)[0]
+        return
+
+    up_y = _reach([y], edges[A])
+    for u in down_x:
+        for v, premise in edges[O].get(u, ()):
+            if v in up_y:
+                yield _back(down_x, u) + [premise] + _trace(up_y, v)[0]
+
+    # 与Y可推出全称否定的词项: 可达某个与Y的上位词项有E关系的词项
+    tails = {}
+    for v in up_y:
+        for z, premise in edges[E].get(v, ()):
+            tails.setdefault(z, [premise] + _trace(up_y, v)[0])
+    disjoint = _reach(tails, edges["A逆"])
+    for u in down_x:
+        for w, premise in edges[I].get(u, ()):
+            if w in disjoint:
+                steps, root = _trace(disjoint, w)
+                yield _back(down_x, u) + [premise] + steps + tails[root]
+    if aristotelian:
+        for z in down_x:
+            if z in disjoint:
+                steps, root = _trace(disjoint, z)
+                yield _back(down_x, z) + steps + tails[root]
+
+
+def find_chain(premises, conclusion, interpretation=None):
+    """
+    不考虑前提顺序，找出能推出结论的一条前提链
+
+    返回:
+        list: 按链的顺序排列的前提，follows_in_order可以沿它推出结论；推不出时为None
+    """
+    interpretation = resolve_interpretation(interpretation)
+    for chain in _candidate_chains(premises, conclusion, interpretation):
+        try:
+            if follows_in_order(chain, conclusion, interpretation):
+                return chain
+        except ValueError:
+            pass
+        # 候选链中词项重复出现时逐步推导可能走不通，改为在链上的前提中求闭包
+        if conclusion in derive(chain, interpretation, goal=conclusion):
+            return chain
+    return None
+
+
+def follows(premises, conclusion, interpretation=None, ordered=False):
+    """
+    判断结论能否从前提推出
+
+    参数:
+        premises: 直言命题序列
+        conclusion: 目标命题
+        interpretation: 解释类型，默认为当前解释
+        ordered: 为True时按给定顺序逐步推导，否则用find_chain找出前提链
+
+    异常:
+        ValueError: ordered为True且前提不能连成一条链
+    """
+    if ordered:
+        return follows_in_order(premises, conclusion, interpretation)
+    return find_chain(premises, conclusion, interpretation) is not None
+
+
+def explain(premises, conclusion, interpretation=None):
+    """
+    给出推出结论的步骤，只在find_chain找出的前提链上推导
+
+    返回:
+        list: 按推导顺序排列的(命题, 来源)；不能推出时为None
+    """
+    chain = find_chain(premises, conclusion, interpretation)
+    if chain is None:
+        return None
+    derived = derive(chain, interpretation, goal=conclusion)
+    if conclusion not in derived:
+        return None
+    steps = []
+    seen = set()
+
+    def visit(proposition):
+        if proposition in seen:
+            return
+        seen.add(proposition)
+        source = derived[proposition]
+        if source is not None:
+            for parent in source[1:]:
+                visit(parent)
+        steps.append((proposition, source))
+
+    visit(conclusion)
+    return steps
+
+
+# 示例用法
+if __name__ == "__main__":
+    import random
+    import time
+
+    # 刘易斯·卡罗尔式的连锁论证: 所有t0是t1，所有t1是t2，……
+    count = 500
+    chain = [Proposition(A, f"t{i}", f"t{i + 1}") for i in range(count)]
+    goal = Proposition(A, "t0", f"t{count}")
+    shuffled = random.sample(chain, count)
+
+    for ordered, premises in ((True, chain), (False, shuffled)):
+        start = time.perf_counter()
+        result = follows(premises, goal, InterpretationType.BOOLEAN, ordered=ordered)
+        elapsed = time.perf_counter() - start
+        print(f"{count} 个前提, {'按顺序' if ordered else '不考虑顺序'}: {result}, 用时 {elapsed:.3f}s")
+
+    steps = explain(chain[:3], Proposition(A, "t0", "t3"), InterpretationType.BOOLEAN)
+    for proposition, source in steps:
+        print(f"  {proposition}  <= {source[0] if source else '前提'}")
@@ -1,3 +1,4 @@
+from collections import namedtuple
 from enum import Enum
 
 class PropositionType(Enum):
@@ -6,27 +7,132 @@ class PropositionType(Enum):
     I = "I"  # 特称肯定
     O = "O"  # 特称否定
 
+class Proposition(namedtuple("Proposition", "type subject predicate")):
+    """
+    直言命题: 命题类型(PropositionType)、主项、谓项
+    三段论形式中的词项用"S"(小项)、"M"(中项)、"P"(大项)表示
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{self.subject} {self.type.value} {self.predicate}"
+
+# 命题类型的2位编码: A=0, E=1, I=2, O=3
+PROPOSITION_TYPES = (PropositionType.A, PropositionType.E, PropositionType.I, PropositionType.O)
+_TYPE_INDEX = {prop_type: index for index, prop_type in enumerate(PROPOSITION_TYPES)}
+
+# 中项位置(大前提, 小前提)对应的格: (0,0)=3, (0,1)=1, (1,0)=4, (1,1)=2
+_FIGURES = (3, 1, 4, 2)
+_FIGURE_POSITIONS = {figure: divmod(index, 2) for index, figure in enumerate(_FIGURES)}
+
+FORM_COUNT = 256
+
 class Syllogism:
-    def __init__(self, major_type, minor_type, conclusion_type,
-                 major_position, minor_position):
-        self.major_type = major_type          # 大前提类型(AEIO)
-        self.minor_type = minor_type          # 小前提类型(AEIO)
-        self.conclusion_type = conclusion_type # 结论类型(AEIO)
-        self.major_position = major_position   # 大前提中项位置: 0=主项, 1=谓项
-        self.minor_position = minor_position   # 小前提中项位置: 0=主项, 1=谓项
+    """
+    三段论形式
+
+    每种形式对应一个8位编码: 高6位为式(大前提、小前提、结论各2位)，
+    低2位为大、小前提中项位置(与格一一对应)。
+    全部256种形式各只存在一个实例，实例不可修改，按编码比较和哈希
+    """
+
+    __slots__ = ("major_type", "minor_type", "conclusion_type",
+                 "major_position", "minor_position", "code")
+
+    _instances = {}
+
+    def __new__(cls, major_type, minor_type, conclusion_type,
+                major_position, minor_position):
+        try:
+            code = ((_TYPE_INDEX[major_type] << 6) |
+                    (_TYPE_INDEX[minor_type] << 4) |
+                    (_TYPE_INDEX[conclusion_type] << 2))
+        except KeyError as e:
+            raise ValueError(f"无效的命题类型: {e.args[0]}") from None
+        if major_position not in (0, 1) or minor_position not in (0, 1):
+            raise ValueError(f"无效的中项位置: {major_position}, {minor_position}")
+        return cls.from_code(code | (major_position << 1) | minor_position)
+
+    @classmethod
+    def from_code(cls, code):
+        """根据8位编码获取三段论形式"""
+        try:
+            return cls._instances[code]
+        except (KeyError, TypeError):
+            pass
+        if not isinstance(code, int) or not 0 <= code < FORM_COUNT:
+            raise ValueError(f"无效的三段论编码: {code}")
+        syl = object.__new__(cls)
+        object.__setattr__(syl, "major_type", PROPOSITION_TYPES[(code >> 6) & 3])        # 大前提类型(AEIO)
+        object.__setattr__(syl, "minor_type", PROPOSITION_TYPES[(code >> 4) & 3])        # 小前提类型(AEIO)
+        object.__setattr__(syl, "conclusion_type", PROPOSITION_TYPES[(code >> 2) & 3])   # 结论类型(AEIO)
+        object.__setattr__(syl, "major_position", (code >> 1) & 1)   # 大前提中项位置: 0=主项, 1=谓项
+        object.__setattr__(syl, "minor_position", code & 1)          # 小前提中项位置: 0=主项, 1=谓项
+        object.__setattr__(syl, "code", code)
+        return cls._instances.setdefault(code, syl)
+
+    @classmethod
+    def from_name(cls, name):
+        """根据格和式获取三段论形式，如AAA-1"""
+        try:
+            mood, figure = name.strip().upper().split("-")
+            major_type, minor_type, conclusion_type = (PropositionType(letter) for letter in mood)
+            major_position, minor_position = _FIGURE_POSITIONS[int(figure)]
+        except (AttributeError, ValueError, KeyError):
+            raise ValueError(f"无效的三段论名称: {name}") from None
+        return cls(major_type, minor_type, conclusion_type, major_position, minor_position)
+
+    @classmethod
+    def all_forms(cls):
+        """按编码顺序返回全部256种形式"""
+        return [cls.from_code(code) for code in range(FORM_COUNT)]
+
+    def to_code(self):
+        """获取8位编码"""
+        return self.code
+
+    @property
+    def mood(self):
+        """式，如AAA"""
+        return f"{self.major_type.value}{self.minor_type.value}{self.conclusion_type.value}"
+
+    @property
+    def figure(self):
+        """格(1-4)"""
+        return _FIGURES[self.code & 3]
+
+    def __setattr__(self, name, value):
+        raise AttributeError("三段论形式不可修改")
+
+    def __delattr__(self, name):
+        raise AttributeError("三段论形式不可修改")
+
+    def __eq__(self, other):
+        if isinstance(other, Syllogism):
+            return self.code == other.code
+        return NotImplemented
+
+    def __hash__(self):
+        return self.code
+
+    def __reduce__(self):
+        return (Syllogism.from_code, (self.code,))
+
+    def __repr__(self):
+        return f"<Syllogism {self.get_figure_and_mood()} code={self.code}>"
+
+    def propositions(self):
+        """返回(大前提, 小前提, 结论)三个命题，词项为S、M、P"""
+        major = ("M", "P") if self.major_position == 0 else ("P", "M")
+        minor = ("M", "S") if self.minor_position == 0 else ("S", "M")
+        return (Proposition(self.major_type, *major),
+                Proposition(self.minor_type, *minor),
+                Proposition(self.conclusion_type, "S", "P"))
 
     def get_figure_and_mood(self):
         """获取格和式，如AAA-1"""
-        mood = f"{self.major_type.value}{self.minor_type.value}{self.conclusion_type.value}"
-        if self.major_position == 0 and self.minor_position == 1:
-            figure = 1
-        elif self.major_position == 1 and self.minor_position == 1:
-            figure = 2
-        elif self.major_position == 0 and self.minor_position == 0:
-            figure = 3
-        else:
-            figure = 4
-        return f"{mood}-{figure}"
+        return f"{self.mood}-{self.figure}"
 
     def __str__(self):
         name = self.get_figure_and_mood()
@@ -50,4 +156,5 @@ class Syllogism:
 # 示例用法
 if __name__ == "__main__":
     syl = Syllogism(PropositionType.A, PropositionType.A, PropositionType.A, 0, 0)
-    print(syl)
\ No newline at end of file
+    print(syl)
+    print(f"编码: {syl.to_code()}, 同一实例: {Syllogism.from_code(syl.to_code()) is syl}")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+统一的命令行入口
+
+子命令所在的模块在执行时才导入；只输出数据的子命令(forms、valid、check)
+读取预先计算的有效性表文件validity_table.bin，不导入规则模块，也不构造检查器。
+数据文件缺失或其中的校验和与当前规则源码不符时，第一次运行会重新计算并写入
+
+用法:
+    python3 -m syllogism_cli valid [-i aristotelian|boolean|both] [--backend rules|venn]
+    python3 -m syllogism_cli check AAA-1 EAO-3 [-i boolean]
+    python3 -m syllogism_cli forms
+    python3 -m syllogism_cli stream|query|shard|store|serve|bench [参数...]
+"""
+
+import sys
+
+# 冷启动目标(毫秒)：只输出数据的子命令从启动解释器到退出的耗时，见benchmark.py --startup
+STARTUP_TARGET_MS = 50
+
+# 转交给其他模块的子命令: 名称 -> (模块, 入口函数, 说明)
+DELEGATED_COMMANDS = {
+    "stream": ("validate_all", "stream_main", "流式批量验证"),
+    "query": ("validate_all", "query_main", "查询满足部分指定的有效形式"),
+    "shard": ("validate_all", "shard_main", "分片并行验证大文件"),
+    "store": ("result_store", "main", "验证结果存储"),
+    "serve": ("validation_service", "main", "HTTP验证服务"),
+    "bench": ("benchmark", "main", "性能基准"),
+}
+
+_INTERPRETATION_NAMES = ("aristotelian", "boolean")
+
+
+def _parse_options(argv, options):
+    """
+    解析"--名称 值"形式的选项，不使用argparse以减少启动时的导入
+
+    参数:
+        argv: 参数列表
+        options: 选项名称(含别名)到字段名的映射
+
+    返回:
+        (values, positional): 字段名到值的映射和其余参数
+
+    异常:
+        ValueError: 选项缺少值或未知
+    """
+    values, positional = {}, []
+    args = iter(argv)
+    for arg in args:
+        if arg in options:
+            value = next(args, None)
+            if value is None:
+                raise ValueError(f"选项{arg}缺少值")
+            values[options[arg]] = value
+        elif arg.startswith("-") and arg != "-":
+            raise ValueError(f"未知选项: {arg}")
+        else:
+            positional.append(arg)
+    return values, positional
+
+
+def _interpretations(name):
+    """把解释名称("both"表示全部)转换为解释类型元组，未指定时为当前解释"""
+    from config import InterpretationType, get_interpretation
+
+    if name is None:
+        return (get_interpretation(),)
+    if name == "both":
+        return tuple(InterpretationType)
+    if name not in _INTERPRETATION_NAMES:
+        raise ValueError(f"无效的解释类型: {name}，可选: {', '.join(_INTERPRETATION_NAMES)}, both")
+    return (InterpretationType(name),)
+
+
+def _validity_rows(interpretations, backend):
+    """各解释下全部形式的有效性；规则后端的数据文件过期时顺便重新写入"""
+    from validity_table import BACKENDS, INTERPRETATIONS, get_validity_table, table_is_current, save_validity_table
+    from syllogism import FORM_COUNT
+
+    if backend not in BACKENDS:
+        raise ValueError(f"无效的验证后端: {backend}，可选: {', '.join(BACKENDS)}")
+    table = get_validity_table(backend)
+    if backend == "rules" and not table_is_current():
+        try:
+            save_validity_table(table)
+        except OSError:
+            pass
+    rows = []
+    for interp in interpretations:
+        offset = INTERPRETATIONS.index(interp) * FORM_COUNT
+        rows.append(table[offset:offset + FORM_COUNT])
+    return rows
+
+
+def _write_lines(lines):
+    sys.stdout.write("".join(line + "\n" for line in lines))
+
+
+def forms_main(argv):
+    """列出全部256种形式: 编码<TAB>名称"""
+    from syllogism import Syllogism
+
+    if argv:
+        print("用法: python3 -m syllogism_cli forms", file=sys.stderr)
+        return 2
+    _write_lines(f"{syl.code}\t{syl.get_figure_and_mood()}" for syl in Syllogism.all_forms())
+    return 0
+
+
+def valid_main(argv):
+    """
+    列出有效形式，每行一个
+    指定-i both时每行为 形式<TAB>解释
+    """
+    from syllogism import Syllogism
+
+    try:
+        values, positional = _parse_options(argv, {"-i": "interpretation", "--interpretation": "interpretation",
+                                                   "--backend": "backend"})
+        if positional:
+            raise ValueError(f"多余的参数: {' '.join(positional)}")
+        interpretations = _interpretations(values.get("interpretation"))
+        rows = _validity_rows(interpretations, values.get("backend", "rules"))
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        print("用法: python3 -m syllogism_cli valid [-i aristotelian|boolean|both] [--backend rules|venn]",
+              file=sys.stderr)
+        return 2
+
+    names = [syl.get_figure_and_mood() for syl in Syllogism.all_forms()]
+    if len(interpretations) == 1:
+        _write_lines(name for name, valid in zip(names, rows[0]) if valid)
+    else:
+        _write_lines(f"{name}\t{interp.value}" for interp, row in zip(interpretations, rows)
+                     for name, valid in zip(names, row) if valid)
+    return 0
+
+
+def check_main(argv):
+    """
+    查询指定形式是否有效: 形式<TAB>valid|invalid
+    指定-i both时每种解释各输出一列；有无法识别的形式时返回码为1
+    """
+    from syllogism import Syllogism
+
+    try:
+        values, names = _parse_options(argv, {"-i": "interpretation", "--interpretation": "interpretation",
+                                              "--backend": "backend"})
+        if not names:
+            raise ValueError("没有指定形式")
+        rows = _validity_rows(_interpretations(values.get("interpretation")), values.get("backend", "rules"))
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        print("用法: python3 -m syllogism_cli check 形式... [-i aristotelian|boolean|both] [--backend rules|venn]",
+              file=sys.stderr)
+        return 2
+
+    status = 0
+    lines = []
+    for name in names:
+        try:
+            code = Syllogism.from_name(name).code
+        except ValueError as e:
+            print(f"错误: {e}", file=sys.stderr)
+            status = 1
+            continue
+        lines.append("\t".join([name] + ["valid" if row[code] else "invalid" for row in rows]))
+    _write_lines(lines)
+    return status
+
+
+# 本模块实现的子命令: 名称 -> (入口函数, 说明)
+LOCAL_COMMANDS = {
+    "forms": (forms_main, "列出全部形式及编码"),
+    "valid": (valid_main, "列出有效形式"),
+    "check": (check_main, "查询指定形式是否有效"),
+}
+
+
+def usage():
+    """子命令列表"""
+    lines = ["用法: python3 -m syllogism_cli 子命令 [参数...]", ""]
+    for name, (_, description) in LOCAL_COMMANDS.items():
+        lines.append(f"  {name:<8}{description}")
+    for name, (_, _, description) in DELEGATED_COMMANDS.items():
+        lines.append(f"  {name:<8}{description}，详见 {name} --help")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print(usage())
+        return 0 if argv else 2
+    command, rest = argv[0], argv[1:]
+    if command in LOCAL_COMMANDS:
+        return LOCAL_COMMANDS[command][0](rest)
+    if command in DELEGATED_COMMANDS:
+        import importlib
+
+        module_name, function_name, _ = DELEGATED_COMMANDS[command]
+        return getattr(importlib.import_module(module_name), function_name)(rest)
+    print(f"未知子命令: {command}\n\n{usage()}", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
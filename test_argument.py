@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+测试具体论证的规范化与批量验证
+"""
+
+from syllogism import Syllogism, PropositionType
+from config import InterpretationType
+from rule_checker import SyllogismChecker
+from validation_rules import is_valid_syllogism
+from argument import Argument, make_proposition, normalize, validate_arguments
+
+A, E, I, O = PropositionType.A, PropositionType.E, PropositionType.I, PropositionType.O
+LABELS = {"S": "狗", "M": "哺乳动物", "P": "动物"}
+
+def concrete(syl, swap=False):
+    """用具体标签替换形式中的S、M、P"""
+    major, minor, conclusion = (make_proposition(p.type, LABELS[p.subject], LABELS[p.predicate])
+                                for p in syl.propositions())
+    return Argument(minor, major, conclusion) if swap else Argument(major, minor, conclusion)
+
+def test_normalize_all_forms():
+    """测试全部形式都能还原"""
+    print("=== 测试规范化 ===")
+    for syl in Syllogism.all_forms():
+        assert normalize(concrete(syl)) is syl
+        assert normalize(concrete(syl, swap=True)) is syl
+    argument = concrete(Syllogism.from_name("EIO-2"))
+    print(f"  {argument.major} / {argument.minor} / {argument.conclusion} => EIO-2")
+
+    # 相同标签共享同一个字符串对象
+    first = make_proposition(A, "".join(["哺乳", "动物"]), "动物")
+    second = make_proposition(A, "".join(["哺", "乳动物"]), "动物")
+    assert first.subject is second.subject
+
+def test_normalize_errors():
+    """测试非标准三段论"""
+    print("\n=== 测试非标准三段论 ===")
+    invalid = [
+        Argument(make_proposition(A, "狗", "动物"), make_proposition(A, "狗", "动物"),
+                 make_proposition(A, "狗", "动物")),
+        Argument(make_proposition(A, "猫", "动物"), make_proposition(A, "狗", "哺乳动物"),
+                 make_proposition(A, "狗", "动物")),
+        Argument(make_proposition(A, "哺乳动物", "动物"), make_proposition(A, "狗", "哺乳动物"),
+                 make_proposition(A, "狗", "狗")),
+    ]
+    for argument in invalid:
+        try:
+            normalize(argument)
+            assert False, "应该抛出异常"
+        except ValueError as e:
+            print(f"正确捕获错误: {e}")
+
+def test_validate_once_per_form():
+    """测试每种形式只验证一次"""
+    print("\n=== 测试按形式分组验证 ===")
+    calls = []
+    checker = SyllogismChecker()
+    checker.add_rule("计数", lambda syl: calls.append(syl) or True)
+
+    forms = [Syllogism.from_name(name) for name in ("AAA-1", "AAI-1", "III-1")]
+    arguments = [concrete(forms[i % 3], swap=i % 2 == 1) for i in range(300)]
+    arguments.append(Argument(make_proposition(A, "猫", "动物"), make_proposition(A, "狗", "猫"),
+                              make_proposition(A, "鸟", "动物")))
+
+    results = validate_arguments(arguments, checker, InterpretationType.BOOLEAN)
+    assert len(calls) == 3
+    for i in range(300):
+        form = forms[i % 3]
+        assert results[i].form is form
+        assert results[i].valid == is_valid_syllogism(form, interpretation=InterpretationType.BOOLEAN)
+    assert results[-1].form is None and results[-1].error
+    print(f"  301 个论证, 规则运行 {len(calls)} 次")
+
+if __name__ == "__main__":
+    test_normalize_all_forms()
+    test_normalize_errors()
+    test_validate_once_per_form()
+    print("\n✓ 所有测试完成!")
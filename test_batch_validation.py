@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+测试批量验证模块
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from syllogism import Syllogism, FORM_COUNT
+from config import set_interpretation, get_interpretation, InterpretationType
+from validation_rules import get_all_validation_rules
+from batch_validation import RULE_BITS, encode_arrays, validate_codes, validate_arrays
+
+def test_matches_rule_functions():
+    """测试批量结果与逐个规则结果一致"""
+    print("=== 测试批量验证与规则一致 ===")
+    codes = np.arange(FORM_COUNT)
+    previous = get_interpretation()
+    try:
+        for interp in InterpretationType:
+            set_interpretation(interp)
+            valid, failures = validate_codes(codes, interp)
+            for code in range(FORM_COUNT):
+                syl = Syllogism.from_code(code)
+                expected_mask = 0
+                for name, rule in get_all_validation_rules():
+                    if not rule(syl):
+                        expected_mask |= RULE_BITS[name]
+                assert failures[code] == expected_mask
+                assert valid[code] == (expected_mask == 0)
+            print(f"  {interp.value}: {int(valid.sum())} 个有效形式")
+    finally:
+        set_interpretation(previous)
+
+def test_field_arrays():
+    """测试按字段给出的数组"""
+    print("\n=== 测试字段数组 ===")
+    # AAA-1 与 III-1
+    major = np.array([0, 2])
+    minor = np.array([0, 2])
+    conclusion = np.array([0, 2])
+    major_pos = np.array([0, 0])
+    minor_pos = np.array([1, 1])
+    codes = encode_arrays(major, minor, conclusion, major_pos, minor_pos)
+    assert [Syllogism.from_code(int(code)).get_figure_and_mood() for code in codes] == ["AAA-1", "III-1"]
+    valid, failures = validate_arrays(major, minor, conclusion, major_pos, minor_pos,
+                                      InterpretationType.BOOLEAN)
+    assert list(valid) == [True, False]
+    assert failures[1] & RULE_BITS["中项至少周延一次"]
+
+def test_invalid_input():
+    """测试错误输入"""
+    print("\n=== 测试错误输入 ===")
+    for codes in [np.array([256]), np.array([-1]), np.array([0.5])]:
+        try:
+            validate_codes(codes)
+            assert False, "应该抛出异常"
+        except ValueError as e:
+            print(f"正确捕获错误: {e}")
+
+if __name__ == "__main__":
+    test_matches_rule_functions()
+    test_field_arrays()
+    test_invalid_input()
+    print("\n✓ 所有测试完成!")
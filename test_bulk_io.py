@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+测试批量验证的输入输出模块
+"""
+
+import io
+import json
+
+from config import InterpretationType
+from bulk_io import read_records, record_to_syllogism, stream_validate
+from validate_all import stream_main
+
+def test_record_formats():
+    """测试各种记录写法"""
+    print("=== 测试记录写法 ===")
+    records = [
+        {"form": "aaa-1"},
+        {"code": "1"},
+        {"major_type": "A", "minor_type": "A", "conclusion_type": "A",
+         "major_position": "0", "minor_position": 1},
+    ]
+    for record in records:
+        assert record_to_syllogism(record).get_figure_and_mood() == "AAA-1"
+
+    for record in [None, {"form": "AAA-5"}, {"code": 999}, {"major_type": "A"},
+                   {"major_type": "X", "minor_type": "A", "conclusion_type": "A",
+                    "major_position": 0, "minor_position": 1},
+                   # 非整数的编码和位置不截断为1
+                   {"code": 1.9}, {"code": True}, {"code": "1.0"},
+                   {"major_type": "A", "minor_type": "A", "conclusion_type": "A",
+                    "major_position": 0, "minor_position": 1.5},
+                   {"major_type": "A", "minor_type": "A", "conclusion_type": "A",
+                    "major_position": 0, "minor_position": True},
+                   {"major_type": "A", "minor_type": "A", "conclusion_type": "A",
+                    "major_position": "0", "minor_position": "1.0"}]:
+        try:
+            record_to_syllogism(record)
+            assert False, "应该抛出异常"
+        except ValueError as e:
+            print(f"正确捕获错误: {e}")
+
+def test_stream_jsonl():
+    """测试JSONL流式验证"""
+    print("\n=== 测试JSONL流 ===")
+    lines = ['{"id": "a", "form": "AAA-1"}', '{"id": "b", "form": "AAI-1"}', 'broken', '']
+    output = io.StringIO()
+    stats = stream_validate(io.StringIO("\n".join(lines)), output,
+                            interpretation=InterpretationType.BOOLEAN, chunk_size=2)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    print(f"  {stats}")
+    assert stats == {"total": 3, "valid": 1, "invalid": 1, "errors": 1}
+    assert results[0] == {"id": "a", "form": "AAA-1", "code": 1, "valid": True}
+    assert results[1]["valid"] == False
+    assert results[2] == {"line": 3, "error": "无法解析的记录"}
+
+    # 块大小为0或负数时报错，而不是丢弃全部输入
+    for chunk_size in (0, -1):
+        try:
+            stream_validate(io.StringIO("\n".join(lines)), io.StringIO(), chunk_size=chunk_size)
+            assert False, "应该抛出异常"
+        except ValueError as e:
+            print(f"正确捕获错误: {e}")
+
+def test_stream_csv_and_text():
+    """测试CSV输入和文本输出"""
+    print("\n=== 测试CSV与文本 ===")
+    source = "id,form\n1,AAI-1\n2,EIO-2\n"
+    output = io.StringIO()
+    stream_validate(io.StringIO(source), output, input_format="csv", output_format="csv",
+                    interpretation=InterpretationType.ARISTOTELIAN, chunk_size=1)
+    lines = output.getvalue().splitlines()
+    print("  " + " | ".join(lines))
+    assert lines == ["id,form,code,valid,error", "1,AAI-1,9,True,", "2,EIO-2,111,True,"]
+
+    records = list(read_records(io.StringIO("AAA-1\n\nEEE-1\n"), "text"))
+    assert records == [(1, {"form": "AAA-1"}), (3, {"form": "EEE-1"})]
+    output = io.StringIO()
+    stream_validate(io.StringIO("EEE-1\n"), output, input_format="text", output_format="text")
+    assert output.getvalue() == "EEE-1\t无效\n"
+
+def test_stream_command_files(tmp_path):
+    """测试stream子命令无法打开文件时报告用法错误"""
+    print("\n=== 测试stream子命令的文件错误 ===")
+    source = tmp_path / "input.txt"
+    source.write_text("AAA-1\n", encoding="utf-8")
+    for argv in ([str(tmp_path / "missing.txt")], [str(source), "-o", str(tmp_path / "missing" / "out.jsonl")]):
+        try:
+            stream_main(argv)
+            assert False, "应该抛出异常"
+        except SystemExit as e:
+            assert e.code == 2
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_record_formats()
+    test_stream_jsonl()
+    test_stream_csv_and_text()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_stream_command_files(Path(tmp))
+    print("\n✓ 所有测试完成!")
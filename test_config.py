@@ -3,10 +3,15 @@
 测试配置模块的功能
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from config import (
     set_interpretation, get_interpretation, is_aristotelian, is_boolean,
-    InterpretationType, get_interpretation_name
+    InterpretationType, get_interpretation_name, interpretation_context
 )
+from syllogism import Syllogism, PropositionType
+from validation_rules import is_valid_syllogism, apply_all_rules
 
 def test_config():
     """测试配置功能"""
@@ -38,5 +43,52 @@ def test_config():
 
     print("✓ 所有测试通过!")
 
+def test_interpretation_context():
+    """测试上下文解释不影响全局设置"""
+    print("\n=== 测试上下文解释 ===")
+    assert get_interpretation() == InterpretationType.BOOLEAN
+    with interpretation_context(InterpretationType.ARISTOTELIAN):
+        assert is_aristotelian() == True
+        assert is_boolean(InterpretationType.BOOLEAN) == True
+        print(f"上下文内解释: {get_interpretation_name()}")
+    assert get_interpretation() == InterpretationType.BOOLEAN
+
+    try:
+        with interpretation_context("invalid"):
+            pass
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+def test_concurrent_interpretations():
+    """测试多个线程和asyncio任务同时使用不同解释"""
+    print("\n=== 测试并发解释 ===")
+    # AAI-1 只在亚里士多德解释下有效
+    aai_1 = Syllogism(PropositionType.A, PropositionType.A, PropositionType.I, 0, 1)
+    expected = {InterpretationType.ARISTOTELIAN: True, InterpretationType.BOOLEAN: False}
+
+    def validate(interp):
+        with interpretation_context(interp):
+            return all(apply_all_rules(aai_1).values()), is_valid_syllogism(aai_1)
+
+    jobs = list(InterpretationType) * 200
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for interp, (by_rules, by_table) in zip(jobs, pool.map(validate, jobs)):
+            assert by_rules == by_table == expected[interp]
+
+    async def validate_async(interp):
+        with interpretation_context(interp):
+            await asyncio.sleep(0)
+            return is_valid_syllogism(aai_1)
+
+    async def run_all():
+        return await asyncio.gather(*(validate_async(interp) for interp in jobs))
+
+    for interp, result in zip(jobs, asyncio.run(run_all())):
+        assert result == expected[interp]
+    print(f"✓ {len(jobs)} 个线程任务与 {len(jobs)} 个asyncio任务结果正确")
+
 if __name__ == "__main__":
     test_config()
+    test_interpretation_context()
+    test_concurrent_interpretations()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+测试解释差异比较
+"""
+
+from syllogism import Syllogism
+from config import InterpretationType, get_interpretation
+from rule_checker import SyllogismChecker
+from demo_interpretations import Profile, diff_profiles, forms_of
+
+def test_two_interpretations():
+    """测试两种解释的差异"""
+    print("=== 测试两种解释 ===")
+    before = get_interpretation()
+    report = diff_profiles([InterpretationType.ARISTOTELIAN, InterpretationType.BOOLEAN])
+    assert get_interpretation() == before
+
+    aristotelian = report["valid"]["aristotelian"]
+    boolean = report["valid"]["boolean"]
+    assert len(forms_of(aristotelian)) == 24
+    assert len(forms_of(boolean)) == 15
+    assert report["intersection"] == boolean
+    assert report["exclusive"]["boolean"] == 0
+    only_aristotelian = [syl.get_figure_and_mood() for syl in forms_of(report["exclusive"]["aristotelian"])]
+    print(f"  仅亚里士多德解释有效: {only_aristotelian}")
+    assert "AAI-1" in only_aristotelian
+    assert report["symmetric_difference"][("aristotelian", "boolean")] == aristotelian ^ boolean
+
+def test_custom_profiles():
+    """测试自定义规则配置"""
+    print("\n=== 测试自定义规则配置 ===")
+    first_figure_only = SyllogismChecker()
+    first_figure_only.add_rule("仅第一格", lambda syl: syl.figure == 1)
+
+    report = diff_profiles([
+        InterpretationType.ARISTOTELIAN,
+        Profile("布尔", InterpretationType.BOOLEAN),
+        Profile("第一格", InterpretationType.ARISTOTELIAN, first_figure_only),
+        Profile("语义", InterpretationType.BOOLEAN, backend="venn"),
+    ])
+    assert report["valid"]["布尔"] == report["valid"]["语义"]
+    # 只用检查器自己的规则判断，且不向检查器注册验证规则
+    assert [name for name, _ in first_figure_only.rules] == ["仅第一格"]
+    assert forms_of(report["valid"]["第一格"]) == [syl for syl in Syllogism.all_forms() if syl.figure == 1]
+    assert all(syl.figure == 1 for syl in forms_of(report["intersection"]))
+    assert report["exclusive"]["布尔"] == 0
+    assert report["union"] == report["valid"]["aristotelian"] | report["valid"]["第一格"]
+    for name, bits in report["exclusive"].items():
+        print(f"  仅{name}有效: {len(forms_of(bits))}")
+
+    # 结果按名称索引，重名的配置会互相覆盖
+    try:
+        diff_profiles([InterpretationType.BOOLEAN, Profile("boolean", InterpretationType.ARISTOTELIAN)])
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+if __name__ == "__main__":
+    test_two_interpretations()
+    test_custom_profiles()
+    print("\n✓ 所有测试完成!")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+测试省略三段论补全
+"""
+
+from syllogism import Syllogism, PropositionType, Proposition
+from config import InterpretationType
+from validation_rules import is_valid_syllogism
+from enthymeme import complete, complete_many
+
+A, E, I, O = PropositionType.A, PropositionType.E, PropositionType.I, PropositionType.O
+
+def test_matches_brute_force():
+    """测试补全结果与逐个尝试一致"""
+    print("=== 测试补全结果 ===")
+    for interp in InterpretationType:
+        for syl in Syllogism.all_forms():
+            major, minor, conclusion = syl.propositions()
+            for index, known in enumerate([(minor, conclusion), (major, conclusion), (major, minor)]):
+                expected = {candidate for candidate in Syllogism.all_forms()
+                            if is_valid_syllogism(candidate, interpretation=interp)
+                            and all(p in candidate.propositions() for p in known)}
+                answers = complete(*known, interpretation=interp)
+                assert {answer.syllogism for answer in answers} == expected
+                for answer in answers:
+                    assert answer.syllogism.propositions()[index] == answer.proposition
+    print("  ✓ 与逐个尝试一致")
+
+def test_ranking():
+    """测试排序"""
+    print("\n=== 测试排序 ===")
+    # Barbara: 全称结论排在弱化的特称结论前面
+    answers = complete(Proposition(A, "M", "P"), Proposition(A, "S", "M"),
+                       interpretation=InterpretationType.ARISTOTELIAN)
+    assert [str(answer.proposition) for answer in answers] == ["S A P", "S I P"]
+
+    # 缺小前提: 不依赖存在性假设且较弱的特称前提优先
+    answers = complete(Proposition(I, "S", "P"), Proposition(A, "M", "P"),
+                       interpretation=InterpretationType.ARISTOTELIAN)
+    print(f"  {[str(answer.proposition) for answer in answers]}")
+    assert answers[0].proposition.type == I
+    assert answers[-1].proposition.type == A
+
+def test_invalid_input():
+    """测试错误输入"""
+    print("\n=== 测试错误输入 ===")
+    results = list(complete_many([
+        (Proposition(A, "M", "P"), Proposition(E, "P", "M")),
+        (Proposition(A, "P", "S"), Proposition(E, "S", "M")),
+        (Proposition(I, "I", "I"), Proposition(I, "I", "I")),
+        (Proposition(I, "M", "P"), Proposition(I, "S", "M")),
+    ]))
+    assert isinstance(results[0], ValueError)
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], ValueError)
+    assert results[3] == ()
+    for result in results[:3]:
+        print(f"正确捕获错误: {result}")
+
+if __name__ == "__main__":
+    test_matches_brute_force()
+    test_ranking()
+    test_invalid_input()
+    print("\n✓ 所有测试完成!")
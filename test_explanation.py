@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+测试失效原因解释
+"""
+
+from syllogism import Syllogism, PropositionType
+from config import InterpretationType, interpretation_context
+from argument import Argument, make_proposition
+from validation_rules import apply_all_rules, no_illicit_distribution, no_illicit_major, no_illicit_minor
+from validity_table import lookup_validity
+from explanation import (
+    REASON_BITS, ILLICIT_MAJOR, ILLICIT_MINOR, UNDISTRIBUTED_MIDDLE, EXISTENTIAL_FALLACY,
+    AFFIRMATIVE_FROM_NEGATIVE, NEGATIVE_FROM_AFFIRMATIVE,
+    failure_mask, explain, explain_many, explain_argument, reasons_for_mask,
+)
+
+A, E, I, O = PropositionType.A, PropositionType.E, PropositionType.I, PropositionType.O
+
+def test_matches_rules():
+    """测试位掩码与规则结果一致"""
+    print("=== 测试与规则一致 ===")
+    for interp in InterpretationType:
+        for syl in Syllogism.all_forms():
+            mask = failure_mask(syl, interp)
+            results = apply_all_rules(syl, interpretation=interp)
+            assert (mask == 0) == lookup_validity(syl.code, interp)
+            failed_rules = {name for name, passed in results.items() if not passed}
+            assert {reason.rule for reason in explain(syl, interp)} == failed_rules
+            assert no_illicit_distribution(syl) == (no_illicit_major(syl) and no_illicit_minor(syl))
+
+def test_split_reasons():
+    """测试拆分后的原因"""
+    print("\n=== 测试拆分原因 ===")
+    cases = {
+        "AEE-1": {ILLICIT_MAJOR},
+        "AAA-3": {ILLICIT_MINOR},
+        "AAA-2": {UNDISTRIBUTED_MIDDLE},
+        "IAE-2": {UNDISTRIBUTED_MIDDLE, ILLICIT_MAJOR, NEGATIVE_FROM_AFFIRMATIVE},
+        "EAA-1": {AFFIRMATIVE_FROM_NEGATIVE},
+    }
+    for name, expected in cases.items():
+        reasons = explain(Syllogism.from_name(name), InterpretationType.ARISTOTELIAN)
+        print(f"  {name}: {[reason.message for reason in reasons]}")
+        assert {reason.code for reason in reasons} == expected
+    reasons = explain(Syllogism.from_name("AEE-1"), InterpretationType.BOOLEAN)
+    assert reasons[0].terms == ("P",)
+
+def test_interpretation():
+    """测试解释类型"""
+    print("\n=== 测试解释类型 ===")
+    darapti = Syllogism.from_name("AAI-3")
+    assert explain(darapti, InterpretationType.ARISTOTELIAN) == ()
+    assert failure_mask(darapti, InterpretationType.BOOLEAN) == REASON_BITS[EXISTENTIAL_FALLACY]
+    with interpretation_context(InterpretationType.BOOLEAN):
+        assert failure_mask(darapti.code) == REASON_BITS[EXISTENTIAL_FALLACY]
+    forms = [Syllogism.from_name("AAA-1"), darapti.code]
+    assert explain_many(forms, InterpretationType.BOOLEAN) == [(), reasons_for_mask(REASON_BITS[EXISTENTIAL_FALLACY])]
+    # 预先计算的原因元组被共享
+    assert explain(darapti, InterpretationType.BOOLEAN) is explain(darapti.code, InterpretationType.BOOLEAN)
+
+def test_argument():
+    """测试具体论证的原因使用词项标签"""
+    print("\n=== 测试具体论证 ===")
+    argument = Argument(
+        make_proposition(A, "狗", "动物"),
+        make_proposition(A, "猫", "动物"),
+        make_proposition(A, "猫", "狗"),
+    )
+    form, reasons = explain_argument(argument)
+    print(f"  {form.get_figure_and_mood()}: {[reason.message for reason in reasons]}")
+    assert [reason.terms for reason in reasons] == [("动物",)]
+    assert "动物" in reasons[0].message
+
+    valid = Argument(make_proposition(A, "哺乳动物", "动物"), make_proposition(A, "狗", "哺乳动物"),
+                     make_proposition(A, "狗", "动物"))
+    assert explain_argument(valid)[1] == ()
+    try:
+        explain_argument(Argument(valid.major, valid.minor, make_proposition(A, "猫", "鱼")))
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+if __name__ == "__main__":
+    test_matches_rules()
+    test_split_reasons()
+    test_interpretation()
+    test_argument()
+    print("\n✓ 所有测试完成!")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+测试扩展三段论
+"""
+
+from itertools import product
+
+from syllogism import Syllogism
+from config import InterpretationType
+from validity_table import is_valid_form
+from extended_syllogism import (
+    ExtendedSyllogism, ExtendedProposition, Quantifier, parse_quantifier, at_least,
+    is_valid_extended, validate_extended_many, validate_extended_space, all_extended_forms,
+    extended_form_count, canonical_key, satisfiable, search_bound, quantifiers, MOST, MAX_COUNT,
+)
+
+def _regions(term):
+    negated = term.startswith("non-")
+    bit = "SMP".index(term[4:] if negated else term)
+    return [region for region in range(8) if (region >> bit & 1) != negated]
+
+def _holds(proposition, counts):
+    """直接按区域计数判断命题真假"""
+    subject, predicate = set(_regions(proposition.subject)), set(_regions(proposition.predicate))
+    both = sum(counts[region] for region in subject & predicate)
+    subject_only = sum(counts[region] for region in subject - predicate)
+    kind, count = proposition.quantifier
+    return {"A": subject_only == 0, "E": both == 0, "I": both > 0, "O": subject_only > 0,
+            "MOST": both > subject_only, "AT_LEAST": both >= count}[kind]
+
+def test_standard_forms():
+    """测试标准形式的结果与有效性表一致"""
+    print("=== 测试标准形式 ===")
+    for interp in InterpretationType:
+        for syl in Syllogism.all_forms():
+            assert is_valid_extended(ExtendedSyllogism.from_syllogism(syl), interp) == is_valid_form(syl, interp)
+    print("  ✓ 256种形式与有效性表一致")
+
+def test_complements_and_quantifiers():
+    """测试补项和广义量词"""
+    print("\n=== 测试补项和广义量词 ===")
+    cases = [
+        ("M A non-P; S A M; S E P", True, True),
+        ("non-M A P; non-S A M; S I P", True, False),
+        ("M MOST P; M MOST S; S I P", True, True),
+        ("M MOST P; M A S; S MOST P", False, False),
+        ("M AT_LEAST_2 P; M A S; S AT_LEAST_2 P", True, True),
+        ("M MOST P; S AT_LEAST_2 M; S I P", False, False),
+        ("M A P; S AT_LEAST_3 M; S AT_LEAST_2 P", True, True),
+    ]
+    for text, aristotelian, boolean in cases:
+        results = (is_valid_extended(text, InterpretationType.ARISTOTELIAN),
+                   is_valid_extended(text, InterpretationType.BOOLEAN))
+        print(f"  {text}: {results}")
+        assert results == (aristotelian, boolean)
+
+    # 换质和补项翻转得到的形式共享规范形式
+    first = ExtendedSyllogism.from_text("M E P; S A M; S E P")
+    second = ExtendedSyllogism.from_text("non-M A non-P; S A non-M; S A non-P")
+    assert canonical_key(first, InterpretationType.BOOLEAN) == canonical_key(second, InterpretationType.BOOLEAN)
+
+def test_matches_brute_force():
+    """测试在小计数模型中找到反模型的形式都判为无效"""
+    print("\n=== 测试与穷举模型一致 ===")
+    models = list(product(range(3), repeat=8))
+    cache = {}
+
+    def satisfied(proposition):
+        """命题成立的模型集合(位集)"""
+        if proposition not in cache:
+            cache[proposition] = sum(1 << index for index, counts in enumerate(models)
+                                     if _holds(proposition, counts))
+        return cache[proposition]
+
+    nonempty = {term: sum(1 << index for index, counts in enumerate(models)
+                          if sum(counts[region] for region in _regions(term)))
+                for term in ("S", "M", "P", "non-S", "non-M", "non-P")}
+    forms = list(all_extended_forms(2))[::13]
+    found = 0
+    for interp in InterpretationType:
+        for syl in forms:
+            countermodels = satisfied(syl.major) & satisfied(syl.minor) & ~satisfied(syl.conclusion)
+            if interp == InterpretationType.ARISTOTELIAN:
+                for proposition in syl:
+                    countermodels &= nonempty[proposition.subject] & nonempty[proposition.predicate]
+            # 计数不超过2的模型中找到反模型，形式必定无效
+            if countermodels:
+                found += 1
+                assert not is_valid_extended(syl, interp), syl
+    print(f"  ✓ {len(forms)}个形式, {found}次找到反模型")
+
+def test_search_bound():
+    """测试搜索上界足够大"""
+    print("\n=== 测试搜索上界 ===")
+    for text in ("M MOST P; S AT_LEAST_3 M; S I P", "M AT_LEAST_3 P; M MOST S; S AT_LEAST_2 P",
+                 f"M AT_LEAST_{MAX_COUNT} P; M MOST S; S AT_LEAST_2 P"):
+        syl = ExtendedSyllogism.from_text(text)
+        for interp in InterpretationType:
+            key = canonical_key(syl, interp)
+            assert satisfiable(key) == satisfiable(key, 5 * MAX_COUNT)
+            assert search_bound(key) >= 2
+
+    # 上界只在n不超过MAX_COUNT时验证过，超出范围的量词被拒绝
+    for call in (lambda: parse_quantifier(f"AT_LEAST_{MAX_COUNT + 1}"),
+                 lambda: quantifiers(MAX_COUNT + 1),
+                 lambda: is_valid_extended(ExtendedSyllogism(
+                     ExtendedProposition(Quantifier("AT_LEAST", MAX_COUNT + 1), "M", "P"),
+                     ExtendedProposition(Quantifier("A", 0), "S", "M"),
+                     ExtendedProposition(Quantifier("I", 0), "S", "P")))):
+        try:
+            call()
+            assert False, "应该抛出异常"
+        except ValueError as e:
+            print(f"正确捕获错误: {e}")
+
+def test_parsing_and_arguments():
+    """测试解析和具体论证"""
+    print("\n=== 测试解析 ===")
+    assert parse_quantifier("most") == Quantifier(MOST, 0)
+    assert parse_quantifier("AT_LEAST_1") == Quantifier("I", 0)
+    assert str(ExtendedProposition(at_least(2), "S", "non-M")) == "S AT_LEAST_2 non-M"
+
+    first = ExtendedProposition.parse("dogs A non-reptiles")
+    second = ExtendedProposition.parse("poodles A dogs")
+    conclusion = ExtendedProposition.parse("poodles E reptiles")
+    syl = ExtendedSyllogism.from_argument(second, first, conclusion)
+    assert str(syl) == "M A non-P; S A M; S E P"
+    assert is_valid_extended(syl, InterpretationType.BOOLEAN)
+
+    for bad in ("S FEW M; M A P; S A P", "M A P; S A M", "M A M; S A M; S A P", "M A P; S A Q; S A P"):
+        try:
+            is_valid_extended(bad)
+            assert False, "应该抛出异常"
+        except ValueError as e:
+            print(f"正确捕获错误: {e}")
+
+def test_space():
+    """测试枚举和批量接口"""
+    print("\n=== 测试枚举 ===")
+    summary = validate_extended_space(2, InterpretationType.BOOLEAN)
+    print(f"  {summary['total']} 种形式, 有效 {summary['valid']} 种, 规范形式 {summary['canonical']} 种")
+    assert summary["total"] == extended_form_count(2) == 48 * 48 * 24
+    assert summary["canonical"] < summary["total"] // 10
+    forms = list(all_extended_forms(2))[:500]
+    assert validate_extended_many(forms, InterpretationType.BOOLEAN) == [
+        syl in set(summary["valid_forms"]) for syl in forms]
+
+if __name__ == "__main__":
+    test_standard_forms()
+    test_complements_and_quantifiers()
+    test_matches_brute_force()
+    test_search_bound()
+    test_parsing_and_arguments()
+    test_space()
+    print("\n✓ 所有测试完成!")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+测试有效形式的倒排索引
+"""
+
+from itertools import product
+
+from syllogism import Syllogism, PropositionType
+from config import InterpretationType
+from validation_rules import is_valid_syllogism
+from form_index import query
+
+def test_matches_brute_force():
+    """测试索引结果与逐个筛选一致"""
+    print("=== 测试倒排索引 ===")
+    types = [None] + list(PropositionType)
+    for interp in InterpretationType:
+        valid = [syl for syl in Syllogism.all_forms() if is_valid_syllogism(syl, interpretation=interp)]
+        for major, minor, conclusion, figure in product(types, types, types, [None, 1, 2, 3, 4]):
+            expected = tuple(syl for syl in valid
+                             if major in (None, syl.major_type) and minor in (None, syl.minor_type)
+                             and conclusion in (None, syl.conclusion_type) and figure in (None, syl.figure))
+            assert query(major, minor, conclusion, figure, interpretation=interp) == expected
+        print(f"  {interp.value}: 全部 {len(query(interpretation=interp))} 个有效形式")
+
+def test_query_examples():
+    """测试查询示例"""
+    print("\n=== 测试查询示例 ===")
+    forms = query(major="A", minor="E", figure=2, interpretation=InterpretationType.BOOLEAN)
+    assert [syl.get_figure_and_mood() for syl in forms] == ["AEE-2"]
+    assert query(major="I", minor="I", interpretation=InterpretationType.ARISTOTELIAN) == ()
+
+    for kwargs in [{"major": "X"}, {"figure": 5}]:
+        try:
+            query(**kwargs)
+            assert False, "应该抛出异常"
+        except ValueError as e:
+            print(f"正确捕获错误: {e}")
+
+if __name__ == "__main__":
+    test_matches_brute_force()
+    test_query_examples()
+    print("\n✓ 所有测试完成!")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+测试直接推理与化归
+"""
+
+from itertools import product
+
+from syllogism import Syllogism, PropositionType, Proposition
+from config import InterpretationType
+from validity_table import is_valid_form
+from immediate_inference import (
+    immediate_consequences, consequences_many, derivation, convert, obvert, contrapose, complement,
+    reduce_form, reduce_many, canonical_code, canonical_codes_many, OBVERSION, CONVERSION,
+)
+
+A, E, I, O = PropositionType.A, PropositionType.E, PropositionType.I, PropositionType.O
+TERMS = ("S", "non-S", "P", "non-P")
+
+def _holds(proposition, regions):
+    """在模型中判断命题真假，regions为非空的(属于S, 属于P)区域集合"""
+    def members(term):
+        index = 0 if term.endswith("S") else 1
+        positive = not term.startswith("non-")
+        return {region for region in regions if region[index] == positive}
+    subject, predicate = members(proposition.subject), members(proposition.predicate)
+    return {A: subject <= predicate, E: not subject & predicate,
+            I: bool(subject & predicate), O: bool(subject - predicate)}[proposition.type]
+
+def _models(interpretation):
+    """全部模型；亚里士多德解释下每个词项及其补项都非空"""
+    models = []
+    for flags in product((False, True), repeat=4):
+        regions = {region for region, flag in zip(product((True, False), repeat=2), flags) if flag}
+        if interpretation == InterpretationType.ARISTOTELIAN:
+            if not all(any(region[index] == value for region in regions)
+                       for index in (0, 1) for value in (True, False)):
+                continue
+        models.append(regions)
+    return models
+
+def test_closure_matches_semantics():
+    """测试闭包恰好是语义上的必真、必假命题"""
+    print("=== 测试直接推理闭包 ===")
+    propositions = [Proposition(prop_type, subject, predicate)
+                    for prop_type in (A, E, I, O) for subject in TERMS for predicate in TERMS
+                    if subject[-1] != predicate[-1]]
+    for interp in InterpretationType:
+        models = _models(interp)
+        for proposition in propositions:
+            result = immediate_consequences(proposition, interp)
+            assert result.true[0] == proposition
+            satisfying = [m for m in models if _holds(proposition, m)]
+            entailed = {q for q in propositions if all(_holds(q, m) for m in satisfying)}
+            excluded = {q for q in propositions if not any(_holds(q, m) for m in satisfying)}
+            assert set(result.true) == entailed, (interp, proposition)
+            assert set(result.false) == excluded, (interp, proposition)
+        print(f"  ✓ {interp.value}: 32个命题与模型语义一致")
+
+def test_single_operations():
+    """测试换位、换质、换质位"""
+    print("\n=== 测试单步推理 ===")
+    assert complement("P") == "non-P" and complement("non-P") == "P"
+    assert obvert(Proposition(A, "S", "P")) == Proposition(E, "S", "non-P")
+    assert obvert(Proposition(O, "S", "non-P")) == Proposition(I, "S", "P")
+    assert convert(Proposition(I, "S", "P")) == Proposition(I, "P", "S")
+    assert convert(Proposition(A, "S", "P"), InterpretationType.ARISTOTELIAN) == Proposition(I, "P", "S")
+    assert convert(Proposition(A, "S", "P"), InterpretationType.BOOLEAN) is None
+    assert convert(Proposition(O, "S", "P"), InterpretationType.ARISTOTELIAN) is None
+    assert contrapose(Proposition(A, "S", "P")) == Proposition(A, "non-P", "non-S")
+    assert contrapose(Proposition(E, "S", "P"), InterpretationType.ARISTOTELIAN) == Proposition(O, "non-P", "non-S")
+    assert contrapose(Proposition(I, "S", "P"), InterpretationType.ARISTOTELIAN) is None
+
+    steps = derivation(Proposition(A, "dogs", "animals"), Proposition(E, "non-animals", "dogs"),
+                       InterpretationType.BOOLEAN)
+    print(f"  {[(operation, str(result)) for operation, result in steps]}")
+    assert [operation for operation, _ in steps] == [OBVERSION, CONVERSION]
+    assert derivation(Proposition(A, "S", "P"), Proposition(I, "S", "P"), InterpretationType.BOOLEAN) is None
+
+    try:
+        immediate_consequences(Proposition(A, "S", "non-S"))
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+def test_reduction():
+    """测试化归到第一格"""
+    print("\n=== 测试化归 ===")
+    for interp in InterpretationType:
+        for syl in Syllogism.all_forms():
+            reduction = reduce_form(syl, interp)
+            if not is_valid_form(syl, interp):
+                assert reduction is None and canonical_code(syl, interp) is None
+                continue
+            assert reduction.form is syl
+            assert reduction.canonical.figure == 1 and is_valid_form(reduction.canonical, interp)
+            assert canonical_code(syl.code, interp) == reduction.canonical.code
+            assert bool(reduction.steps) == (syl.figure != 1)
+
+    cases = [("EAE-2", "Cesare", "EAE-1"), ("AOO-2", "Baroco", "AAA-1"), ("OAO-3", "Bocardo", "AAA-1"),
+             ("AAI-4", "Bramantip", "AAA-1"), ("EAO-3", "Felapton", "EIO-1"), ("IAI-4", "Dimaris", "AII-1")]
+    for name, mnemonic, canonical in cases:
+        reduction = reduce_form(Syllogism.from_name(name), InterpretationType.ARISTOTELIAN)
+        print(f"  {name} ({reduction.name}) -> {reduction.canonical.get_figure_and_mood()}")
+        assert reduction.name == mnemonic
+        assert reduction.canonical.get_figure_and_mood() == canonical
+    assert reduce_form(Syllogism.from_name("AAI-4"), InterpretationType.BOOLEAN) is None
+
+def test_batch():
+    """测试批量接口与逐个查询一致"""
+    print("\n=== 测试批量接口 ===")
+    forms = Syllogism.all_forms()
+    for interp in InterpretationType:
+        assert reduce_many(forms, interp) == [reduce_form(syl, interp) for syl in forms]
+        assert canonical_codes_many(range(256), interp) == [canonical_code(code, interp) for code in range(256)]
+    propositions = [Proposition(E, "S", "P"), Proposition(O, "non-M", "P")]
+    assert consequences_many(propositions, InterpretationType.BOOLEAN) == [
+        immediate_consequences(proposition, InterpretationType.BOOLEAN) for proposition in propositions]
+
+if __name__ == "__main__":
+    test_closure_matches_semantics()
+    test_single_operations()
+    test_reduction()
+    test_batch()
+    print("\n✓ 所有测试完成!")
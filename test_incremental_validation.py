@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+测试增量验证
+"""
+
+import numpy as np
+
+from syllogism import Syllogism
+from config import InterpretationType, track_interpretation_reads, is_boolean, get_interpretation
+from rule_checker import SyllogismChecker
+from validity_table import is_valid_form
+from validation_rules import get_all_validation_rules, apply_all_rules
+from result_store import ResultStore, form_records
+from incremental_validation import IncrementalValidator
+
+def _first_figure(syl):
+    return syl.figure == 1
+
+def test_matches_checker():
+    """测试缓存结果与逐条运行规则一致"""
+    print("=== 测试缓存结果 ===")
+    validator = IncrementalValidator()
+    for interp in InterpretationType:
+        for syl in Syllogism.all_forms():
+            assert validator.check(syl, interp) == apply_all_rules(syl, interpretation=interp)
+            assert validator.is_valid(syl, interp) == is_valid_form(syl, interp)
+    assert (validator.form_table() == form_records()).all()
+
+    # 只有两条规则读取解释，其余规则每种形式只运行一次
+    assert validator.evaluations == 256 * 5 + 256 * 2
+    barbara = Syllogism.from_name("AAA-1")
+    assert [name for name, reads in validator.dependencies(barbara).items() if reads] == [
+        "否定前提否定结论", "存在性假设规则"]
+
+    changes = validator.interpretation_changes(InterpretationType.BOOLEAN, InterpretationType.ARISTOTELIAN)
+    assert sorted(Syllogism.from_code(code).get_figure_and_mood() for code in changes) == sorted(
+        syl.get_figure_and_mood() for syl in Syllogism.all_forms()
+        if is_valid_form(syl, InterpretationType.BOOLEAN) != is_valid_form(syl, InterpretationType.ARISTOTELIAN))
+
+def test_sync_reevaluates_changed_rules():
+    """测试规则变化后只重新运行受影响的规则"""
+    print("\n=== 测试同步 ===")
+    checker = SyllogismChecker()
+    for rule_name, rule_func in get_all_validation_rules():
+        checker.add_rule(rule_name, rule_func)
+    validator = IncrementalValidator(checker)
+    assert validator.sync() == []
+
+    before = validator.evaluations
+    checker.add_rule("第一格", _first_figure)
+    changed = validator.sync()
+    print(f"  新增规则: {validator.evaluations - before}次运行, {len(changed)}个单元改变")
+    assert validator.evaluations - before == 256
+    assert all(Syllogism.from_code(code).figure != 1 and is_valid_form(Syllogism.from_code(code), interp)
+               for interp, code in changed)
+
+    # 同名规则以最后注册的为准，只重新运行被替换的规则
+    before = validator.evaluations
+    checker.add_rule("第一格", lambda syl: True)
+    assert validator.sync() == changed
+    assert validator.evaluations - before == 256
+
+    checker.remove_rule("第一格")
+    assert validator.sync() == []
+    assert validator.evaluations - before == 256
+
+def test_interpretation_tracking():
+    """测试解释读取的统计"""
+    print("\n=== 测试解释读取统计 ===")
+    with track_interpretation_reads() as reads:
+        get_interpretation()
+        is_boolean(InterpretationType.ARISTOTELIAN)
+    assert reads.count == 2
+    with track_interpretation_reads() as reads:
+        Syllogism.from_name("AAA-1").figure
+    assert reads.count == 0
+
+    # 规则异常记录为错误信息，并算作失败
+    checker = SyllogismChecker()
+    checker.add_rule("出错", lambda syl: 1 / 0)
+    validator = IncrementalValidator(checker)
+    assert validator.check(Syllogism.from_code(0), InterpretationType.BOOLEAN)["出错"].startswith("错误")
+    for interp in InterpretationType:
+        assert not any(validator.verdicts(interp))
+    table = validator.form_table()
+    assert (table["valid"] == 0).all() and (table["failures"] == 1).all()
+
+def test_push_to_store(tmp_path):
+    """测试把新结论写回存储"""
+    print("\n=== 测试写回存储 ===")
+    store = ResultStore(tmp_path / "store")
+    codes = np.tile(np.arange(256, dtype=np.uint8), 4)
+    store.append(np.arange(len(codes)), codes, chunk_records=256)
+    store.append([5000], [Syllogism.from_name("AAA-1").code])  # 只含第一格形式的块不会被改写
+
+    checker = SyllogismChecker()
+    for rule_name, rule_func in get_all_validation_rules():
+        checker.add_rule(rule_name, rule_func)
+    validator = IncrementalValidator(checker)
+    assert validator.push(store) == {"forms": 0, "chunks": 0, "records": 0}
+
+    checker.add_rule("第一格", _first_figure)
+    validator.sync()
+    summary = validator.push(store)
+    print(f"  {summary}")
+    assert summary == {"forms": 192, "chunks": 4, "records": 768}
+    store.close()
+
+    reopened = ResultStore(tmp_path / "store")
+    assert reopened.rules[-1] == "第一格"
+    for interp in InterpretationType:
+        counts = reopened.form_counts(interp)
+        assert counts[1].sum() == 4 * sum(validator.verdicts(interp)) + 1
+    record = reopened.lookup(256 + Syllogism.from_name("EAE-2").code)
+    assert record["valid"] == 0 and record["failures"].tolist() == [32, 32]
+    assert reopened.lookup(256 + Syllogism.from_name("AAA-1").code)["valid"] == 3
+
+    # 之后写入的记录使用新的形式表
+    reopened.append([6000], [Syllogism.from_name("EAE-2").code])
+    assert reopened.lookup(6000)["failures"].tolist() == [32, 32]
+
+    for index in range(4):
+        checker.add_rule(f"规则{index}", _first_figure)
+    validator.sync()
+    try:
+        validator.push(reopened)
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_matches_checker()
+    test_sync_reevaluates_changed_rules()
+    test_interpretation_tracking()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_push_to_store(Path(tmp))
+    print("\n✓ 所有测试完成!")
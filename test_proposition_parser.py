@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+测试自然语言命题解析
+"""
+
+from syllogism import PropositionType
+from argument import Argument, normalize
+from proposition_parser import parse_sentence, parse_argument, parse_arguments
+
+A, E, I, O = PropositionType.A, PropositionType.E, PropositionType.I, PropositionType.O
+
+def test_sentences():
+    """测试各种句式"""
+    print("=== 测试句式 ===")
+    cases = {
+        "All dogs are mammals.": (A, "dogs", "mammals"),
+        "Every man is mortal": (A, "man", "mortal"),
+        "No  Cats are DOGS": (E, "cats", "dogs"),
+        "Some cats are not black.": (O, "cats", "black"),
+        "some birds are pets": (I, "birds", "pets"),
+        "Therefore, some cats are black": (I, "cats", "black"),
+        "So no fish are birds": (E, "fish", "birds"),
+        "所有狗都是哺乳动物。": (A, "狗", "哺乳动物"),
+        "所有狗都不是猫": (E, "狗", "猫"),
+        "没有鸟是鱼": (E, "鸟", "鱼"),
+        "有些猫不是黑色的": (O, "猫", "黑色的"),
+        "所以有的学生是运动员": (I, "学生", "运动员"),
+    }
+    for sentence, expected in cases.items():
+        proposition = parse_sentence(sentence)
+        print(f"  {sentence} => {proposition}")
+        assert tuple(proposition) == expected
+
+    for sentence in ["Solar panels are cheap", "All dogs are not cats", "Some cats", "猫是动物", ""]:
+        try:
+            parse_sentence(sentence)
+            assert False, "应该抛出异常"
+        except ValueError as e:
+            print(f"正确捕获错误: {e}")
+
+def test_interned_terms():
+    """测试词项驻留与缓存"""
+    print("\n=== 测试词项驻留 ===")
+    first = parse_sentence("All dogs are mammals")
+    second = parse_sentence("Some DOGS are not pets")
+    assert first.subject is second.subject
+    assert parse_sentence("All dogs are mammals") is first
+
+def test_arguments():
+    """测试论证解析"""
+    print("\n=== 测试论证解析 ===")
+    argument = parse_argument("所有哺乳动物都是动物。所有狗都是哺乳动物。所以所有狗都是动物。")
+    assert isinstance(argument, Argument)
+    assert normalize(argument).get_figure_and_mood() == "AAA-1"
+
+    lines = [
+        "No reptiles are mammals.",
+        "Some pets are reptiles.",
+        "Therefore some pets are not mammals.",
+        "",
+        "",
+        "All dogs are mammals. Some cats are black.",
+        "",
+        "Cats meow. All cats are pets. Some pets are cats.",
+    ]
+    results = list(parse_arguments(lines))
+    assert len(results) == 3
+    assert normalize(results[0]).get_figure_and_mood() == "EIO-1"
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], ValueError)
+    print(f"正确捕获错误: {results[1]}")
+
+if __name__ == "__main__":
+    test_sentences()
+    test_interned_terms()
+    test_arguments()
+    print("\n✓ 所有测试完成!")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+测试有效形式报告的渲染
+"""
+
+import contextlib
+import csv
+import io
+import json
+
+from syllogism import Syllogism
+from config import InterpretationType
+from validity_table import is_valid_form
+from result_renderer import RENDER_FORMATS, render_report, write_report
+import validate_all
+
+BOTH = (InterpretationType.ARISTOTELIAN, InterpretationType.BOOLEAN)
+
+def _legacy_text(interp):
+    """逐个print的原始输出"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        print(f"使用 {'亚里士多德解释' if interp == InterpretationType.ARISTOTELIAN else '布尔解释'}")
+        print("生成了 256 种三段论组合")
+        valid = [syl for syl in Syllogism.all_forms() if is_valid_form(syl, interp)]
+        print(f"\n找到 {len(valid)} 个有效的三段论:")
+        for i, syl in enumerate(valid, 1):
+            print(f"\n=== 有效三段论 {i} ===")
+            print(syl)
+    return output.getvalue()
+
+def test_text_matches_legacy_output():
+    """测试文本格式与原来的输出相同"""
+    print("=== 测试文本格式 ===")
+    for interp in BOTH:
+        assert render_report([interp]) == _legacy_text(interp)
+    both = render_report(BOTH)
+    assert both.startswith("=== 比较两种解释的结果 ===\n\n1. 亚里士多德解释:\n使用 亚里士多德解释\n")
+    assert "\n" + "=" * 50 + "\n\n2. 布尔解释:\n" + _legacy_text(InterpretationType.BOOLEAN) in both
+    assert "验证后端: venn\n" in render_report([InterpretationType.BOOLEAN], "venn")
+
+def test_structured_formats():
+    """测试JSON、CSV和编码格式"""
+    print("\n=== 测试结构化格式 ===")
+    expected = {interp: [syl for syl in Syllogism.all_forms() if is_valid_form(syl, interp)] for interp in BOTH}
+
+    document = json.loads(render_report(BOTH, output_format="json"))
+    for interp, forms in expected.items():
+        section = document["interpretations"][interp.value]
+        assert section["count"] == len(forms)
+        assert [form["code"] for form in section["forms"]] == [syl.code for syl in forms]
+    assert document["interpretations"]["aristotelian"]["forms"][0] == {
+        "form": "AAA-1", "code": 1, "premises": ["M A P", "S A M"], "conclusion": "S A P"}
+
+    rows = list(csv.DictReader(io.StringIO(render_report(BOTH, output_format="csv"))))
+    assert len(rows) == 24 + 15
+    assert rows[-1]["interpretation"] == "boolean" and rows[0]["major"] == "M A P"
+
+    codes = render_report([InterpretationType.BOOLEAN], output_format="codes").split()
+    assert codes == [str(syl.code) for syl in expected[InterpretationType.BOOLEAN]]
+    assert render_report(BOTH, output_format="codes").splitlines()[-1].endswith("\tboolean")
+    assert render_report(BOTH, output_format="quiet") == "亚里士多德解释: 24 个有效的三段论\n布尔解释: 15 个有效的三段论\n"
+
+    try:
+        render_report(BOTH, output_format="xml")
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+def test_write_report(tmp_path):
+    """测试写出到流和文件"""
+    print("\n=== 测试写出 ===")
+    for output_format in RENDER_FORMATS:
+        stream = io.StringIO()
+        assert write_report(BOTH, output_format=output_format, stream=stream) == len(stream.getvalue())
+
+    path = tmp_path / "report.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        validate_all.compare_main(output_format="csv", stream=f)
+    assert path.read_text(encoding="utf-8") == render_report(BOTH, output_format="csv")
+
+    # 标准输出被替换时写入替换后的对象
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        validate_all.main(InterpretationType.BOOLEAN, output_format="quiet")
+    assert output.getvalue() == "布尔解释: 15 个有效的三段论\n"
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_text_matches_legacy_output()
+    test_structured_formats()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_write_report(Path(tmp))
+    print("\n✓ 所有测试完成!")
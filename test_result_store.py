@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+测试验证结果存储
+"""
+
+import json
+
+import numpy as np
+
+from syllogism import Syllogism
+from config import InterpretationType
+from validity_table import is_valid_form
+from result_store import ResultStore, build_store, main, RECORD_DTYPE
+
+def test_append_and_lookup(tmp_path):
+    """测试追加写入和按ID查找"""
+    print("=== 测试追加和查找 ===")
+    store = ResultStore(tmp_path / "store")
+    ids = np.arange(5000, dtype=np.uint64)[::-1] * 3
+    codes = (np.arange(5000) % 256).astype(np.uint8)
+    assert store.append(ids, codes, chunk_records=2000) == 3
+    assert store.chunk_count == 3 and len(store) == 5000
+    assert RECORD_DTYPE.itemsize == 12
+
+    record = store.lookup(int(ids[10]))
+    syl = Syllogism.from_code(int(codes[10]))
+    assert record["code"] == codes[10]
+    assert bool(record["valid"] & 1) == is_valid_form(syl, InterpretationType.ARISTOTELIAN)
+    assert bool(record["valid"] & 2) == is_valid_form(syl, InterpretationType.BOOLEAN)
+    assert store.lookup(1) is None and store.lookup(10 ** 9) is None
+
+    # 后写入的块覆盖先前的结果，同一块内重复的ID保留最后一条
+    store.append([0, 7, 0], [0, 1, 2])
+    assert store.lookup(0)["code"] == 2
+    assert store.chunk(3)["id"].tolist() == [0, 7]
+
+    # 超出uint64范围的ID查不到
+    assert store.lookup(-5) is None and store.lookup(1 << 64) is None
+    records, found = store.lookup_many([-5, 0, 1 << 64])
+    assert found.tolist() == [False, True, False] and records["code"][1] == 2
+
+    # 少量ID逐个查找，大量ID整块查找
+    for wanted in ([ids[3]], [1], list(ids[:3000]) + [7, 1]):
+        records, found = store.lookup_many(wanted)
+        expected = [store.lookup(int(record_id)) for record_id in wanted]
+        assert found.tolist() == [record is not None for record in expected]
+        assert [int(r["code"]) for r, f in zip(records, found) if f] == [
+            int(record["code"]) for record in expected if record is not None]
+
+    for ids, codes, chunk_records in (([1, 2], [3], 10), ([1], [3], 0)):
+        try:
+            store.append(ids, codes, chunk_records)
+            assert False, "应该抛出异常"
+        except ValueError as e:
+            print(f"正确捕获错误: {e}")
+
+def test_aggregate_skips_superseded(tmp_path):
+    """测试汇总时每个ID只计算最后写入的记录"""
+    print("\n=== 测试覆盖后的汇总 ===")
+    store = ResultStore(tmp_path / "store")
+    aaa_1, eae_1 = Syllogism.from_name("AAA-1").code, Syllogism.from_name("EAE-1").code
+    store.append(np.arange(100), np.full(100, aaa_1))
+    store.append(np.arange(200, 300), np.full(100, aaa_1))  # ID范围不重叠
+    store.append([5, 6, 250], [eae_1] * 3)
+    summary = store.aggregate_by_form(InterpretationType.BOOLEAN)
+    assert summary == {"AAA-1": {"total": 197, "valid": 197}, "EAE-1": {"total": 3, "valid": 3}}
+    store.append([5], [Syllogism.from_name("AAA-2").code])
+    summary = store.aggregate_by_form(InterpretationType.BOOLEAN)
+    assert summary["EAE-1"]["total"] == 2 and summary["AAA-2"] == {"total": 1, "valid": 0}
+    assert sum(counts["total"] for counts in summary.values()) == 200
+
+def test_aggregate_and_reopen(tmp_path):
+    """测试重新打开后按格和式汇总"""
+    print("\n=== 测试汇总 ===")
+    path = tmp_path / "store"
+    store = ResultStore(path)
+    store.append(np.arange(512), np.tile(np.arange(256), 2))
+    store.close()
+
+    reopened = ResultStore(path)
+    for interp in InterpretationType:
+        summary = reopened.aggregate_by_form(interp)
+        assert len(summary) == 256
+        for name, counts in summary.items():
+            assert counts["total"] == 2
+            assert counts["valid"] == (2 if is_valid_form(Syllogism.from_name(name), interp) else 0)
+
+    manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+    manifest["dtype"] = [["id", "<u4"]]
+    (path / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+    try:
+        ResultStore(path)
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+def test_build_from_corpus(tmp_path):
+    """测试从语料文件建立存储"""
+    print("\n=== 测试建立存储 ===")
+    corpus = tmp_path / "corpus.jsonl"
+    lines = [{"id": 10, "form": "AAA-1"}, {"id": 11, "form": "AAI-1"}, {"id": -1, "form": "AAA-1"},
+             {"form": "EAE-1"}, {"id": 12, "form": "AAA-9"}, {"id": 1 << 64, "form": "AAA-1"},
+             {"id": 1.7, "form": "AAA-1"}, {"id": True, "form": "AAA-1"}, {"id": "13", "form": "AAA-1"},
+             {"id": (1 << 64) - 1, "form": "AAA-1"}]
+    corpus.write_text("\n".join(json.dumps(line) for line in lines) + "\n", encoding="utf-8")
+    summary = build_store(corpus, tmp_path / "store")
+    print(f"  {summary}")
+    assert summary == {"written": 5, "errors": 5, "chunks": 1}
+
+    store = ResultStore(tmp_path / "store")
+    assert store.lookup(4)["code"] == Syllogism.from_name("EAE-1").code  # 没有id时使用行号
+    assert store.lookup(11)["failures"].tolist() == [0, 16]
+    assert main(["stats", str(tmp_path / "store"), "--interpretation", "boolean"]) == 0
+    assert store.lookup(13) is not None and store.lookup((1 << 64) - 1) is not None
+    assert main(["lookup", str(tmp_path / "store"), "11", "99", "-5"]) == 0
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_append_and_lookup(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_aggregate_skips_superseded(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_aggregate_and_reopen(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_build_from_corpus(Path(tmp))
+    print("\n✓ 所有测试完成!")
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+测试规则检查器模块
+"""
+
+import json
+
+from syllogism import Syllogism, PropositionType
+from config import InterpretationType
+from rule_checker import SyllogismChecker, CompiledChecker, rule_passed
+from validation_rules import apply_all_rules, compile_validation_rules, get_all_validation_rules, is_valid_syllogism
+from validity_table import lookup_validity
+
+def test_reused_checker_does_not_grow():
+    """测试重复使用检查器时规则不会重复添加"""
+    print("=== 测试重复使用检查器 ===")
+    checker = SyllogismChecker()
+    syl = Syllogism.from_code(1)
+    for _ in range(3):
+        apply_all_rules(syl, checker)
+    print(f"  规则数量: {len(checker.rules)}")
+    assert len(checker.rules) == len(get_all_validation_rules())
+
+def test_compiled_matches_table():
+    """测试编译后的is_valid与有效性表一致"""
+    print("\n=== 测试编译后的检查器 ===")
+    compiled = compile_validation_rules()
+    print(f"  规则顺序: {compiled.rule_order}")
+    for interp in InterpretationType:
+        for syl in Syllogism.all_forms():
+            assert compiled.is_valid(syl, interp) == lookup_validity(syl.code, interp)
+            report = compiled.check(syl, interp)
+            assert list(report) == [name for name, _ in get_all_validation_rules()]
+            assert all(report.values()) == lookup_validity(syl.code, interp)
+
+def test_rule_order_and_short_circuit():
+    """测试按拒绝率排序并在第一条失败规则处停止"""
+    print("\n=== 测试规则排序 ===")
+    calls = []
+
+    def rarely_fails(syl):
+        calls.append("rarely")
+        return syl.code != 0
+
+    def often_fails(syl):
+        calls.append("often")
+        return syl.major_type == PropositionType.A
+
+    checker = SyllogismChecker()
+    checker.add_rule("很少失败", rarely_fails)
+    checker.add_rule("经常失败", often_fails)
+    compiled = checker.compile()
+    assert compiled.rule_order == ("经常失败", "很少失败")
+
+    calls.clear()
+    e_form = Syllogism(PropositionType.E, PropositionType.A, PropositionType.E, 0, 1)
+    assert compiled.is_valid(e_form) == False
+    assert calls == ["often"]
+
+    # 编译后再添加的规则不影响已编译的检查器
+    checker.add_rule("全部失败", lambda syl: False)
+    assert len(compiled.rules) == 2
+
+def test_rule_exception():
+    """测试规则异常: check记录错误信息，is_valid直接抛出"""
+    print("\n=== 测试规则异常 ===")
+    def broken(syl):
+        raise RuntimeError("规则出错")
+
+    compiled = CompiledChecker([("出错规则", broken)])
+    syl = Syllogism.from_code(1)
+    print(f"  check结果: {compiled.check(syl)}")
+    assert compiled.check(syl)["出错规则"].startswith("错误")
+    try:
+        compiled.is_valid(syl)
+        assert False, "应该抛出异常"
+    except RuntimeError as e:
+        print(f"正确捕获错误: {e}")
+
+    # 真值表把规则异常当作失败
+    checker = SyllogismChecker()
+    checker.add_rule("除零", lambda syl: 1 / 0)
+    table = checker.compile_table()
+    assert table.check(syl, InterpretationType.BOOLEAN)["除零"].startswith("错误")
+    assert not any(table.is_valid(form, interp) for interp in InterpretationType for form in Syllogism.all_forms())
+    assert not rule_passed(checker.check(syl)["除零"])
+    assert not is_valid_syllogism(syl, checker)
+
+def test_instrumentation():
+    """测试规则统计"""
+    print("\n=== 测试规则统计 ===")
+    checker = SyllogismChecker()
+    checker.add_rule("第一格", lambda syl: syl.figure == 1)
+    checker.add_rule("出错规则", lambda syl: 1 / 0)
+    stats = checker.enable_instrumentation()
+    for syl in Syllogism.all_forms():
+        checker.check(syl)
+
+    snapshot = stats.snapshot()
+    assert snapshot["第一格"]["calls"] == 256
+    assert snapshot["第一格"]["passed"] == 64
+    assert snapshot["第一格"]["failed"] == 192
+    assert snapshot["出错规则"]["errors"] == 256
+    assert snapshot["第一格"]["histogram"]["+Inf"] == 256
+    assert json.loads(stats.to_json())["第一格"]["calls"] == 256
+
+    text = stats.to_prometheus()
+    print(text.splitlines()[2])
+    assert 'syllogism_rule_calls_total{rule="第一格"} 256' in text
+    assert 'syllogism_rule_results_total{rule="出错规则",result="error"} 256' in text
+    assert 'syllogism_rule_latency_seconds_bucket{rule="第一格",le="+Inf"} 256' in text
+
+    # 编译后的检查器共享同一个统计对象
+    stats.reset()
+    compiled = checker.compile()
+    try:
+        compiled.is_valid(Syllogism.from_code(1))
+    except ZeroDivisionError:
+        pass
+    assert stats.snapshot()["出错规则"]["errors"] == 1
+
+    checker.disable_instrumentation()
+    stats.reset()
+    checker.check(Syllogism.from_code(1))
+    assert stats.snapshot() == {}
+
+def test_truth_table():
+    """测试真值表与逐条运行规则一致"""
+    print("\n=== 测试真值表 ===")
+    checker = SyllogismChecker()
+    for rule_name, rule_func in get_all_validation_rules():
+        checker.add_rule(rule_name, rule_func)
+    checker.add_rule("出错规则", lambda syl: 1 / (syl.code % 2))
+    expected = {interp: [checker.check(syl, interp) for syl in Syllogism.all_forms()]
+                for interp in InterpretationType}
+
+    table = checker.compile_table()
+    assert checker.table is table
+    for interp in InterpretationType:
+        for syl in Syllogism.all_forms():
+            assert checker.check(syl, interp) == expected[interp][syl.code]
+            assert table.is_valid(syl, interp) == all(rule_passed(result)
+                                                      for result in expected[interp][syl.code].values())
+    results = checker.check(Syllogism.from_code(1), InterpretationType.BOOLEAN)
+    results["中项至少周延一次"] = None
+    assert checker.check(Syllogism.from_code(1), InterpretationType.BOOLEAN)["中项至少周延一次"] is True
+
+def test_truth_table_invalidation():
+    """测试规则变化后真值表失效"""
+    print("\n=== 测试真值表失效 ===")
+    checker = SyllogismChecker()
+    checker.add_rule("第一格", lambda syl: syl.figure == 1)
+    barbara = Syllogism.from_name("AAA-1")
+    checker.compile_table()
+    checker.add_rule("否定结论", lambda syl: syl.conclusion_type == PropositionType.E)
+    assert checker.table is None
+    assert checker.check(barbara) == {"第一格": True, "否定结论": False}
+
+    checker.compile_table()
+    checker.remove_rule("否定结论")
+    assert checker.table is None
+    assert checker.check(barbara) == {"第一格": True}
+
+    checker.compile_table()
+    checker.rules.append(("第二格", lambda syl: syl.figure == 2))
+    assert checker.table is None
+    assert checker.check(barbara) == {"第一格": True, "第二格": False}
+
+    try:
+        checker.remove_rule("不存在")
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+def test_nondeterministic_rule():
+    """测试非确定性规则"""
+    print("\n=== 测试非确定性规则 ===")
+    calls = []
+
+    def flaky(syl):
+        calls.append(syl)
+        return len(calls) % 7 != 0
+
+    checker = SyllogismChecker()
+    checker.add_rule("不稳定规则", flaky)
+    try:
+        checker.compile_table()
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+    assert checker.table is None
+
+def test_generated_module(tmp_path):
+    """测试生成的Python模块"""
+    print("\n=== 测试生成模块 ===")
+    import importlib.util
+
+    checker = SyllogismChecker()
+    for rule_name, rule_func in get_all_validation_rules():
+        checker.add_rule(rule_name, rule_func)
+    path = tmp_path / "generated_rules.py"
+    table = checker.compile_table()
+    table.write_module(path)
+
+    spec = importlib.util.spec_from_file_location("generated_rules", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for interp in InterpretationType:
+        for syl in Syllogism.all_forms():
+            assert module.check(syl.code, interp.value) == table.check(syl, interp)
+            assert module.is_valid(syl.code, interp.value) == lookup_validity(syl.code, interp)
+
+    marker = object()
+    checker.add_rule("返回对象", lambda syl: marker)
+    try:
+        checker.compile_table().to_source()
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_reused_checker_does_not_grow()
+    test_compiled_matches_table()
+    test_rule_order_and_short_circuit()
+    test_rule_exception()
+    test_instrumentation()
+    test_truth_table()
+    test_truth_table_invalidation()
+    test_nondeterministic_rule()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_generated_module(Path(tmp))
+    print("\n✓ 所有测试完成!")
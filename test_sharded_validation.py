@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+测试分片并行验证
+"""
+
+import io
+import json
+
+from syllogism import Syllogism
+from config import InterpretationType, interpretation_context
+from bulk_io import stream_validate
+from sharded_validation import plan_shards, run_sharded, merge_stats
+
+def _write_corpus(path):
+    """写入每种形式各两条、外加一条错误记录的语料"""
+    forms = [syl.get_figure_and_mood() for syl in Syllogism.all_forms()]
+    path.write_text("\n".join(forms * 2 + ["AAA-9"]) + "\n", encoding="utf-8")
+    return len(forms) * 2 + 1
+
+def test_plan_shards(tmp_path):
+    """测试按行切分"""
+    print("=== 测试切分 ===")
+    path = tmp_path / "corpus.csv"
+    path.write_text("id,form\n1,AAA-1\n2,EAE-1\n3,AII-1\n", encoding="utf-8")
+    header, shards = plan_shards(path, 2, "csv")
+    assert header == b"id,form\n"
+    assert len(shards) == 2
+    assert shards[0][0] == len(header) and shards[-1][1] == path.stat().st_size
+    try:
+        plan_shards(path, 0)
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+def test_matches_single_process(tmp_path):
+    """测试并行统计与单进程流式验证一致，且不受全局解释影响"""
+    print("\n=== 测试并行统计 ===")
+    path = tmp_path / "corpus.txt"
+    total = _write_corpus(path)
+    with open(path, encoding="utf-8") as f:
+        expected = stream_validate(f, io.StringIO(), "text", interpretation=InterpretationType.BOOLEAN)
+
+    with interpretation_context(InterpretationType.ARISTOTELIAN):
+        stats = run_sharded(path, InterpretationType.BOOLEAN, shard_size=100, workers=2)
+    print(f"  {stats['total']} 条, {stats['shards']} 个分片")
+    assert stats["total"] == total
+    assert stats["shards"] == 6
+    for key in ("valid", "invalid", "errors"):
+        assert stats[key] == expected[key]
+    assert stats["valid_by_form"]["AAA-1"] == 2
+    assert "AAI-1" not in stats["valid_by_form"]
+    assert sum(stats["valid_by_form"].values()) == stats["valid"]
+    assert stats["rule_failures"]["存在性假设规则"] > 0
+
+def test_resume(tmp_path):
+    """测试检查点续跑"""
+    print("\n=== 测试检查点 ===")
+    path = tmp_path / "corpus.txt"
+    _write_corpus(path)
+    checkpoints = tmp_path / "checkpoints"
+    first = run_sharded(path, InterpretationType.ARISTOTELIAN, shard_size=100,
+                        workers=2, checkpoint_dir=checkpoints)
+    assert first["resumed"] == 0
+
+    # 模拟中断: 删除两个分片的检查点
+    shard_files = sorted(checkpoints.glob("shard-*.json"))
+    assert len(shard_files) == first["shards"]
+    for shard_file in shard_files[:2]:
+        shard_file.unlink()
+    second = run_sharded(path, InterpretationType.ARISTOTELIAN, shard_size=100,
+                         workers=2, checkpoint_dir=checkpoints)
+    assert second["resumed"] == first["shards"] - 2
+    assert merge_stats([second]) == merge_stats([first])
+    assert json.loads((checkpoints / "manifest.json").read_text())["interpretation"] == "aristotelian"
+
+    try:
+        run_sharded(path, InterpretationType.BOOLEAN, shard_size=100, checkpoint_dir=checkpoints)
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_plan_shards(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_matches_single_process(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_resume(Path(tmp))
+    print("\n✓ 所有测试完成!")
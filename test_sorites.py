@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+测试连锁三段论验证
+"""
+
+import random
+
+from syllogism import Proposition, PropositionType
+from config import InterpretationType
+from sorites import derive, find_chain, follows, follows_in_order, explain
+
+A, E, I, O = PropositionType.A, PropositionType.E, PropositionType.I, PropositionType.O
+ARISTOTELIAN, BOOLEAN = InterpretationType.ARISTOTELIAN, InterpretationType.BOOLEAN
+
+def test_long_chain():
+    """测试长链在两种模式下的推导"""
+    print("=== 测试长链 ===")
+    count = 300
+    chain = [Proposition(A, f"t{i}", f"t{i + 1}") for i in range(count)]
+    chain.append(Proposition(E, f"t{count}", "x"))
+    shuffled = random.Random(0).sample(chain, len(chain))
+    for interp in InterpretationType:
+        assert follows(chain[:-1], Proposition(A, "t0", f"t{count}"), interp, ordered=True)
+        assert follows(chain, Proposition(E, "t0", "x"), interp, ordered=True)
+        assert follows(shuffled, Proposition(A, "t0", f"t{count}"), interp)
+        assert follows(shuffled, Proposition(E, "x", "t0"), interp)
+        assert not follows(shuffled, Proposition(A, f"t{count}", "t0"), interp)
+    assert len(find_chain(shuffled, Proposition(A, "t5", "t9"), BOOLEAN)) == 4
+    print(f"  {len(chain)} 个前提推导正确")
+
+def test_interpretations():
+    """测试依赖存在性假设的推导"""
+    print("\n=== 测试解释差异 ===")
+    premises = [Proposition(A, "m", "p"), Proposition(A, "m", "s")]
+    conclusion = Proposition(I, "s", "p")
+    assert follows(premises, conclusion, ARISTOTELIAN)
+    assert not follows(premises, conclusion, BOOLEAN)
+
+    premises = [Proposition(A, "a", "b"), Proposition(E, "b", "c")]
+    assert follows(premises, Proposition(O, "a", "c"), ARISTOTELIAN)
+    assert not follows(premises, Proposition(O, "a", "c"), BOOLEAN)
+    assert follows(premises, Proposition(E, "c", "a"), BOOLEAN)
+
+def test_particular_chain():
+    """测试含特称命题的链"""
+    print("\n=== 测试特称命题 ===")
+    premises = [
+        Proposition(I, "a", "b"),
+        Proposition(A, "b", "c"),
+        Proposition(A, "c", "d"),
+        Proposition(E, "e", "d"),
+    ]
+    for interp in InterpretationType:
+        assert follows(premises, Proposition(I, "d", "a"), interp)
+        assert follows(premises, Proposition(O, "a", "e"), interp, ordered=True)
+        assert follows(premises[::-1], Proposition(O, "a", "e"), interp)
+        assert not follows(premises, Proposition(O, "e", "a"), interp)
+
+def test_matches_closure():
+    """测试不考虑顺序的结果与逐对组合求闭包一致"""
+    print("\n=== 测试与闭包一致 ===")
+    rng = random.Random(1)
+    terms = "abcde"
+    checked = 0
+    for _ in range(300):
+        premises = [Proposition(rng.choice(list(PropositionType)), *rng.sample(terms, 2))
+                    for _ in range(rng.randint(1, 5))]
+        for interp in InterpretationType:
+            derived = derive(premises, interp)
+            contradictory = any(
+                Proposition({A: O, E: I}[p.type], p.subject, p.predicate) in derived
+                for p in derived if p.type in (A, E)
+            )
+            if contradictory:
+                continue
+            for prop_type in PropositionType:
+                for subject in terms:
+                    for predicate in terms:
+                        if subject != predicate:
+                            conclusion = Proposition(prop_type, subject, predicate)
+                            assert follows(premises, conclusion, interp) == (conclusion in derived)
+                            checked += 1
+    print(f"  比较了 {checked} 个结论")
+
+def test_broken_chain():
+    """测试按顺序模式下断开的链"""
+    print("\n=== 测试断开的链 ===")
+    premises = [Proposition(A, "a", "b"), Proposition(A, "c", "d")]
+    try:
+        follows_in_order(premises, Proposition(A, "a", "d"), BOOLEAN)
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+    assert not follows(premises, Proposition(A, "a", "d"), BOOLEAN)
+
+def test_explain():
+    """测试推导步骤"""
+    print("\n=== 测试推导步骤 ===")
+    premises = [Proposition(A, "b", "c"), Proposition(A, "x", "y"), Proposition(A, "a", "b")]
+    steps = explain(premises, Proposition(A, "a", "c"), BOOLEAN)
+    for proposition, source in steps:
+        print(f"  {proposition}  <= {source[0] if source else '前提'}")
+    conclusion, source = steps[-1]
+    assert conclusion == Proposition(A, "a", "c") and source[0] == "三段论"
+    assert set(source[1:]) == {Proposition(A, "a", "b"), Proposition(A, "b", "c")}
+    assert Proposition(A, "x", "y") not in dict(steps)
+    assert explain(premises, Proposition(A, "c", "a"), BOOLEAN) is None
+
+if __name__ == "__main__":
+    test_long_chain()
+    test_interpretations()
+    test_particular_chain()
+    test_matches_closure()
+    test_broken_chain()
+    test_explain()
+    print("\n✓ 所有测试完成!")
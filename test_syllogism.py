@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+测试三段论形式的编码与共享实例
+"""
+
+import pickle
+
+from syllogism import Syllogism, PropositionType, FORM_COUNT
+
+def test_code_round_trip():
+    """测试编码与解码"""
+    print("=== 测试编码 ===")
+    for code in range(FORM_COUNT):
+        assert Syllogism.from_code(code).to_code() == code
+
+    barbara = Syllogism(PropositionType.A, PropositionType.A, PropositionType.A, 0, 1)
+    print(f"  {barbara.get_figure_and_mood()}: {barbara.to_code()}")
+    assert barbara.to_code() == 1
+    assert barbara.mood == "AAA"
+    assert barbara.figure == 1
+
+def test_interned_instances():
+    """测试每种形式只有一个实例"""
+    print("\n=== 测试共享实例 ===")
+    a = Syllogism(PropositionType.E, PropositionType.I, PropositionType.O, 1, 1)
+    b = Syllogism.from_code(a.to_code())
+    assert a is b
+    assert len(set(Syllogism.all_forms())) == FORM_COUNT
+    assert pickle.loads(pickle.dumps(a)) is a
+    print(f"  {a.get_figure_and_mood()} 共享实例: {a is b}")
+
+def test_immutable_and_hashable():
+    """测试不可修改、按编码比较"""
+    print("\n=== 测试不可修改 ===")
+    syl = Syllogism.from_code(0)
+    try:
+        syl.major_position = 1
+        assert False, "应该抛出异常"
+    except AttributeError as e:
+        print(f"正确捕获错误: {e}")
+    assert not hasattr(syl, "__dict__")
+    assert {syl: "AAA-3"}[Syllogism.from_code(0)] == "AAA-3"
+
+def test_invalid_input():
+    """测试错误输入"""
+    print("\n=== 测试错误输入 ===")
+    for args in [("A", PropositionType.A, PropositionType.A, 0, 1),
+                 (PropositionType.A, PropositionType.A, PropositionType.A, 2, 1)]:
+        try:
+            Syllogism(*args)
+            assert False, "应该抛出异常"
+        except ValueError as e:
+            print(f"正确捕获错误: {e}")
+    try:
+        Syllogism.from_code(FORM_COUNT)
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+if __name__ == "__main__":
+    test_code_round_trip()
+    test_interned_instances()
+    test_immutable_and_hashable()
+    test_invalid_input()
+    print("\n✓ 所有测试完成!")
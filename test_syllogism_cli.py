@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+测试统一命令行入口
+"""
+
+import contextlib
+import io
+import os
+import subprocess
+import sys
+
+from syllogism import Syllogism
+from config import InterpretationType
+from validity_table import is_valid_form
+from syllogism_cli import main
+
+def _run(argv):
+    """运行子命令，返回(返回码, 标准输出行)"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(io.StringIO()):
+        status = main(argv)
+    return status, output.getvalue().splitlines()
+
+def test_data_commands():
+    """测试只输出数据的子命令"""
+    print("=== 测试数据子命令 ===")
+    status, lines = _run(["forms"])
+    assert status == 0 and len(lines) == 256 and lines[1] == "1\tAAA-1"
+
+    for interp in InterpretationType:
+        status, lines = _run(["valid", "-i", interp.value])
+        assert status == 0
+        assert lines == [syl.get_figure_and_mood() for syl in Syllogism.all_forms() if is_valid_form(syl, interp)]
+    status, lines = _run(["valid", "--interpretation", "both", "--backend", "venn"])
+    assert len(lines) == 24 + 15 and lines[-1].endswith("\tboolean")
+
+    status, lines = _run(["check", "AAA-1", "EAO-3", "XYZ-1", "-i", "both"])
+    print(f"  {lines}")
+    assert status == 1
+    assert lines == ["AAA-1\tvalid\tvalid", "EAO-3\tvalid\tinvalid"]
+
+def test_usage_errors():
+    """测试错误用法"""
+    print("\n=== 测试错误用法 ===")
+    for argv in (["nope"], ["valid", "-i", "modern"], ["valid", "--backend"], ["valid", "extra"],
+                 ["check"], ["check", "AAA-1", "--backend", "sql"], ["forms", "-v"], []):
+        assert _run(argv)[0] == 2, argv
+    assert _run(["--help"])[0] == 0
+    assert _run(["query", "AAA-?"]) == (0, ["AAA-1"])
+
+def test_no_rule_imports():
+    """测试数据子命令不导入规则模块"""
+    print("\n=== 测试延迟导入 ===")
+    code = ("import sys, io, contextlib, syllogism_cli\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    for argv in (['forms'], ['valid', '-i', 'both'], ['check', 'AAA-1']):\n"
+            "        syllogism_cli.main(argv)\n"
+            "print(' '.join(name for name in ('rule_checker', 'validation_rules', 'argparse', 'numpy')\n"
+            "               if name in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "", result.stdout
+
+if __name__ == "__main__":
+    test_data_commands()
+    test_usage_errors()
+    test_no_rule_imports()
+    print("\n✓ 所有测试完成!")
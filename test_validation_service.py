@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+测试异步验证服务
+"""
+
+import asyncio
+import json
+
+from config import InterpretationType, interpretation_context
+from validation_service import ValidationService, MicroBatcher, ServiceOverloaded
+from load_generator import run_load, percentile
+
+def _handle(options, request, method="POST", path="/validate"):
+    """在新的事件循环中创建服务并处理一个请求"""
+    async def run():
+        service = ValidationService(**options)
+        service.start_batching()
+        try:
+            body = request if isinstance(request, bytes) else json.dumps(request).encode("utf-8")
+            return await service.handle(method, path, body)
+        finally:
+            await service.close()
+    return asyncio.run(run())
+
+def test_single_and_batch():
+    """测试单条和批量请求"""
+    print("=== 测试单条和批量请求 ===")
+    service = {"interpretation": InterpretationType.ARISTOTELIAN}
+    status, result = _handle(service, {"form": "AAI-1", "reasons": True})
+    assert status == 200
+    assert result == {"form": "AAI-1", "code": 9, "valid": True, "reasons": []}
+
+    status, result = _handle(service, {"form": "AAI-1", "interpretation": "boolean", "reasons": True})
+    assert result["valid"] is False
+    assert result["reasons"] == ["存在性假设规则"]
+
+    status, result = _handle(service, {"interpretation": "boolean", "records": [
+        {"id": 1, "form": "AAA-1"}, {"id": 2, "form": "AAA-5"}, {"code": 1}]})
+    assert status == 200 and result["interpretation"] == "boolean"
+    assert [r.get("valid") for r in result["results"]] == [True, None, True]
+    assert result["results"][0]["id"] == 1 and "error" in result["results"][1]
+    assert "reasons" not in result["results"][0]
+
+    status, result = _handle(service, {"form": "AEE-1", "explain": True})
+    assert result["failure_mask"] == 2
+    assert [reason["code"] for reason in result["explanation"]] == ["illicit_major"]
+    assert list(result["explanation"][0]["terms"]) == ["P"]
+
+    status, result = _handle(service, {"forms": ["EAE-1", "IAI-3"], "backend": "venn"})
+    assert [r["valid"] for r in result["results"]] == [True, True]
+
+def test_errors():
+    """测试错误请求"""
+    print("\n=== 测试错误请求 ===")
+    service = {"max_records": 2}
+    cases = [
+        (b"not json", "POST", "/validate", 400),
+        ({"form": "AAA-1", "interpretation": "modal"}, "POST", "/validate", 400),
+        ({"form": "AAA-1", "backend": "smt"}, "POST", "/validate", 400),
+        ({"form": "XYZ-1"}, "POST", "/validate", 400),
+        ({"forms": "AAA-1"}, "POST", "/validate", 400),
+        ({"forms": ["AAA-1"] * 3}, "POST", "/validate", 413),
+        ({}, "GET", "/validate", 405),
+        ({}, "POST", "/other", 404),
+    ]
+    for request, method, path, expected in cases:
+        status, result = _handle(service, request, method, path)
+        print(f"  {method} {path} -> {status}: {result['error']}")
+        assert status == expected
+
+def test_interpretation_per_request():
+    """测试默认解释在启动时确定，不受之后全局设置影响"""
+    print("\n=== 测试请求级解释 ===")
+    async def run():
+        with interpretation_context(InterpretationType.BOOLEAN):
+            service = ValidationService()
+        service.start_batching()
+        try:
+            with interpretation_context(InterpretationType.ARISTOTELIAN):
+                return await service.handle("POST", "/validate", b'{"form": "AAI-1"}')
+        finally:
+            await service.close()
+    status, result = asyncio.run(run())
+    assert result["valid"] is False
+
+def test_micro_batching():
+    """测试并发请求被合并为少数几批"""
+    print("\n=== 测试攒批 ===")
+    async def run():
+        batcher = MicroBatcher(max_batch=1000, max_delay=0.001)
+        task = asyncio.create_task(batcher.run())
+        futures = [batcher.submit([1, 2], InterpretationType.BOOLEAN, "rules") for _ in range(200)]
+        results = await asyncio.gather(*futures)
+        task.cancel()
+        return batcher, results
+    batcher, results = asyncio.run(run())
+    print(f"  200 个请求合并为 {batcher.batches} 批")
+    assert results[0] == [True, False]
+    assert batcher.batches < 10
+    assert batcher.pending == 0
+
+def test_backpressure():
+    """测试排队超过上限时拒绝请求"""
+    print("\n=== 测试背压 ===")
+    async def run():
+        batcher = MicroBatcher(max_pending=3)
+        batcher.submit([1, 2], InterpretationType.BOOLEAN, "rules")
+        try:
+            batcher.submit([1, 2], InterpretationType.BOOLEAN, "rules")
+            assert False, "应该抛出异常"
+        except ServiceOverloaded as e:
+            print(f"正确捕获错误: {e}")
+    asyncio.run(run())
+
+def test_http_load():
+    """测试HTTP长连接和压测统计"""
+    print("\n=== 测试HTTP压测 ===")
+    async def run():
+        service = ValidationService(max_body=1000)
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            stats = await run_load("127.0.0.1", port, connections=4, requests=25, batch=3, reasons=True)
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /validate HTTP/1.1\r\nContent-Length: 5000\r\n\r\n")
+            await writer.drain()
+            status_line = await reader.readline()
+            writer.close()
+            await writer.wait_closed()
+
+            # 负的Content-Length返回400，而不是让连接处理任务异常退出
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"POST /validate HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+            await writer.drain()
+            negative_line = await reader.readline()
+            writer.close()
+            await writer.wait_closed()
+            return stats, status_line, negative_line
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.close()
+    stats, status_line, negative_line = asyncio.run(run())
+    print(f"  {stats['requests']} 个请求, p50 {stats['p50_ms']:.2f}ms, p99 {stats['p99_ms']:.2f}ms")
+    assert stats["statuses"] == {200: 100}
+    assert stats["p50_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    assert status_line.startswith(b"HTTP/1.1 413")
+    assert negative_line.startswith(b"HTTP/1.1 400")
+    assert percentile([1, 2, 3, 4], 0.5) == 2 and percentile([], 0.5) == 0.0
+
+if __name__ == "__main__":
+    test_single_and_batch()
+    test_errors()
+    test_interpretation_per_request()
+    test_micro_batching()
+    test_backpressure()
+    test_http_load()
+    print("\n✓ 所有测试完成!")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+测试有效性查找表模块
+"""
+
+from syllogism import Syllogism, PropositionType, FORM_COUNT
+from config import set_interpretation, get_interpretation, InterpretationType
+from rule_checker import SyllogismChecker
+from validation_rules import apply_all_rules, is_valid_syllogism
+from validity_table import (
+    INTERPRETATIONS, build_validity_table, save_validity_table, load_validity_table, lookup_validity,
+    validity_row, build_failure_table, table_is_current
+)
+
+def test_table_matches_rules():
+    """测试查找表与规则路径结果一致"""
+    print("\n=== 测试查找表与规则一致 ===")
+    previous = get_interpretation()
+    try:
+        for interp in INTERPRETATIONS:
+            set_interpretation(interp)
+            count = 0
+            for code in range(FORM_COUNT):
+                syl = Syllogism.from_code(code)
+                expected = all(apply_all_rules(syl).values())
+                assert lookup_validity(code, interp) == expected
+                assert is_valid_syllogism(syl) == expected
+                count += expected
+            print(f"  {interp.value}: {count} 个有效形式")
+    finally:
+        set_interpretation(previous)
+
+def test_custom_rules_fallback():
+    """测试传入自定义规则时回退到规则路径"""
+    print("\n=== 测试自定义规则回退 ===")
+    barbara = Syllogism(PropositionType.A, PropositionType.A, PropositionType.A, 0, 1)
+    checker = SyllogismChecker()
+    checker.add_rule("禁止第一格", lambda syl: not (syl.major_position == 0 and syl.minor_position == 1))
+    assert is_valid_syllogism(barbara) == True
+    assert is_valid_syllogism(barbara, checker) == False
+
+def test_failure_table():
+    """测试规则失败表与逐条应用规则一致"""
+    print("\n=== 测试规则失败表 ===")
+    for interp in INTERPRETATIONS:
+        table = build_failure_table(interp)
+        row = validity_row(interp)
+        for syl in Syllogism.all_forms():
+            failed = tuple(name for name, passed in apply_all_rules(syl, interpretation=interp).items()
+                           if not passed)
+            assert table[syl.code] == failed
+            assert bool(row[syl.code]) == (not failed)
+
+def test_data_file(tmp_path):
+    """测试数据文件读写"""
+    print("\n=== 测试数据文件 ===")
+    table = build_validity_table()
+    path = tmp_path / "validity_table.bin"
+    assert not table_is_current(path)
+    save_validity_table(table, path)
+    assert load_validity_table(path) == table
+    assert table_is_current(path)
+    assert [p.name for p in tmp_path.iterdir()] == ["validity_table.bin"]
+
+    # 规则源码改变后，校验和不符的文件视为过期
+    data = bytearray(path.read_bytes())
+    data[6] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert load_validity_table(path) is None
+    assert not table_is_current(path)
+
+    path.write_bytes(b"broken")
+    assert load_validity_table(path) is None
+    assert load_validity_table(tmp_path / "missing.bin") is None
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_table_matches_rules()
+    test_custom_rules_fallback()
+    test_failure_table()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_data_file(Path(tmp))
+    print("\n✓ 所有测试完成!")
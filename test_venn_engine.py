@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+测试语义(文氏图)引擎
+"""
+
+from syllogism import Syllogism, PropositionType
+from config import InterpretationType
+from validation_rules import is_valid_syllogism
+from venn_engine import is_semantically_valid, find_countermodel, cross_check
+
+def test_classic_forms():
+    """测试经典形式"""
+    print("=== 测试经典形式 ===")
+    barbara = Syllogism(PropositionType.A, PropositionType.A, PropositionType.A, 0, 1)
+    aai_1 = Syllogism(PropositionType.A, PropositionType.A, PropositionType.I, 0, 1)
+    iii_1 = Syllogism(PropositionType.I, PropositionType.I, PropositionType.I, 0, 1)
+
+    assert is_semantically_valid(barbara) == True
+    assert is_semantically_valid(aai_1) == False
+    assert is_semantically_valid(aai_1, existential_import=True) == True
+    assert is_semantically_valid(iii_1, existential_import=True) == False
+
+    assert find_countermodel(barbara) is None
+    print(f"  {aai_1.get_figure_and_mood()} 反模型: {find_countermodel(aai_1)}")
+    # 布尔解释下的反模型: 所有区域都为空
+    assert find_countermodel(aai_1) == []
+
+def test_backend():
+    """测试作为is_valid_syllogism的后端"""
+    print("\n=== 测试语义后端 ===")
+    aai_1 = Syllogism(PropositionType.A, PropositionType.A, PropositionType.I, 0, 1)
+    assert is_valid_syllogism(aai_1, interpretation=InterpretationType.ARISTOTELIAN, backend="venn") == True
+    assert is_valid_syllogism(aai_1, interpretation=InterpretationType.BOOLEAN, backend="venn") == False
+    try:
+        is_valid_syllogism(aai_1, backend="unknown")
+        assert False, "应该抛出异常"
+    except ValueError as e:
+        print(f"正确捕获错误: {e}")
+
+def test_cross_check():
+    """测试语义引擎与规则引擎一致"""
+    print("\n=== 测试差异核对 ===")
+    mismatches = cross_check()
+    for syl, interp, by_rules, by_models in mismatches:
+        print(f"  ✗ {syl.get_figure_and_mood()} ({interp.value}): 规则={by_rules}, 语义={by_models}")
+    assert mismatches == []
+
+if __name__ == "__main__":
+    test_classic_forms()
+    test_backend()
+    test_cross_check()
+    print("\n✓ 所有测试完成!")
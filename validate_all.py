@@ -1,68 +1,207 @@
-from syllogism import Syllogism, PropositionType
-from rule_checker import SyllogismChecker
-from config import get_interpretation, is_aristotelian, is_boolean, set_interpretation, InterpretationType, get_interpretation_name
-from validation_rules import get_all_validation_rules, is_valid_syllogism
+# 只导入查表需要的模块，各子命令用到的模块在子命令内导入
+from syllogism import Syllogism
+from config import get_interpretation, InterpretationType
+from validity_table import BACKENDS
+from result_renderer import OUTPUT_BUFFER_SIZE, RENDER_FORMATS, write_report
 
 def generate_all_syllogisms():
-    """生成所有可能的三段论组合"""
-    all_syllogisms = []
-    types = [PropositionType.A, PropositionType.E, PropositionType.I, PropositionType.O]
-    positions = [0, 1]
-
-    for major_type in types:
-        for minor_type in types:
-            for conclusion_type in types:
-                for major_pos in positions:
-                    for minor_pos in positions:
-                        all_syllogisms.append(Syllogism(major_type, minor_type, conclusion_type, major_pos, minor_pos))
-
-    return all_syllogisms
-
-def main(interpretation_type=None):
-    # 设置解释类型
-    if interpretation_type:
-        set_interpretation(interpretation_type)
-
-    print(f"使用 {get_interpretation_name()}")
-
-    # 生成所有组合
-    all_syllogisms = generate_all_syllogisms()
-    print(f"生成了 {len(all_syllogisms)} 种三段论组合")
-
-    # 检验所有组合 - 使用规则模块中的函数
-    valid_syllogisms = []
-    for syl in all_syllogisms:
-        if is_valid_syllogism(syl):
-            valid_syllogisms.append(syl)
-
-    # 打印有效组合
-    print(f"\n找到 {len(valid_syllogisms)} 个有效的三段论:")
-    for i, syl in enumerate(valid_syllogisms, 1):
-        print(f"\n=== 有效三段论 {i} ===")
-        print(syl)
+    """生成所有可能的三段论组合(每种形式只有一个共享实例)"""
+    return Syllogism.all_forms()
+
+def main(interpretation_type=None, backend="rules", output_format="text", stream=None):
+    """
+    输出一种解释下的全部有效形式
+
+    参数:
+        interpretation_type: 解释类型，只作用于本次调用，不修改全局设置；默认为当前解释
+        backend: 验证后端
+        output_format: result_renderer.RENDER_FORMATS之一
+        stream: 输出流，默认为标准输出(管道或文件时整块写出)
+    """
+    interpretation = interpretation_type or get_interpretation()
+    write_report([interpretation], backend, output_format, stream)
+
+def compare_main(backend="rules", output_format="text", stream=None):
+    """输出两种解释下的全部有效形式"""
+    write_report([InterpretationType.ARISTOTELIAN, InterpretationType.BOOLEAN], backend, output_format, stream)
+
+def stream_main(argv):
+    """
+    流式批量验证: 从文件或标准输入逐块读取三段论，验证后立即写出结果
+    用法: python3 validate_all.py stream [文件|-] [选项]
+    """
+    import argparse
+    import sys
+    from bulk_io import (INPUT_FORMATS, OUTPUT_FORMATS, DEFAULT_CHUNK_SIZE,
+                         guess_input_format, positive_int, stream_validate)
+
+    parser = argparse.ArgumentParser(prog="validate_all.py stream", description="流式批量验证三段论")
+    parser.add_argument("input", nargs="?", default="-", help="输入文件，默认为标准输入")
+    parser.add_argument("-o", "--output", default="-", help="输出文件，默认为标准输出")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, help="输入格式，默认按扩展名推断")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, default="jsonl", help="输出格式")
+    parser.add_argument("--interpretation", choices=[interp.value for interp in InterpretationType],
+                        help="解释类型，默认为当前解释")
+    parser.add_argument("--backend", choices=BACKENDS, default="rules", help="验证后端")
+    parser.add_argument("--chunk-size", type=positive_int, default=DEFAULT_CHUNK_SIZE, help="每块记录数")
+    args = parser.parse_args(argv)
+
+    input_format = args.input_format or guess_input_format(args.input)
+    interpretation = InterpretationType(args.interpretation) if args.interpretation else None
+
+    try:
+        if args.input == "-":
+            input_stream = open(sys.stdin.fileno(), "r", encoding="utf-8", newline="", closefd=False)
+        else:
+            input_stream = open(args.input, "r", encoding="utf-8", newline="")
+    except OSError as e:
+        parser.error(str(e))
+    try:
+        if args.output == "-":
+            output_stream = open(sys.stdout.fileno(), "w", encoding="utf-8", newline="",
+                                 buffering=OUTPUT_BUFFER_SIZE, closefd=False)
+        else:
+            output_stream = open(args.output, "w", encoding="utf-8", newline="",
+                                 buffering=OUTPUT_BUFFER_SIZE)
+    except OSError as e:
+        input_stream.close()
+        parser.error(str(e))
+
+    with input_stream, output_stream:
+        stats = stream_validate(input_stream, output_stream, input_format, args.output_format,
+                                interpretation, args.backend, args.chunk_size)
+    print(f"共 {stats['total']} 条: 有效 {stats['valid']}, 无效 {stats['invalid']}, "
+          f"错误 {stats['errors']}", file=sys.stderr)
+    return 1 if stats["errors"] else 0
+
+def query_main(argv):
+    """
+    查询满足部分指定的有效形式
+    用法: python3 validate_all.py query [模式] [--major A] [--minor E] [--conclusion O] [--figure 2]
+    模式形如"AE?-2"，?表示任意
+    """
+    import argparse
+    from form_index import query
+
+    parser = argparse.ArgumentParser(prog="validate_all.py query", description="查询有效的三段论形式")
+    parser.add_argument("pattern", nargs="?", help='形如"AE?-2"的模式，?表示任意')
+    parser.add_argument("--major", help="大前提类型")
+    parser.add_argument("--minor", help="小前提类型")
+    parser.add_argument("--conclusion", help="结论类型")
+    parser.add_argument("--figure", type=int, help="格(1-4)")
+    parser.add_argument("--interpretation", choices=[interp.value for interp in InterpretationType],
+                        help="解释类型，默认为当前解释")
+    parser.add_argument("--backend", choices=BACKENDS, default="rules", help="验证后端")
+    args = parser.parse_args(argv)
+
+    fields = {"major": args.major, "minor": args.minor,
+              "conclusion": args.conclusion, "figure": args.figure}
+    if args.pattern:
+        mood, _, figure = args.pattern.partition("-")
+        if len(mood) != 3:
+            parser.error(f"无效的模式: {args.pattern}")
+        for field, letter in zip(("major", "minor", "conclusion"), mood):
+            if letter != "?":
+                fields[field] = letter
+        if figure and figure != "?":
+            fields["figure"] = figure
+    interpretation = InterpretationType(args.interpretation) if args.interpretation else None
+
+    try:
+        forms = query(**fields, interpretation=interpretation, backend=args.backend)
+    except ValueError as e:
+        parser.error(str(e))
+    print("\n".join(syl.get_figure_and_mood() for syl in forms))
+    return 0 if forms else 1
+
+def shard_main(argv):
+    """
+    分片并行验证大文件，输出合并后的统计信息(JSON)
+    用法: python3 validate_all.py shard 文件 [--workers N] [--checkpoint-dir 目录] [选项]
+    """
+    import argparse
+    import json
+    from bulk_io import INPUT_FORMATS
+    from sharded_validation import DEFAULT_SHARD_SIZE, run_sharded
+
+    parser = argparse.ArgumentParser(prog="validate_all.py shard", description="分片并行验证三段论语料")
+    parser.add_argument("input", help="输入文件")
+    parser.add_argument("-o", "--output", help="统计信息输出文件，默认为标准输出")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, help="输入格式，默认按扩展名推断")
+    parser.add_argument("--interpretation", choices=[interp.value for interp in InterpretationType],
+                        help="解释类型，默认为当前解释")
+    parser.add_argument("--backend", choices=BACKENDS, default="rules", help="验证后端")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="每个分片的行数")
+    parser.add_argument("--workers", type=int, help="进程数，默认为CPU核数")
+    parser.add_argument("--checkpoint-dir", help="检查点目录，中断后用同样的参数重新运行即可继续")
+    args = parser.parse_args(argv)
+
+    interpretation = InterpretationType(args.interpretation) if args.interpretation else None
+    try:
+        stats = run_sharded(args.input, interpretation, args.backend, args.input_format,
+                            args.shard_size, args.workers, args.checkpoint_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    text = json.dumps(stats, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if stats["errors"] else 0
 
 if __name__ == "__main__":
     import sys
 
     # 检查命令行参数
-    if len(sys.argv) > 1:
-        arg = sys.argv[1].lower()
+    args = sys.argv[1:]
+    if args and args[0] == "stream":
+        sys.exit(stream_main(args[1:]))
+    if args and args[0] == "query":
+        sys.exit(query_main(args[1:]))
+    if args and args[0] == "shard":
+        sys.exit(shard_main(args[1:]))
+
+    backend = "rules"
+    if "--backend" in args:
+        index = args.index("--backend")
+        backend = args[index + 1] if index + 1 < len(args) else ""
+        del args[index:index + 2]
+    if backend not in BACKENDS:
+        print(f"无效的验证后端: {backend}，可选: {', '.join(BACKENDS)}")
+        sys.exit(1)
+
+    output_format = "text"
+    if "--format" in args:
+        index = args.index("--format")
+        output_format = args[index + 1] if index + 1 < len(args) else ""
+        del args[index:index + 2]
+    if output_format not in RENDER_FORMATS:
+        print(f"无效的输出格式: {output_format}，可选: {', '.join(RENDER_FORMATS)}")
+        sys.exit(1)
+
+    if len(args) > 0:
+        arg = args[0].lower()
         if arg in ['aristotelian', 'a', '亚里士多德']:
-            main(InterpretationType.ARISTOTELIAN)
+            main(InterpretationType.ARISTOTELIAN, backend, output_format)
         elif arg in ['boolean', 'b', '布尔']:
-            main(InterpretationType.BOOLEAN)
+            main(InterpretationType.BOOLEAN, backend, output_format)
         elif arg in ['both', 'compare', '比较']:
-            print("=== 比较两种解释的结果 ===\n")
-            print("1. 亚里士多德解释:")
-            main(InterpretationType.ARISTOTELIAN)
-            print("\n" + "="*50 + "\n")
-            print("2. 布尔解释:")
-            main(InterpretationType.BOOLEAN)
+            compare_main(backend, output_format)
         else:
-            print("用法: python3 validate_all.py [aristotelian|boolean|both]")
+            print("用法: python3 validate_all.py [aristotelian|boolean|both] [--backend rules|venn] "
+                  "[--format text|json|csv|codes|quiet]")
+            print("      python3 validate_all.py stream [文件|-] [选项]")
+            print("      python3 validate_all.py query [模式] [选项]")
+            print("      python3 validate_all.py shard 文件 [选项]")
             print("  aristotelian, a, 亚里士多德 - 使用亚里士多德解释")
             print("  boolean, b, 布尔 - 使用布尔解释")
             print("  both, compare, 比较 - 比较两种解释")
+            print("  --backend venn - 使用语义(文氏图)引擎判定有效性")
+            print("  --format - 输出格式: text(默认)、json、csv、codes(只输出编码)、quiet(只输出数量)")
+            print("  stream - 流式批量验证，详见 stream --help")
+            print("  query - 查询满足部分指定的有效形式，详见 query --help")
+            print("  shard - 分片并行验证大文件，支持检查点续跑，详见 shard --help")
     else:
-        # 默认使用亚里士多德解释
-        main()
+        # 默认使用当前解释
+        main(backend=backend, output_format=output_format)
@@ -27,32 +27,38 @@ def middle_term_distributed_once(syl):
     return major_distributes_middle or minor_distributes_middle
 
 
-def no_illicit_distribution(syl):
+def no_illicit_major(syl):
     """
-    规则2: 禁止非法周延
-    前提中不周延的项在结论中不得周延
+    规则2a: 禁止大项不当周延
+    大项P在结论中周延(否定结论的谓项)时，在大前提中也必须周延
     """
-    # 检查大项P在前提中是否周延
     p_distributed_in_major = (
         (syl.major_position == 1 and syl.major_type in [PropositionType.A, PropositionType.E]) or
         (syl.major_position == 0 and syl.major_type in [PropositionType.E, PropositionType.O])
     )
-
-    # 检查大项P在结论中是否周延
     p_distributed_in_conclusion = syl.conclusion_type in [PropositionType.E, PropositionType.O]
+    return not p_distributed_in_conclusion or p_distributed_in_major
+
 
-    # 检查小项S在前提中是否周延
+def no_illicit_minor(syl):
+    """
+    规则2b: 禁止小项不当周延
+    小项S在结论中周延(全称结论的主项)时，在小前提中也必须周延
+    """
     s_distributed_in_minor = (
         (syl.minor_position == 1 and syl.minor_type in [PropositionType.A, PropositionType.E]) or
         (syl.minor_position == 0 and syl.minor_type in [PropositionType.E, PropositionType.O])
     )
-
-    # 检查小项S在结论中是否周延
     s_distributed_in_conclusion = syl.conclusion_type in [PropositionType.A, PropositionType.E]
+    return not s_distributed_in_conclusion or s_distributed_in_minor
 
-    # 如果在结论中周延，在前提中也必须周延
-    return (not p_distributed_in_conclusion or p_distributed_in_major) and \
-           (not s_distributed_in_conclusion or s_distributed_in_minor)
+
+def no_illicit_distribution(syl):
+    """
+    规则2: 禁止非法周延
+    前提中不周延的项在结论中不得周延，即大项和小项都不得不当周延
+    """
+    return no_illicit_major(syl) and no_illicit_minor(syl)
 
 
 def no_two_negative_premises(syl):
@@ -65,32 +71,34 @@ def no_two_negative_premises(syl):
     return not (major_negative and minor_negative)
 
 
-def negative_premise_negative_conclusion(syl):
+def negative_premise_negative_conclusion(syl, interpretation=None):
     """
     规则4: 否定前提否定结论
     如果有一个前提是否定的，那么结论必须是否定的
+    interpretation默认为当前解释
     """
     major_negative = syl.major_type in [PropositionType.E, PropositionType.O]
     minor_negative = syl.minor_type in [PropositionType.E, PropositionType.O]
     has_negative_premise = major_negative or minor_negative
     negative_conclusion = syl.conclusion_type in [PropositionType.E, PropositionType.O]
 
-    if is_boolean():
+    if is_boolean(interpretation):
         return (not has_negative_premise) or negative_conclusion
     else:
         # 如果两个前提都是肯定的，那么结论必须是肯定的
         return has_negative_premise == negative_conclusion
 
 
-def existential_import_rule(syl):
+def existential_import_rule(syl, interpretation=None):
     """
     规则5: 存在性假设规则
     这是亚里士多德解释和布尔解释的主要区别
 
     布尔解释：两个全称前提不能得出特称结论
     亚里士多德解释：允许从全称前提推出特称结论（假设存在性）
+    interpretation默认为当前解释
     """
-    if is_boolean():
+    if is_boolean(interpretation):
         # 布尔解释：禁止从两个全称前提推出特称结论
         major_universal = syl.major_type in [PropositionType.A, PropositionType.E]
         minor_universal = syl.minor_type in [PropositionType.A, PropositionType.E]
@@ -115,13 +123,14 @@ def get_all_validation_rules():
     ]
 
 
-def apply_all_rules(syllogism, checker=None):
+def apply_all_rules(syllogism, checker=None, interpretation=None):
     """
     对三段论应用所有验证规则
 
     参数:
         syllogism: 要验证的三段论
         checker: 可选的SyllogismChecker实例，如果不提供会创建新的
+        interpretation: 可选的解释类型，默认为当前解释
 
     返回:
         dict: 规则名称到验证结果的映射
@@ -130,26 +139,56 @@ def apply_all_rules(syllogism, checker=None):
         from rule_checker import SyllogismChecker
         checker = SyllogismChecker()
 
-    # 添加所有规则
+    # 添加尚未注册的规则，重复使用同一个检查器时规则列表不会增长
+    registered = {rule_name for rule_name, _ in checker.rules}
     for rule_name, rule_func in get_all_validation_rules():
-        checker.add_rule(rule_name, rule_func)
+        if rule_name not in registered:
+            checker.add_rule(rule_name, rule_func)
 
     # 执行验证
-    return checker.check(syllogism)
+    return checker.check(syllogism, interpretation)
 
 
-def is_valid_syllogism(syllogism):
+def compile_validation_rules(sample=None):
+    """
+    编译全部验证规则，返回按拒绝率排序、遇到第一条失败规则即停止的检查器
+
+    参数:
+        sample: 可选的三段论序列，用于统计拒绝率，默认为全部256种形式
+
+    返回:
+        CompiledChecker: 编译后的检查器
+    """
+    from rule_checker import SyllogismChecker
+    checker = SyllogismChecker()
+    for rule_name, rule_func in get_all_validation_rules():
+        checker.add_rule(rule_name, rule_func)
+    return checker.compile(sample)
+
+
+def is_valid_syllogism(syllogism, checker=None, interpretation=None, backend="rules"):
     """
     检查三段论是否有效
 
+    默认查询预先计算的有效性表；传入带自定义规则的checker时走规则路径
+
     参数:
         syllogism: 要验证的三段论
+        checker: 可选的SyllogismChecker实例
+        interpretation: 可选的解释类型，默认为当前解释
+        backend: 查表时使用的后端，"rules"(规则引擎)或"venn"(语义引擎)
 
     返回:
         bool: 如果所有规则都通过则返回True，否则返回False
     """
-    results = apply_all_rules(syllogism)
-    return all(results.values())
+    if checker is None:
+        from validity_table import is_valid_form
+        return is_valid_form(syllogism, interpretation, backend)
+
+    from rule_checker import rule_passed
+
+    results = apply_all_rules(syllogism, checker, interpretation)
+    return all(rule_passed(result) for result in results.values())
 
 
 # 示例用法和测试
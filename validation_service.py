@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+异步HTTP验证服务(只依赖标准库)
+
+接口:
+    GET  /health     服务状态和排队中的形式数
+    POST /validate   验证一个或一批三段论
+
+请求体为JSON对象:
+    interpretation: 可选，"aristotelian"或"boolean"，默认为服务启动时的解释
+    backend:        可选，"rules"或"venn"
+    reasons:        可选，为true时返回每种形式未通过的规则名称
+    explain:        可选，为true时返回失败位掩码和结构化的失效原因(见explanation模块)
+    单条: 与bulk_io相同的记录字段(form、code或五个字段)，可带id
+    批量: records为记录列表，或forms为"AAA-1"这样的字符串列表
+
+并发请求中的形式编码先放入队列，由一个批处理任务攒成一批后统一查表，
+每个请求的解释类型随请求传递，不读取也不修改全局设置。
+排队的形式数超过上限时立即返回503，请求体或单批记录数过大时返回413
+
+用法:
+    python3 validation_service.py --port 8080 --interpretation boolean
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from config import InterpretationType, resolve_interpretation
+from validity_table import BACKENDS, validity_row, get_failure_table
+from bulk_io import record_to_syllogism
+from explanation import failure_mask, reasons_for_mask
+
+DEFAULT_PORT = 8080
+
+# 每批最多查询的形式数、攒批时最多等待的秒数、排队形式数上限
+DEFAULT_MAX_BATCH = 4096
+DEFAULT_MAX_DELAY = 0.001
+DEFAULT_MAX_PENDING = 100000
+
+# 请求体字节数上限、单个请求的记录数上限
+DEFAULT_MAX_BODY = 1 << 20
+DEFAULT_MAX_RECORDS = 10000
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+class ServiceOverloaded(Exception):
+    """排队的形式数超过上限"""
+
+
+class MicroBatcher:
+    """
+    把并发请求的形式编码攒成批，每批只唤醒一次批处理任务，
+    同一解释和后端的请求共用一行有效性表
+    """
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY,
+                 max_pending=DEFAULT_MAX_PENDING):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.pending = 0
+        self.batches = 0
+        self._queue = asyncio.Queue()
+
+    def submit(self, codes, interpretation, backend):
+        """
+        提交一个请求的形式编码
+
+        返回:
+            Future: 结果为与codes一一对应的有效性列表
+
+        异常:
+            ServiceOverloaded: 排队的形式数超过上限
+        """
+        if self.pending + len(codes) > self.max_pending:
+            raise ServiceOverloaded(f"排队的形式数超过上限{self.max_pending}")
+        future = asyncio.get_running_loop().create_future()
+        self.pending += len(codes)
+        self._queue.put_nowait((codes, interpretation, backend, future))
+        return future
+
+    def _drain(self, batch, size):
+        """不等待地取出队列中的请求，直到批满"""
+        while size < self.max_batch and not self._queue.empty():
+            item = self._queue.get_nowait()
+            batch.append(item)
+            size += len(item[0])
+        return size
+
+    async def run(self):
+        """批处理循环"""
+        while True:
+            batch = [await self._queue.get()]
+            size = self._drain(batch, len(batch[0][0]))
+            if size < self.max_batch and self.max_delay > 0:
+                await asyncio.sleep(self.max_delay)
+                size = self._drain(batch, size)
+            self.batches += 1
+            self.pending -= size
+
+            rows = {}
+            for codes, interpretation, backend, future in batch:
+                key = (interpretation, backend)
+                row = rows.get(key)
+                if row is None:
+                    row = rows[key] = validity_row(interpretation, backend)
+                if not future.done():
+                    future.set_result([row[code] == 1 for code in codes])
+
+
+class ValidationService:
+    """HTTP验证服务，一个实例只能在一个事件循环中使用"""
+
+    def __init__(self, interpretation=None, backend="rules", max_batch=DEFAULT_MAX_BATCH,
+                 max_delay=DEFAULT_MAX_DELAY, max_pending=DEFAULT_MAX_PENDING,
+                 max_body=DEFAULT_MAX_BODY, max_records=DEFAULT_MAX_RECORDS):
+        if backend not in BACKENDS:
+            raise ValueError(f"无效的验证后端: {backend}")
+        # 默认解释在启动时确定一次，之后不受全局设置影响
+        self.interpretation = resolve_interpretation(interpretation)
+        self.backend = backend
+        self.max_body = max_body
+        self.max_records = max_records
+        self.batcher = MicroBatcher(max_batch, max_delay, max_pending)
+        self._batch_task = None
+
+        # 预先构建全部表，第一个请求不必等待
+        for interp in InterpretationType:
+            get_failure_table(interp)
+            for name in BACKENDS:
+                validity_row(interp, name)
+
+    def start_batching(self):
+        """启动批处理任务，handle()依赖它返回结果"""
+        if self._batch_task is None:
+            self._batch_task = asyncio.create_task(self.batcher.run())
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """启动批处理任务和HTTP服务器，返回asyncio.Server"""
+        self.start_batching()
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def close(self):
+        """停止批处理任务"""
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            try:
+                await self._batch_task
+            except asyncio.CancelledError:
+                pass
+            self._batch_task = None
+
+    async def handle(self, method, path, body):
+        """
+        处理一个请求
+
+        返回:
+            (状态码, 响应对象)
+        """
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "只支持GET"}
+            return 200, {"status": "ok", "interpretation": self.interpretation.value,
+                         "pending": self.batcher.pending, "batches": self.batcher.batches}
+        if path != "/validate":
+            return 404, {"error": f"未知的路径: {path}"}
+        if method != "POST":
+            return 405, {"error": "只支持POST"}
+
+        try:
+            request = json.loads(body)
+            if not isinstance(request, dict):
+                raise ValueError("请求体必须是JSON对象")
+            interpretation = InterpretationType(request.get("interpretation", self.interpretation.value))
+            backend = request.get("backend", self.backend)
+            if backend not in BACKENDS:
+                raise ValueError(f"无效的验证后端: {backend}")
+        except (TypeError, ValueError) as e:
+            return 400, {"error": str(e)}
+
+        if "records" in request or "forms" in request:
+            records = request.get("records", request.get("forms"))
+            if not isinstance(records, list):
+                return 400, {"error": "records和forms必须是列表"}
+            if "records" not in request:
+                records = [{"form": form} for form in records]
+            if len(records) > self.max_records:
+                return 413, {"error": f"单个请求最多{self.max_records}条记录"}
+        else:
+            records = None
+
+        results = []
+        codes = []
+        for record in records if records is not None else [request]:
+            try:
+                syl = record_to_syllogism(record if isinstance(record, dict) else None)
+            except ValueError as e:
+                result = {"error": str(e)}
+            else:
+                result = {"form": syl.get_figure_and_mood(), "code": syl.code}
+                codes.append(syl.code)
+            if isinstance(record, dict) and record.get("id") not in (None, ""):
+                result = {"id": record["id"], **result}
+            results.append(result)
+
+        try:
+            valid = await self.batcher.submit(codes, interpretation, backend) if codes else []
+        except ServiceOverloaded as e:
+            return 503, {"error": str(e)}
+
+        failures = get_failure_table(interpretation) if request.get("reasons") else None
+        explain = bool(request.get("explain"))
+        flags = iter(valid)
+        for result in results:
+            if "code" in result:
+                result["valid"] = next(flags)
+                if failures is not None:
+                    result["reasons"] = list(failures[result["code"]])
+                if explain:
+                    mask = failure_mask(result["code"], interpretation)
+                    result["failure_mask"] = mask
+                    result["explanation"] = [reason._asdict() for reason in reasons_for_mask(mask)]
+
+        if records is None:
+            status = 400 if "error" in results[0] else 200
+            return status, results[0]
+        return 200, {"interpretation": interpretation.value, "results": results}
+
+    async def _handle_connection(self, reader, writer):
+        """处理一个连接上的请求，支持HTTP/1.1长连接"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ", 2)
+                    headers = {}
+                    for line in lines[1:]:
+                        if line:
+                            name, _, value = line.partition(":")
+                            headers[name.strip().lower()] = value.strip()
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError(f"无效的Content-Length: {length}")
+                except ValueError:
+                    writer.write(_response(400, {"error": "无效的HTTP请求"}, False))
+                    break
+                if length > self.max_body:
+                    writer.write(_response(413, {"error": f"请求体最多{self.max_body}字节"}, False))
+                    break
+                try:
+                    body = await reader.readexactly(length)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                status, payload = await self.handle(method, path.split("?", 1)[0], body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _response(status, payload, keep_alive):
+    """构造HTTP响应"""
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    headers = [
+        f"HTTP/1.1 {status} {_REASONS[status]}",
+        "Content-Type: application/json; charset=utf-8",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if status == 503:
+        headers.append("Retry-After: 1")
+    return ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, **options):
+    """运行服务直到被取消"""
+    service = ValidationService(**options)
+    server = await service.start(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"验证服务已启动: http://{address[0]}:{address[1]} "
+          f"(默认解释: {service.interpretation.value})", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="异步HTTP验证服务")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="监听端口")
+    parser.add_argument("--interpretation", choices=[interp.value for interp in InterpretationType],
+                        help="请求未指定时使用的解释类型，默认为当前解释")
+    parser.add_argument("--backend", choices=BACKENDS, default="rules", help="默认验证后端")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="每批最多查询的形式数")
+    parser.add_argument("--max-delay", type=float, default=DEFAULT_MAX_DELAY, help="攒批时最多等待的秒数")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                        help="排队形式数上限，超过时返回503")
+    args = parser.parse_args(argv)
+
+    interpretation = InterpretationType(args.interpretation) if args.interpretation else None
+    try:
+        asyncio.run(serve(args.host, args.port, interpretation=interpretation, backend=args.backend,
+                          max_batch=args.max_batch, max_delay=args.max_delay,
+                          max_pending=args.max_pending))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
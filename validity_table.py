@@ -0,0 +1,201 @@
+"""
+三段论有效性查找表模块
+全部三段论只有 256 种形式 × 2 种解释，因此可以预先计算一次有效性，
+之后的判断只需要一次索引，而不必每次都构造检查器并运行全部规则
+"""
+
+import os
+import zlib
+
+from syllogism import Syllogism, FORM_COUNT
+from config import InterpretationType, get_interpretation
+
+# 解释类型在表中的顺序
+INTERPRETATIONS = tuple(InterpretationType)
+_INTERPRETATION_INDEX = {interp: index for index, interp in enumerate(INTERPRETATIONS)}
+
+# 数据文件格式: 魔数(4) + 版本(1) + 解释数量(1) + 规则源码校验和(4，小端序) + 每种解释256字节
+TABLE_MAGIC = b"SYLT"
+TABLE_VERSION = 2
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "validity_table.bin")
+_HEADER_SIZE = len(TABLE_MAGIC) + 2 + 4
+
+# 决定有效性结论的源码；数据文件中的校验和与这些文件的当前内容不符时视为过期
+_RULE_SOURCES = tuple(os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+                      for name in ("syllogism.py", "config.py", "rule_checker.py",
+                                   "validation_rules.py", "validity_table.py"))
+_source_checksum = None
+
+# 可用的验证后端: 规则引擎、语义(文氏图)引擎
+BACKENDS = ("rules", "venn")
+
+_tables = {}
+_failure_tables = {}
+
+
+def build_validity_table():
+    """
+    用规则路径计算全部形式在每种解释下的有效性
+
+    返回:
+        bytes: 长度为 解释数量 × 256，下标为 解释序号 × 256 + 形式编码
+    """
+    from validation_rules import apply_all_rules
+
+    table = bytearray(len(INTERPRETATIONS) * FORM_COUNT)
+    for interp_index, interp in enumerate(INTERPRETATIONS):
+        offset = interp_index * FORM_COUNT
+        for code in range(FORM_COUNT):
+            results = apply_all_rules(Syllogism.from_code(code), interpretation=interp)
+            table[offset + code] = all(results.values())
+    return bytes(table)
+
+
+def rule_source_checksum():
+    """
+    规则源码的CRC32校验和
+
+    只用于发现源码变化后过期的数据文件，不需要抗碰撞；
+    用zlib而不是hashlib，是为了不增加命令行的启动时间
+    """
+    global _source_checksum
+    if _source_checksum is None:
+        checksum = 0
+        for source in _RULE_SOURCES:
+            with open(source, "rb") as f:
+                checksum = zlib.crc32(os.path.basename(source).encode() + b"\0" + f.read(), checksum)
+        _source_checksum = checksum
+    return _source_checksum
+
+
+def save_validity_table(table, path=DEFAULT_TABLE_PATH):
+    """
+    把查找表写入数据文件
+
+    先写入同目录的临时文件再替换，并发读取的进程不会读到写了一半的文件
+    """
+    header = (TABLE_MAGIC + bytes([TABLE_VERSION, len(INTERPRETATIONS)]) +
+              rule_source_checksum().to_bytes(4, "little"))
+    # 多个命令行进程可能同时重建，临时文件名带进程号
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(header + table)
+    os.replace(temporary, path)
+
+
+def _read_table_file(path):
+    """读取数据文件，返回(规则源码校验和, 查找表)；文件不存在或格式不匹配时返回None"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    expected = _HEADER_SIZE + len(INTERPRETATIONS) * FORM_COUNT
+    if (len(data) != expected or not data.startswith(TABLE_MAGIC) or
+            data[4] != TABLE_VERSION or data[5] != len(INTERPRETATIONS)):
+        return None
+    return int.from_bytes(data[6:_HEADER_SIZE], "little"), data[_HEADER_SIZE:]
+
+
+def load_validity_table(path=DEFAULT_TABLE_PATH):
+    """
+    从数据文件读取查找表
+
+    返回:
+        bytes: 查找表；文件不存在、格式不匹配或由其他版本的规则源码生成时返回None
+    """
+    contents = _read_table_file(path)
+    if contents is None or contents[0] != rule_source_checksum():
+        return None
+    return contents[1]
+
+
+def table_is_current(path=DEFAULT_TABLE_PATH):
+    """数据文件存在，且由当前的规则源码生成"""
+    return load_validity_table(path) is not None
+
+
+def get_validity_table(backend="rules"):
+    """
+    获取查找表，每个后端只计算一次
+
+    规则后端优先读取未过期的数据文件，否则现场计算；语义后端由venn_engine计算
+    """
+    table = _tables.get(backend)
+    if table is None:
+        if backend == "rules":
+            table = load_validity_table()
+            if table is None:
+                table = build_validity_table()
+        elif backend == "venn":
+            from venn_engine import build_venn_table
+            table = build_venn_table()
+        else:
+            raise ValueError(f"无效的验证后端: {backend}")
+        _tables[backend] = table
+    return table
+
+
+def lookup_validity(code, interpretation=None, backend="rules"):
+    """按形式编码查询有效性，interpretation默认为当前解释"""
+    if interpretation is None:
+        interpretation = get_interpretation()
+    table = _tables.get(backend) or get_validity_table(backend)
+    return bool(table[_INTERPRETATION_INDEX[interpretation] * FORM_COUNT + code])
+
+
+def is_valid_form(syllogism, interpretation=None, backend="rules"):
+    """查询三段论在指定解释下是否有效"""
+    return lookup_validity(syllogism.code, interpretation, backend)
+
+
+def validity_row(interpretation=None, backend="rules"):
+    """
+    取出一种解释下全部形式的有效性
+
+    返回:
+        bytes: 长度为256，下标为形式编码
+    """
+    if interpretation is None:
+        interpretation = get_interpretation()
+    offset = _INTERPRETATION_INDEX[interpretation] * FORM_COUNT
+    return get_validity_table(backend)[offset:offset + FORM_COUNT]
+
+
+def build_failure_table(interpretation):
+    """
+    用规则路径计算每种形式未通过的规则
+
+    返回:
+        tuple: 第code项为该形式未通过的规则名称元组，按get_all_validation_rules()的顺序
+    """
+    from rule_checker import SyllogismChecker, rule_passed
+    from validation_rules import get_all_validation_rules
+
+    checker = SyllogismChecker()
+    for rule_name, rule_func in get_all_validation_rules():
+        checker.add_rule(rule_name, rule_func)
+    return tuple(
+        tuple(name for name, result in checker.check(syl, interpretation).items() if not rule_passed(result))
+        for syl in Syllogism.all_forms()
+    )
+
+
+def get_failure_table(interpretation=None):
+    """获取规则失败表，每种解释只计算一次"""
+    if interpretation is None:
+        interpretation = get_interpretation()
+    table = _failure_tables.get(interpretation)
+    if table is None:
+        table = _failure_tables[interpretation] = build_failure_table(interpretation)
+    return table
+
+
+# 生成数据文件
+if __name__ == "__main__":
+    table = build_validity_table()
+    save_validity_table(table)
+    for interp_index, interp in enumerate(INTERPRETATIONS):
+        count = sum(table[interp_index * FORM_COUNT:(interp_index + 1) * FORM_COUNT])
+        print(f"{interp.value}: {count} 个有效形式")
+    print(f"已写入 {DEFAULT_TABLE_PATH}")
@@ -0,0 +1,155 @@
+"""
+模型论(文氏图)有效性判定模块
+
+S、M、P三个词项把论域分成8个区域，区域编号的第0/1/2位分别表示是否属于S/M/P。
+一个模型就是8个区域中哪些非空，用8位掩码表示，共256个模型。
+每个命题在全部256个模型中成立的集合用一个256位整数表示，
+判定有效性只需几次位运算: 前提同时成立而结论不成立的模型不存在即为有效。
+亚里士多德解释额外要求S、M、P都非空(存在性假设)
+"""
+
+from syllogism import Syllogism, PropositionType, FORM_COUNT
+from config import InterpretationType
+
+S, M, P = 0, 1, 2
+
+MODEL_COUNT = 256
+ALL_MODELS = (1 << MODEL_COUNT) - 1
+
+
+def _regions(predicate):
+    """满足条件的区域掩码"""
+    return sum(1 << region for region in range(8) if predicate(region))
+
+
+def _models(predicate):
+    """满足条件的模型集合(256位整数)"""
+    return sum(1 << model for model in range(MODEL_COUNT) if predicate(model))
+
+
+def _proposition_models(prop_type, subject, predicate):
+    """命题"subject prop_type predicate"成立的模型集合"""
+    both = _regions(lambda r: r >> subject & 1 and r >> predicate & 1)
+    subject_only = _regions(lambda r: r >> subject & 1 and not r >> predicate & 1)
+    if prop_type == PropositionType.A:
+        return _models(lambda model: not model & subject_only)
+    if prop_type == PropositionType.E:
+        return _models(lambda model: not model & both)
+    if prop_type == PropositionType.I:
+        return _models(lambda model: model & both)
+    return _models(lambda model: model & subject_only)
+
+
+_PROPOSITION_MODELS = {
+    (prop_type, subject, predicate): _proposition_models(prop_type, subject, predicate)
+    for prop_type in PropositionType
+    for subject in (S, M, P)
+    for predicate in (S, M, P)
+    if subject != predicate
+}
+
+# 存在性假设: S、M、P都至少有一个非空区域
+EXISTENTIAL_IMPORT_MODELS = _models(
+    lambda model: all(model & _regions(lambda r, t=term: r >> t & 1) for term in (S, M, P))
+)
+
+
+def premise_models(syl):
+    """两个前提同时成立的模型集合"""
+    major = (M, P) if syl.major_position == 0 else (P, M)
+    minor = (M, S) if syl.minor_position == 0 else (S, M)
+    return (_PROPOSITION_MODELS[(syl.major_type,) + major] &
+            _PROPOSITION_MODELS[(syl.minor_type,) + minor])
+
+
+def countermodels(syl, existential_import=False):
+    """前提成立而结论不成立的模型集合(256位整数)"""
+    conclusion = _PROPOSITION_MODELS[(syl.conclusion_type, S, P)]
+    models = premise_models(syl) & ~conclusion
+    if existential_import:
+        models &= EXISTENTIAL_IMPORT_MODELS
+    return models
+
+
+def is_semantically_valid(syl, existential_import=False):
+    """不存在反模型即为有效"""
+    return not countermodels(syl, existential_import)
+
+
+def find_countermodel(syl, existential_import=False):
+    """
+    返回一个反模型
+
+    返回:
+        list: 非空区域的描述，如["S M ~P", "~S M P"]；有效时返回None
+    """
+    models = countermodels(syl, existential_import)
+    if not models:
+        return None
+    model = (models & -models).bit_length() - 1
+    return [
+        " ".join(("" if region >> term & 1 else "~") + name
+                 for term, name in ((S, "S"), (M, "M"), (P, "P")))
+        for region in range(8) if model >> region & 1
+    ]
+
+
+def build_venn_table():
+    """
+    计算全部形式在每种解释下的语义有效性
+
+    返回:
+        bytes: 与validity_table.build_validity_table相同布局的查找表
+    """
+    from validity_table import INTERPRETATIONS
+
+    table = bytearray(len(INTERPRETATIONS) * FORM_COUNT)
+    for interp_index, interp in enumerate(INTERPRETATIONS):
+        existential_import = interp == InterpretationType.ARISTOTELIAN
+        offset = interp_index * FORM_COUNT
+        for code in range(FORM_COUNT):
+            table[offset + code] = is_semantically_valid(Syllogism.from_code(code), existential_import)
+    return bytes(table)
+
+
+def cross_check(rule_table=None):
+    """
+    用语义引擎逐个核对规则引擎的结果
+
+    参数:
+        rule_table: 要核对的规则查找表，默认现场用规则路径重新计算
+
+    返回:
+        list: 不一致项 [(三段论, 解释类型, 规则结果, 语义结果), ...]
+    """
+    from validity_table import INTERPRETATIONS, build_validity_table
+
+    if rule_table is None:
+        rule_table = build_validity_table()
+    venn_table = build_venn_table()
+    mismatches = []
+    for index, (by_rules, by_models) in enumerate(zip(rule_table, venn_table)):
+        if by_rules != by_models:
+            interp = INTERPRETATIONS[index // FORM_COUNT]
+            mismatches.append((Syllogism.from_code(index % FORM_COUNT), interp,
+                               bool(by_rules), bool(by_models)))
+    return mismatches
+
+
+# 核对规则引擎
+if __name__ == "__main__":
+    import sys
+    import time
+    from validity_table import get_validity_table
+
+    start = time.perf_counter()
+    mismatches = cross_check() + cross_check(get_validity_table())
+    elapsed = time.perf_counter() - start
+    print(f"核对 {2 * len(InterpretationType) * FORM_COUNT} 项, 用时 {elapsed * 1000:.1f}ms")
+
+    for syl, interp, by_rules, by_models in mismatches:
+        print(f"  ✗ {syl.get_figure_and_mood()} ({interp.value}): 规则={by_rules}, 语义={by_models}")
+        print(f"    反模型: {find_countermodel(syl, interp == InterpretationType.ARISTOTELIAN)}")
+    if mismatches:
+        sys.exit(1)
+    print("✓ 规则引擎与语义引擎结果一致")